@@ -0,0 +1,312 @@
+"""
+Position alerts, evaluated once per scoreboard snapshot for every stored position.
+
+Every session registers its positions under its session id, and the engine merges all
+of them into one index by game_key. evaluate() fingerprints each game's alert-relevant
+fields (status, period, score, possession, red zone) and skips games whose
+fingerprint hasn't changed, so only positions on games that moved are checked. The
+engine is process-wide: the first session to see a new snapshot evaluates it, and
+every other viewer of the same snapshot only pays for the fingerprint compare. A
+session that stops rerunning for SESSION_TTL_S has its positions dropped.
+
+Each (position, rule) pair keeps a small state machine:
+  - the rule maps a game to a value (a status band, "opponent in the red zone", "final")
+  - a new value must hold for `confirm` consecutive changes of the game before it is
+    accepted (debounce), so a score that ESPN corrects a play later never fires
+  - status bands use hysteresis: leaving a band needs the lead to clear its edge by
+    BAND_MARGIN points, so a lead wobbling on a boundary doesn't flap
+  - an accepted change fires only if the rule wants that transition, and not within
+    the rule's cooldown for that position
+
+Fired alerts go to every sink. The in-app feed is always on (sessions drain it with
+st.toast); a JSON-lines log and a webhook POST are enabled by env:
+    NFL_ALERT_LOG=alerts.jsonl NFL_ALERT_WEBHOOK=http://127.0.0.1:8765/__alerts streamlit run app.py
+replay_server.py accepts the webhook and lists what it received at GET /__alerts.
+"""
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import requests
+
+FEED_SIZE = 200
+BAND_MARGIN = 1  # points past a band edge before the band changes
+SESSION_TTL_S = 3600
+SESSION_SWEEP_S = 60  # how often an unchanged rerun looks for idle sessions
+
+# (name, minimum lead) best first; matches the ACTIVE POSITIONS card labels
+BANDS = (("CRUISING", 14), ("LEADING", 7), ("AHEAD", 1), ("CLOSE", -7), ("BEHIND", None))
+BAND_RANK = {name: i for i, (name, _) in enumerate(BANDS)}
+BAND_ICONS = {"CRUISING": "🟢", "LEADING": "🟢", "AHEAD": "🟡", "CLOSE": "🟠", "BEHIND": "🔴"}
+
+
+def band(lead, current=None, margin=BAND_MARGIN):
+    """Status band for a lead, staying in `current` until the lead clears its edges by `margin`"""
+    raw = next(name for name, floor in BANDS if floor is None or lead >= floor)
+    if current is None or raw == current:
+        return raw
+    i = BAND_RANK[current]
+    floor = BANDS[i][1]
+    ceiling = BANDS[i - 1][1] if i > 0 else None
+    below = floor is not None and lead < floor - margin
+    above = ceiling is not None and lead >= ceiling + margin
+    return raw if below or above else current
+
+
+def _sides(pos):
+    away, home = pos["game"].split("@")
+    pick = pos.get("pick", home)
+    return pick, (away if pick == home else home), pick == home
+
+
+def _lead(pos, g):
+    _, _, picked_home = _sides(pos)
+    return (g["home_score"] - g["away_score"]) * (1 if picked_home else -1)
+
+
+# ========== RULES ==========
+# Each rule: value(pos, game, previous accepted value) -> hashable or None (not applicable),
+# fires(old, new) -> bool, message(pos, game, new) -> str.
+def _status_value(pos, g, prev):
+    if g["status_type"] == "STATUS_FINAL" or g.get("period", 0) <= 0:
+        return None
+    return band(_lead(pos, g), prev)
+
+
+def _status_fires(old, new):
+    return old is not None and new in ("CLOSE", "BEHIND") and BAND_RANK[new] > BAND_RANK[old]
+
+
+def _status_message(pos, g, new):
+    pick, _, _ = _sides(pos)
+    return (f"{BAND_ICONS[new]} {pick} now {new} ({_lead(pos, g):+d}) • "
+            f"{g['away_team']} {g['away_score']} @ {g['home_team']} {g['home_score']} Q{g['period']} {g['clock']}")
+
+
+def _red_zone_value(pos, g, prev):
+    if g["status_type"] == "STATUS_FINAL" or g.get("period", 0) <= 0:
+        return None
+    _, opponent, _ = _sides(pos)
+    return bool(g.get("is_red_zone")) and g.get("possession_team") == opponent
+
+
+def _red_zone_message(pos, g, new):
+    pick, opponent, _ = _sides(pos)
+    return f"🚨 {opponent} in the red zone vs your {pick} pick • Q{g['period']} {g['clock']} ({_lead(pos, g):+d})"
+
+
+def _final_value(pos, g, prev):
+    if g["status_type"] != "STATUS_FINAL":
+        return "open"
+    return "won" if _lead(pos, g) > 0 else "lost"
+
+
+def _final_message(pos, g, new):
+    pick, _, _ = _sides(pos)
+    price, contracts = pos.get("price", 50), pos.get("contracts", 1)
+    pnl = f"+${(100 - price) * contracts / 100:.2f}" if new == "won" else f"-${price * contracts / 100:.2f}"
+    return (f"{'✅' if new == 'won' else '❌'} FINAL {g['away_team']} {g['away_score']} @ {g['home_team']} "
+            f"{g['home_score']} • {pick} {new.upper()} {pnl}")
+
+
+RULES = {
+    "status": {"value": _status_value, "fires": _status_fires, "message": _status_message,
+               "confirm": 2, "cooldown_s": 120},
+    "red_zone": {"value": _red_zone_value, "fires": lambda old, new: old is False and new is True,
+                 "message": _red_zone_message, "confirm": 1, "cooldown_s": 60},
+    "final": {"value": _final_value, "fires": lambda old, new: old == "open" and new in ("won", "lost"),
+              "message": _final_message, "confirm": 1, "cooldown_s": 0},
+}
+
+
+def fingerprint(g):
+    """The game fields any rule reads; an unchanged fingerprint means nothing to evaluate"""
+    return (g.get("status_type"), g.get("period"), g.get("clock"), g.get("home_score"), g.get("away_score"),
+            g.get("possession_team"), bool(g.get("is_red_zone")))
+
+
+# ========== SINKS ==========
+class FeedSink:
+    """Ring buffer of recent alerts with sequence numbers; each session shows what it hasn't seen"""
+
+    def __init__(self, size=FEED_SIZE):
+        self._items = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.last_seq = 0
+
+    def __call__(self, alert):
+        with self._lock:
+            self.last_seq = alert["seq"] = next(self._seq)
+            self._items.append(alert)
+
+    def since(self, seq):
+        with self._lock:
+            return [a for a in self._items if a["seq"] > seq]
+
+
+class LogFileSink:
+    """Append each alert as one JSON line"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, alert):
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(alert) + "\n")
+
+
+class WebhookSink:
+    """POST each alert as JSON from a background thread, so a slow receiver never blocks a rerun"""
+
+    def __init__(self, url, timeout=2, max_pending=100):
+        self.url = url
+        self.timeout = timeout
+        self.stats = {"sent": 0, "failed": 0, "dropped": 0}
+        self._queue = queue.Queue(maxsize=max_pending)
+        threading.Thread(target=self._run, daemon=True, name="alerts-webhook").start()
+
+    def __call__(self, alert):
+        try:
+            self._queue.put_nowait(alert)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _run(self):
+        while True:
+            alert = self._queue.get()
+            try:
+                requests.post(self.url, json=alert, timeout=self.timeout).raise_for_status()
+                self.stats["sent"] += 1
+            except requests.RequestException:
+                self.stats["failed"] += 1
+
+
+# ========== ENGINE ==========
+class AlertEngine:
+    def __init__(self, rules=None, sinks=()):
+        self.rules = rules or RULES
+        self.feed = FeedSink()
+        self.sinks = [self.feed, *sinks]
+        self._sessions = {}  # {session: (signature, last seen)}
+        self._by_game = {}  # {game_key: [position key]}
+        self._positions = {}  # {(session, game_key, pick): position}
+        self._fresh = set()  # position keys without a baseline yet
+        self._swept_at = 0.0
+        self._fingerprints = {}  # {game_key: fingerprint last evaluated}
+        self._state = {}  # {(position key, rule): {"value", "pending", "count", "fired_at"}}
+        self._lock = threading.Lock()
+        self.stats = {"snapshots": 0, "games_evaluated": 0, "checks": 0, "fired": 0}
+
+    def set_positions(self, positions, session=""):
+        """
+        Register one session's positions (no-op when unchanged). Other sessions' positions
+        and the state of positions still open are kept.
+        """
+        signature = tuple(sorted((p.get("game"), p.get("pick"), p.get("price"), p.get("contracts"))
+                                 for p in positions if p.get("game")))
+        now = time.time()
+        with self._lock:
+            previous = self._sessions.get(session)
+            self._sessions[session] = (signature, now)
+            changed = previous is None or previous[0] != signature
+            if not changed and now - self._swept_at < SESSION_SWEEP_S:
+                return
+            self._swept_at = now
+            expired = [s for s, (_, seen) in self._sessions.items() if now - seen > SESSION_TTL_S]
+            if not changed and not expired:
+                return
+            for s in expired:
+                del self._sessions[s]
+            self._positions = {k: p for k, p in self._positions.items() if k[0] != session and k[0] in self._sessions}
+            self._positions.update({(session, p["game"], p.get("pick")): p for p in positions if p.get("game")})
+            self._by_game = {}
+            for key in self._positions:
+                self._by_game.setdefault(key[1], []).append(key)
+            self._state = {k: v for k, v in self._state.items() if k[0] in self._positions}
+            # New positions get a baseline on the next evaluate, even if their game didn't move
+            self._fresh = {key for key in self._positions if (key, next(iter(self.rules))) not in self._state}
+
+    def evaluate(self, games):
+        """Check positions on games whose fingerprint changed; returns the alerts fired"""
+        fired = []
+        now = time.time()
+        with self._lock:
+            self.stats["snapshots"] += 1
+            for game_key, keys in self._by_game.items():
+                g = games.get(game_key)
+                if g is None:
+                    continue
+                fp = fingerprint(g)
+                if self._fingerprints.get(game_key) == fp:
+                    keys = [k for k in keys if k in self._fresh]
+                    if not keys:
+                        continue
+                else:
+                    self._fingerprints[game_key] = fp
+                    self.stats["games_evaluated"] += 1
+                for key in keys:
+                    self._fresh.discard(key)
+                    for name, rule in self.rules.items():
+                        alert = self._check(key, name, rule, g, now)
+                        if alert:
+                            fired.append(alert)
+            self.stats["fired"] += len(fired)
+        for alert in fired:
+            for sink in self.sinks:
+                sink(alert)
+        return fired
+
+    def _check(self, key, name, rule, g, now):
+        self.stats["checks"] += 1
+        pos = self._positions[key]
+        state = self._state.setdefault((key, name), {"value": None, "pending": None, "count": 0,
+                                                     "fired_at": None, "seen": False})
+        value = rule["value"](pos, g, state["value"])
+        if not state["seen"]:
+            # First observation is the baseline; nothing has changed yet
+            state.update(value=value, seen=True)
+            return None
+        if value == state["value"]:
+            state.update(pending=None, count=0)
+            return None
+        if value != state["pending"]:
+            state.update(pending=value, count=0)
+        state["count"] += 1
+        if state["count"] < rule["confirm"]:
+            return None
+        old, state["value"] = state["value"], value
+        state.update(pending=None, count=0)
+        if not rule["fires"](old, value):
+            return None
+        if state["fired_at"] is not None and now - state["fired_at"] < rule["cooldown_s"]:
+            return None
+        state["fired_at"] = now
+        return {"ts": now, "rule": name, "session": key[0], "game": key[1], "pick": key[2], "from": old, "to": value,
+                "message": rule["message"](pos, g, value)}
+
+    def since(self, seq):
+        return self.feed.since(seq)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def engine():
+    """Process-wide engine with the sinks configured by NFL_ALERT_LOG / NFL_ALERT_WEBHOOK"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            sinks = []
+            if os.environ.get("NFL_ALERT_LOG"):
+                sinks.append(LogFileSink(os.environ["NFL_ALERT_LOG"]))
+            if os.environ.get("NFL_ALERT_WEBHOOK"):
+                sinks.append(WebhookSink(os.environ["NFL_ALERT_WEBHOOK"]))
+            _engine = AlertEngine(sinks=sinks)
+        return _engine
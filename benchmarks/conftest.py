@@ -0,0 +1,104 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Benchmarks run against a fixture directory in the `replay_server.py record` format:
+fixtures/bench (a small slate committed with the repo) unless --recorded-fixtures or
+NFL_BENCH_FIXTURES points at another recording.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+ESPN_NFL_PATH = "/apis/site/v2/sports/football/nfl"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--recorded-fixtures", default=os.environ.get("NFL_BENCH_FIXTURES", os.path.join(REPO_ROOT, "fixtures", "bench")),
+                     help="recorded fixture directory (replay_server.py format)")
+
+
+@pytest.fixture(scope="session")
+def fixture_store(request):
+    from replay_server import FixtureStore
+    fixture_dir = request.config.getoption("--recorded-fixtures")
+    if not os.path.exists(os.path.join(fixture_dir, "recordings.jsonl")):
+        pytest.skip(f"no recorded fixtures in {fixture_dir} (record with replay_server.py record)")
+    return FixtureStore(fixture_dir)
+
+
+def _recordings(store, path):
+    """All recordings whose path matches, across every query"""
+    for times, recs in store.timelines.values():
+        for rec in recs:
+            if rec["path"] == path and rec.get("status", 200) == 200:
+                yield rec
+
+
+def _decode(store, rec):
+    return json.loads(store.body(rec))
+
+
+def _largest(store, path, query_filter=lambda q: True):
+    recs = [r for r in _recordings(store, path) if query_filter(r.get("query", ""))]
+    if not recs:
+        pytest.skip(f"no recording for {path}")
+    with_size = [(len(store.body(r)), r) for r in recs]
+    return _decode(store, max(with_size, key=lambda x: x[0])[1])
+
+
+@pytest.fixture(scope="session")
+def scoreboard_json(fixture_store):
+    """Richest recorded live scoreboard snapshot"""
+    return _largest(fixture_store, f"{ESPN_NFL_PATH}/scoreboard", lambda q: "dates=" not in q)
+
+
+@pytest.fixture(scope="session")
+def season_json(fixture_store):
+    """Recorded season-scale scoreboard (the dates=... walk)"""
+    return _largest(fixture_store, f"{ESPN_NFL_PATH}/scoreboard", lambda q: "dates=" in q)
+
+
+@pytest.fixture(scope="session")
+def summary_jsons(fixture_store):
+    recs = list(_recordings(fixture_store, f"{ESPN_NFL_PATH}/summary"))
+    if not recs:
+        pytest.skip("no recorded summaries")
+    return [_decode(fixture_store, r) for r in recs]
+
+
+@pytest.fixture(scope="session")
+def injuries_json(fixture_store):
+    return _largest(fixture_store, f"{ESPN_NFL_PATH}/injuries")
+
+
+@pytest.fixture(scope="session")
+def forecast_by_coords(fixture_store):
+    """{(lat, lon): parsed weather} from the recorded Open-Meteo responses"""
+    from urllib.parse import parse_qs
+    import nfl_data
+    out = {}
+    for rec in _recordings(fixture_store, "/v1/forecast"):
+        q = parse_qs(rec.get("query", ""))
+        out[(float(q["latitude"][0]), float(q["longitude"][0]))] = nfl_data.parse_weather(_decode(fixture_store, rec))
+    return out
+
+
+@pytest.fixture(scope="session")
+def standin(fixture_store):
+    """Zero-latency replay server with nfl_data pointed at it"""
+    import nfl_data
+    from replay_server import StandInServer, start_in_thread
+    server = StandInServer(("127.0.0.1", 0), store=fixture_store)
+    start_in_thread(server)
+    saved = (nfl_data.ESPN_NFL_URL, nfl_data.OPEN_METEO_BASE_URL)
+    nfl_data.ESPN_NFL_URL = f"{server.url}{ESPN_NFL_PATH}"
+    nfl_data.OPEN_METEO_BASE_URL = server.url
+    yield server
+    nfl_data.ESPN_NFL_URL, nfl_data.OPEN_METEO_BASE_URL = saved
+    server.shutdown()
+    server.server_close()
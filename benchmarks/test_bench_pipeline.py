@@ -0,0 +1,166 @@
+"""Data pipeline and scoring hot paths, measured on recorded fixtures"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import alerts
+import nfl_data
+import slate_sim
+import team_stats
+from nfl_live import get_ball_position_with_fallback, render_football_field
+from nfl_model import calc_ml_score, get_weather_for_game
+from nfl_teams import STADIUM_COORDS
+
+
+def _weather_fetcher(forecast_by_coords):
+    default = {"temp": 70, "wind": 0, "precip": 0, "code": 0}
+    return lambda lat, lon: forecast_by_coords.get((lat, lon), default)
+
+
+# ========== FETCHERS / PARSERS ==========
+def test_parse_scoreboard(benchmark, scoreboard_json):
+    games = benchmark(nfl_data.parse_scoreboard, scoreboard_json)
+    assert games
+
+
+def test_fetch_espn_scores_via_standin(benchmark, standin):
+    games = benchmark(nfl_data.fetch_espn_scores)
+    assert isinstance(games, dict)
+
+
+def test_parse_last_5_records_season(benchmark, season_json):
+    last_5 = benchmark(nfl_data.parse_last_5_records, season_json)
+    assert last_5
+
+
+def test_parse_team_schedules_season(benchmark, season_json):
+    benchmark(nfl_data.parse_team_schedules, season_json)
+
+
+def test_parse_play_by_play(benchmark, summary_jsons):
+    def run():
+        return [nfl_data.parse_play_by_play(s) for s in summary_jsons]
+    benchmark(run)
+
+
+def test_parse_injuries(benchmark, injuries_json):
+    benchmark(nfl_data.parse_injuries, injuries_json)
+
+
+# ========== SCORING ==========
+def test_calc_ml_score_full_slate(benchmark, scoreboard_json, season_json, injuries_json, forecast_by_coords):
+    games = nfl_data.parse_scoreboard(scoreboard_json)
+    injuries = nfl_data.parse_injuries(injuries_json)
+    last_5 = nfl_data.parse_last_5_records(season_json)
+    last_games = nfl_data.parse_team_schedules(season_json)
+    fetch_weather = _weather_fetcher(forecast_by_coords)
+
+    def run():
+        results = []
+        for g in games.values():
+            home, away = g["home_team"], g["away_team"]
+            if home not in STADIUM_COORDS or away not in STADIUM_COORDS:
+                continue
+            weather = get_weather_for_game(home, fetch_weather)
+            results.append(calc_ml_score(home, away, injuries, weather, last_5, last_games, g["game_date"]))
+        return results
+
+    assert benchmark(run)
+
+
+def test_team_stats_full_season(benchmark, season_json, summary_jsons):
+    datalake = pytest.importorskip("datalake")
+    games = datalake.game_rows(season_json, 0, 0, datalake.REGULAR_SEASON)
+    games = {k: [g[k] for g in games if g["status"] == "STATUS_FINAL"] for k in datalake.SCHEMAS["games"].names}
+    plays = []
+    for s in summary_jsons:
+        plays.extend(datalake.play_rows(s, 0, 0, s.get("header", {}).get("id", ""), datalake._team_ids(s)))
+    plays = {k: [p[k] for p in plays] for k in ("event_id", "team", "type", "yards")}
+
+    def run():
+        return team_stats.derive(team_stats.week_sums(games, plays))
+
+    teams, _, _ = benchmark(run)
+    assert len(teams) == len(team_stats.TEAMS)
+
+
+# ========== SLATE RISK ==========
+def _slate_positions(scoreboard_json):
+    games = nfl_data.parse_scoreboard(scoreboard_json)
+    return [{"game": k, "pick": g["home_team"] if i % 2 else g["away_team"], "price": 40 + i % 30, "contracts": 10}
+            for i, (k, g) in enumerate(games.items())]
+
+
+def test_slate_sim_full(benchmark, scoreboard_json):
+    positions = _slate_positions(scoreboard_json)
+
+    def run():
+        sim = slate_sim.SlateSimulator(n_sims=slate_sim.N_SIMS, seed=1)
+        sim.set_positions(positions)
+        sim.set_probabilities({p["game"]: 0.6 for p in positions})
+        return sim.report()
+
+    assert benchmark(run)["n_sims"] == slate_sim.N_SIMS
+
+
+def test_slate_sim_incremental(benchmark, scoreboard_json):
+    positions = _slate_positions(scoreboard_json)
+    sim = slate_sim.SlateSimulator(n_sims=slate_sim.N_SIMS, seed=1)
+    sim.set_positions(positions)
+    sim.set_probabilities({p["game"]: 0.6 for p in positions})
+    game = positions[0]["game"]
+    probs = iter(0.3 + (i % 400) / 1000 for i in range(10**9))
+    benchmark(lambda: sim.set_probability(game, next(probs)))
+
+
+
+# ========== ALERTS ==========
+def test_alerts_unchanged_snapshot(benchmark, scoreboard_json):
+    """What every additional viewer pays: the snapshot was already evaluated"""
+    games = nfl_data.parse_scoreboard(scoreboard_json)
+    engine = alerts.AlertEngine()
+    engine.set_positions(_slate_positions(scoreboard_json))
+    engine.evaluate(games)
+    benchmark(engine.evaluate, games)
+    assert engine.stats["games_evaluated"] == len(games)
+
+
+def test_alerts_every_game_changed(benchmark, scoreboard_json):
+    games = nfl_data.parse_scoreboard(scoreboard_json)
+    engine = alerts.AlertEngine()
+    engine.set_positions(_slate_positions(scoreboard_json))
+    clocks = iter(range(10**9))
+
+    def run():
+        tick = str(next(clocks))
+        return engine.evaluate({k: dict(g, clock=tick) for k, g in games.items()})
+
+    benchmark(run)
+
+# ========== LIVE FIELD ==========
+def test_get_ball_position_with_fallback(benchmark, scoreboard_json):
+    games = nfl_data.parse_scoreboard(scoreboard_json)
+
+    def run():
+        last_positions = {}
+        return [get_ball_position_with_fallback(k, g, g["away_team"], g["home_team"], last_positions)
+                for k, g in games.items() if g["away_team"] and g["home_team"]]
+
+    benchmark(run)
+
+
+def test_render_football_field(benchmark, scoreboard_json):
+    games = nfl_data.parse_scoreboard(scoreboard_json)
+    last_positions = {}
+    frames = []
+    for k, g in games.items():
+        if not (g["away_team"] and g["home_team"]):
+            continue
+        ball_yard, mode, poss_team, poss_text = get_ball_position_with_fallback(k, g, g["away_team"], g["home_team"], last_positions)
+        frames.append((ball_yard, g.get("down"), g.get("distance"), poss_team, g["away_team"], g["home_team"],
+                       g.get("yards_to_endzone"), poss_text, mode))
+
+    def run():
+        return [render_football_field(*f) for f in frames]
+
+    benchmark(run)
@@ -0,0 +1,238 @@
+"""
+Score -> win probability calibration for the 10-point model.
+
+calc_ml_score returns the pick's share of factor points (5.0-10.0 for the pick,
+rounded to 0.1). This module fits that score to observed outcomes and ships the
+result as a 101-entry lookup table (one probability per 0.1 of score), so
+probability() is an array index.
+
+Fitting is offline: replay every final game in the data lake through calc_ml_score,
+using only the team stats, form, rest, injuries and weather known before that week.
+Then fit either isotonic regression (pool adjacent violators) or Platt scaling
+(logistic on the score). Each game counts from both sides, as (score, won) and
+(10 - score, lost), so the table is symmetric around 5.0.
+
+    python calibration.py fit --root data/lake --seasons 2021-2024 --method isotonic
+    python calibration.py show
+
+The artifact (calibration.json, or $NFL_CALIBRATION) is read once at import. Without
+one, probability() falls back to score / 10.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+GRID = np.round(np.arange(0, 101) / 10, 1)  # scores 0.0 .. 10.0
+P_MIN, P_MAX = 0.01, 0.99
+CALIBRATION_PATH = os.environ.get("NFL_CALIBRATION") or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                     "calibration.json")
+
+
+# ========== FITTING ==========
+def fit_isotonic(scores, wins, weights=None):
+    """Non-decreasing step fit by pool adjacent violators, interpolated onto GRID"""
+    scores = np.asarray(scores, dtype=np.float64)
+    wins = np.asarray(wins, dtype=np.float64)
+    weights = np.ones_like(scores) if weights is None else np.asarray(weights, dtype=np.float64)
+    xs, inv = np.unique(scores, return_inverse=True)
+    w = np.bincount(inv, weights=weights)
+    y = np.bincount(inv, weights=weights * wins) / w
+
+    # Blocks as parallel stacks: mean, weight, first x index
+    means, block_w, starts = [], [], []
+    for i in range(len(xs)):
+        means.append(y[i])
+        block_w.append(w[i])
+        starts.append(i)
+        while len(means) > 1 and means[-2] > means[-1]:
+            wt = block_w[-2] + block_w[-1]
+            means[-2] = (means[-2] * block_w[-2] + means[-1] * block_w[-1]) / wt
+            block_w[-2] = wt
+            means.pop(); block_w.pop(); starts.pop()
+    fitted = np.empty(len(xs))
+    bounds = starts[1:] + [len(xs)]
+    for m, a, b in zip(means, starts, bounds):
+        fitted[a:b] = m
+    return np.clip(np.interp(GRID, xs, fitted), P_MIN, P_MAX)
+
+
+def fit_platt(scores, wins, iterations=50, ridge=1e-3):
+    """p = sigmoid(a * score + b) by Newton's method, with Platt's smoothed targets"""
+    x = np.asarray(scores, dtype=np.float64)
+    t = np.asarray(wins, dtype=np.float64)
+    n_pos, n_neg = t.sum(), len(t) - t.sum()
+    t = np.where(t > 0.5, (n_pos + 1) / (n_pos + 2), 1 / (n_neg + 2))
+    X = np.column_stack([x, np.ones_like(x)])
+    beta = np.zeros(2)
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-X @ beta))
+        grad = X.T @ (p - t) + ridge * beta
+        hess = (X * (p * (1 - p))[:, None]).T @ X + ridge * np.eye(2)
+        step = np.linalg.solve(hess, grad)
+        beta -= step
+        if np.abs(step).max() < 1e-9:
+            break
+    table = 1 / (1 + np.exp(-(beta[0] * GRID + beta[1])))
+    return np.clip(table, P_MIN, P_MAX), beta.tolist()
+
+
+def metrics(table, scores, wins, bins=(5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0, 8.5, 9.0, 10.01)):
+    """Brier score, log loss and a reliability table of the pick-side predictions"""
+    scores = np.asarray(scores, dtype=np.float64)
+    wins = np.asarray(wins, dtype=np.float64)
+    p = np.asarray(table)[np.clip(np.rint(scores * 10).astype(int), 0, 100)]
+    out = {"n": int(len(scores)),
+           "brier": round(float(np.mean((p - wins) ** 2)), 4) if len(scores) else None,
+           "log_loss": round(float(-np.mean(wins * np.log(p) + (1 - wins) * np.log(1 - p))), 4) if len(scores) else None,
+           "reliability": []}
+    for lo, hi in zip(bins[:-1], bins[1:]):
+        m = (scores >= lo) & (scores < hi)
+        if m.any():
+            out["reliability"].append({"scores": f"{lo:.1f}-{min(hi, 10.0):.1f}", "n": int(m.sum()),
+                                       "predicted": round(float(p[m].mean()), 3),
+                                       "observed": round(float(wins[m].mean()), 3)})
+    return out
+
+
+# ========== TRAINING DATA ==========
+def training_rows(lake, seasons):
+    """(pick score, pick won) for every final game, scored with pre-week information only"""
+    import team_stats
+    from nfl_data import last_5_from_results
+    from nfl_model import calc_ml_score
+    from rest_index import RestIndex
+
+    for season in seasons:
+        games = lake.read("games", columns=["event_id", "week", "kickoff", "home", "away", "home_win",
+                                            "away_win", "status"], seasons=[season]).to_pylist()
+        final = [g for g in games if g["status"] == "STATUS_FINAL" and g["kickoff"] is not None]
+        schedule = RestIndex((g["event_id"], g["kickoff"], g["home"], g["away"]) for g in games)
+        weather = {r["event_id"]: r for r in lake.read("weather", seasons=[season]).to_pylist()}
+        injuries_by_week = {}
+        for r in lake.read("injuries", seasons=[season]).to_pylist():
+            injuries_by_week.setdefault(r["week"], {}).setdefault(r["team"], []).append(r)
+
+        prior = np.zeros((len(team_stats.TEAMS), len(team_stats.SUMS)))
+        for week in sorted({g["week"] for g in final}):
+            week_games = [g for g in final if g["week"] == week]
+            if prior[:, team_stats.COL["games"]].any():
+                teams, pass_heavy, run_heavy = team_stats.derive(prior)
+                stats = {"version": f"train-{season}-{week}", "teams": teams,
+                         "pass_heavy": pass_heavy, "run_heavy": run_heavy}
+                first_kickoff = min(g["kickoff"] for g in week_games)
+                last_5 = last_5_from_results(
+                    (g["kickoff"], team, g[f"{side}_win"]) for g in final if g["kickoff"] < first_kickoff
+                    for side, team in (("home", g["home"]), ("away", g["away"])))
+                injuries = injuries_by_week.get(week, {})
+                for g in week_games:
+                    wx = weather.get(g["event_id"])
+                    weather_data = {"wind": wx["wind"], "precip": wx["precip"], "temp": wx["temp"],
+                                    "dome": False} if wx else None
+                    pick, score, _, _, _ = calc_ml_score(g["home"], g["away"], injuries, weather_data,
+                                                         last_5, schedule, g["kickoff"], stats)
+                    yield score, bool(g["home_win"] if pick == g["home"] else g["away_win"])
+            games_cols, plays = team_stats._lake_week(lake, season, week)
+            prior += team_stats.week_sums(games_cols, plays)
+
+
+def fit(rows, method="isotonic"):
+    """Calibration artifact (dict) from (pick score, pick won) rows; ValueError when there are none"""
+    rows = list(rows)
+    if not rows:
+        raise ValueError("no final games to fit")
+    scores = np.array([s for s, _ in rows], dtype=np.float64)
+    wins = np.array([w for _, w in rows], dtype=np.float64)
+    both_scores = np.concatenate([scores, 10 - scores])
+    both_wins = np.concatenate([wins, 1 - wins])
+    params = None
+    if method == "platt":
+        table, params = fit_platt(both_scores, both_wins)
+    else:
+        table = fit_isotonic(both_scores, both_wins)
+    return {"method": method, "fitted_at": time.time(), "params": params,
+            "table": [round(float(p), 4) for p in table], "metrics": metrics(table, scores, wins)}
+
+
+# ========== LOOKUP ==========
+def load(path=CALIBRATION_PATH):
+    try:
+        with open(path) as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+    table = artifact.get("table") if isinstance(artifact, dict) else None
+    if not isinstance(table, list) or len(table) != len(GRID):
+        return None
+    if not all(isinstance(p, (int, float)) and 0 <= p <= 1 for p in table):
+        return None
+    return artifact
+
+
+_artifact = load()
+_table = _artifact["table"] if _artifact else None
+
+
+def reload(path=CALIBRATION_PATH):
+    global _artifact, _table
+    _artifact = load(path)
+    _table = _artifact["table"] if _artifact else None
+    return _artifact
+
+
+def probability(score):
+    """Calibrated win probability for a 0-10 model score (score / 10 when uncalibrated)"""
+    if _table is None:
+        return score / 10
+    return _table[min(100, max(0, int(score * 10 + 0.5)))]
+
+
+def info():
+    return {k: v for k, v in (_artifact or {"method": "uncalibrated"}).items() if k != "table"}
+
+
+def _parse_range(text):
+    out = []
+    for part in text.split(","):
+        a, _, b = part.partition("-")
+        out.extend(range(int(a), int(b or a) + 1))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    f = sub.add_parser("fit", help="fit on historical games in the lake and write the artifact")
+    f.add_argument("--root", default=os.environ.get("NFL_LAKE_DIR", "data/lake"))
+    f.add_argument("--seasons", required=True, help="e.g. 2021-2024")
+    f.add_argument("--method", choices=("isotonic", "platt"), default="isotonic")
+    f.add_argument("--out", default=CALIBRATION_PATH)
+    s = sub.add_parser("show", help="print the artifact's fit metrics and table")
+    s.add_argument("--path", default=CALIBRATION_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "fit":
+        import datalake
+        rows = list(training_rows(datalake.DataLake(args.root), _parse_range(args.seasons)))
+        if not rows:
+            sys.exit(f"no final games for seasons {args.seasons} in {args.root}; ingest them with datalake.py first")
+        artifact = fit(rows, args.method)
+        artifact["seasons"] = args.seasons
+        with open(args.out, "w") as fh:
+            json.dump(artifact, fh)
+        print(f"wrote {args.out}: {json.dumps(artifact['metrics'])}")
+    else:
+        artifact = load(args.path)
+        if artifact is None:
+            print(f"no calibration at {args.path}; probability = score / 10")
+            return
+        print(json.dumps({k: v for k, v in artifact.items() if k != "table"}, indent=2))
+        for score in np.arange(5.0, 10.01, 0.5):
+            print(f"  {score:4.1f} -> {artifact['table'][int(round(score * 10))]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
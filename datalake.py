@@ -0,0 +1,375 @@
+"""
+Multi-season NFL history in Parquet, partitioned by season/week.
+
+Tables (each under <root>/<table>/season=YYYY/week=N/):
+    games     one row per game: teams, scores, winner, kickoff, venue
+    plays     one row per play from the ESPN summary
+    injuries  injury report snapshots
+    weather   weather observations per game venue
+
+Ingest walks the ESPN scoreboard week by week for any season and upserts whole
+partitions, so re-running a week is idempotent. Readers select columns and prune
+partitions, and read with memory mapping instead of re-downloading JSON.
+
+    python datalake.py ingest --root data/lake --seasons 2021-2025 --plays
+    python datalake.py snapshot --root data/lake          # injuries + weather, current week
+    python datalake.py info --root data/lake
+
+Set NFL_LAKE_DIR to make the form and rest-day fetchers read from the lake.
+Requires pyarrow.
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import nfl_data
+import ratelimit
+import team_registry
+from nfl_teams import TEAM_ABBREVS
+from upstream import UpstreamError, get_json
+
+REGULAR_SEASON, POSTSEASON = 2, 3
+REGULAR_WEEKS = 18
+POSTSEASON_WEEKS = 5
+# Postseason weeks are stored after the regular season so (season, week) sorts chronologically
+POSTSEASON_WEEK_OFFSET = 100
+SEASON_OVER = POSTSEASON_WEEK_OFFSET + POSTSEASON_WEEKS + 1
+SETTLED = ["STATUS_FINAL", "STATUS_POSTPONED", "STATUS_CANCELED"]
+GAME_HOURS = 6  # a game not final this long after kickoff was stored before it finished
+
+TS = pa.timestamp("us", tz="UTC")
+
+SCHEMAS = {
+    "games": pa.schema([
+        ("season", pa.int16()), ("week", pa.int16()), ("season_type", pa.int8()),
+        ("event_id", pa.string()), ("kickoff", TS), ("status", pa.string()),
+        ("home", pa.string()), ("away", pa.string()),
+        ("home_score", pa.int16()), ("away_score", pa.int16()),
+        ("home_win", pa.bool_()), ("away_win", pa.bool_()),
+        ("venue_team", pa.string()), ("neutral_site", pa.bool_()),
+    ]),
+    "plays": pa.schema([
+        ("season", pa.int16()), ("week", pa.int16()), ("event_id", pa.string()),
+        ("seq", pa.int32()), ("period", pa.int8()), ("clock", pa.string()),
+        ("team", pa.string()), ("type", pa.string()), ("text", pa.string()),
+        ("yards", pa.int16()), ("start_yard_line", pa.int16()),
+        ("scoring", pa.bool_()), ("home_score", pa.int16()), ("away_score", pa.int16()),
+    ]),
+    "injuries": pa.schema([
+        ("season", pa.int16()), ("week", pa.int16()), ("snapshot", TS),
+        ("team", pa.string()), ("name", pa.string()), ("position", pa.string()), ("status", pa.string()),
+    ]),
+    "weather": pa.schema([
+        ("season", pa.int16()), ("week", pa.int16()), ("event_id", pa.string()),
+        ("venue_team", pa.string()), ("observed", TS),
+        ("temp", pa.float32()), ("wind", pa.float32()), ("precip", pa.float32()), ("code", pa.int16()),
+    ]),
+}
+PARTITION_COLS = ["season", "week"]
+
+
+def _ts(iso):
+    try:
+        return datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class DataLake:
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, table):
+        return os.path.join(self.root, table)
+
+    # ========== WRITE ==========
+    def write(self, table, rows):
+        """Upsert rows, replacing every (season, week) partition they touch"""
+        if not rows:
+            return 0
+        data = pa.Table.from_pylist(rows, schema=SCHEMAS[table])
+        pq.write_to_dataset(data, self.path(table), partition_cols=PARTITION_COLS,
+                            existing_data_behavior="delete_matching",
+                            basename_template="part-{i}.parquet")
+        return data.num_rows
+
+    # ========== READ ==========
+    def read(self, table, columns=None, seasons=None, weeks=None, filters=None):
+        """Memory-mapped read of only the requested columns and partitions"""
+        path = self.path(table)
+        if not os.path.isdir(path):
+            return SCHEMAS[table].empty_table() if columns is None else \
+                pa.schema([SCHEMAS[table].field(c) for c in columns]).empty_table()
+        conds = list(filters or [])
+        if seasons is not None:
+            conds.append(("season", "in", [int(s) for s in seasons]))
+        if weeks is not None:
+            conds.append(("week", "in", [int(w) for w in weeks]))
+        return pq.read_table(path, columns=columns, filters=conds or None, memory_map=True,
+                             partitioning="hive")
+
+    def seasons(self, table="games"):
+        path = self.path(table)
+        if not os.path.isdir(path):
+            return []
+        return sorted(int(d.split("=", 1)[1]) for d in os.listdir(path) if d.startswith("season="))
+
+    def has_season(self, season, table="games"):
+        return os.path.isdir(os.path.join(self.path(table), f"season={int(season)}"))
+
+    def final_results(self, season, weeks=None):
+        """(kickoff, team, win) per team per final game — the rows form and rest days need"""
+        t = self.read("games", columns=["kickoff", "home", "away", "home_win", "away_win"], seasons=[season],
+                      weeks=weeks, filters=[("status", "=", "STATUS_FINAL")])
+        kickoff = t.column("kickoff").to_pylist()
+        for side in ("home", "away"):
+            for k, team, win in zip(kickoff, t.column(side).to_pylist(), t.column(f"{side}_win").to_pylist()):
+                if k is not None:
+                    yield k, team, bool(win)
+
+    def schedule(self, season, weeks=None):
+        """(event_id, kickoff, home, away) for every game of the season, any status"""
+        t = self.read("games", columns=["event_id", "kickoff", "home", "away"], seasons=[season], weeks=weeks)
+        return zip(*(t.column(c).to_pylist() for c in t.column_names))
+
+    def weeks_present(self, table, season):
+        path = os.path.join(self.path(table), f"season={int(season)}")
+        if not os.path.isdir(path):
+            return []
+        return sorted(int(d.split("=", 1)[1]) for d in os.listdir(path) if d.startswith("week="))
+
+    def missing_weeks(self, season, before, now=None):
+        """
+        Weeks of the season before `before` that the games table lacks, or holds from
+        before their games were final (ingested mid-week and not re-ingested since)
+        """
+        expected = [w for w in range(1, REGULAR_WEEKS + 1) if w < before]
+        expected += [w for w in range(POSTSEASON_WEEK_OFFSET + 1, POSTSEASON_WEEK_OFFSET + POSTSEASON_WEEKS + 1)
+                     if w < before]
+        missing = set(expected) - set(self.weeks_present("games", season))
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=GAME_HOURS)
+        t = self.read("games", columns=["week", "kickoff"], seasons=[season], weeks=expected,
+                      filters=[("status", "not in", SETTLED)])
+        missing.update(w for w, k in zip(t.column("week").to_pylist(), t.column("kickoff").to_pylist())
+                       if k is not None and k < cutoff)
+        return sorted(missing)
+
+
+# ========== INGEST ==========
+def game_rows(data, season, week, season_type):
+    rows = []
+    for event in data.get("events", []):
+        comp = event.get("competitions", [{}])[0]
+        sides = {c.get("homeAway"): c for c in comp.get("competitors", [])}
+        if "home" not in sides or "away" not in sides:
+            continue
+        home_c, away_c = sides["home"], sides["away"]
+        home_name = home_c.get("team", {}).get("displayName", "")
+        away_name = away_c.get("team", {}).get("displayName", "")
+        home = TEAM_ABBREVS.get(home_name, home_name)
+        rows.append({
+            "season": season, "week": week, "season_type": season_type,
+            "event_id": event.get("id", ""), "kickoff": _ts(event.get("date", "")),
+            "status": event.get("status", {}).get("type", {}).get("name", ""),
+            "home": home, "away": TEAM_ABBREVS.get(away_name, away_name),
+            "home_score": _int(home_c.get("score"), 0), "away_score": _int(away_c.get("score"), 0),
+            "home_win": bool(home_c.get("winner", False)), "away_win": bool(away_c.get("winner", False)),
+            "venue_team": home, "neutral_site": bool(comp.get("neutralSite", False)),
+        })
+    return rows
+
+
+def play_rows(summary, season, week, event_id, team_by_id):
+    plays = list(summary.get("plays", []))
+    if not plays:
+        drives = summary.get("drives", {})
+        for drive in drives.get("previous", []):
+            plays.extend(drive.get("plays", []))
+        plays.extend(drives.get("current", {}).get("plays", []))
+    rows = []
+    for seq, play in enumerate(plays):
+        period = play.get("period", {})
+        clock = play.get("clock", {})
+        start = play.get("start", {})
+        team_id = (start.get("team") or play.get("team") or {}).get("id")
+        rows.append({
+            "season": season, "week": week, "event_id": event_id, "seq": seq,
+            "period": _int(period.get("number") if isinstance(period, dict) else period, 0),
+            "clock": clock.get("displayValue", "") if isinstance(clock, dict) else str(clock or ""),
+            "team": team_by_id.get(str(team_id)) if team_id is not None else None,
+            "type": (play.get("type") or {}).get("text", ""),
+            "text": play.get("text", "") or play.get("description", "") or "",
+            "yards": _int(play.get("statYardage")), "start_yard_line": _int(start.get("yardLine")),
+            "scoring": bool(play.get("scoringPlay", False)),
+            "home_score": _int(play.get("homeScore")), "away_score": _int(play.get("awayScore")),
+        })
+    return rows
+
+
+def _team_ids(summary):
+    out = {}
+    for comp in summary.get("header", {}).get("competitions", []):
+        for c in comp.get("competitors", []):
+            team = c.get("team", {})
+            name = team.get("displayName", "")
+            out[str(team.get("id"))] = TEAM_ABBREVS.get(name, name)
+    return out
+
+
+def week_url(season, week, season_type=REGULAR_SEASON):
+    return f"{nfl_data.ESPN_NFL_URL}/scoreboard?dates={season}&seasontype={season_type}&week={week}&limit=100"
+
+
+def fetch_week(season, week, season_type=REGULAR_SEASON):
+    return get_json("season_scoreboard", week_url(season, week, season_type), expect="events")
+
+
+def current_week(season, today=None):
+    """
+    Stored week number in progress on `today`: 0 before week 1, 1-18, then
+    POSTSEASON_WEEK_OFFSET + 1-5, then SEASON_OVER. Weeks run Tuesday to Monday from the
+    day after Labor Day.
+    """
+    today = (today or datetime.now(nfl_data.eastern)).date()
+    sept_1 = datetime(season, 9, 1).date()
+    labor_day = sept_1 + timedelta(days=(7 - sept_1.weekday()) % 7)
+    days = (today - labor_day).days - 1  # since the Tuesday of week 1
+    if days < 0:
+        return 0
+    n = days // 7 + 1
+    if n <= REGULAR_WEEKS:
+        return n
+    return min(POSTSEASON_WEEK_OFFSET + n - REGULAR_WEEKS, SEASON_OVER)
+
+
+def stored_week_url(season, week):
+    """week_url for a stored week number; None outside the weeks that have games"""
+    if 1 <= week <= REGULAR_WEEKS:
+        return week_url(season, week)
+    if 1 <= week - POSTSEASON_WEEK_OFFSET <= POSTSEASON_WEEKS:
+        return week_url(season, week - POSTSEASON_WEEK_OFFSET, POSTSEASON)
+    return None
+
+
+def ingest_week(lake, season, week, season_type=REGULAR_SEASON, with_plays=False, pause_s=0.0):
+    stored_week = week + (POSTSEASON_WEEK_OFFSET if season_type == POSTSEASON else 0)
+    games = game_rows(fetch_week(season, week, season_type), season, stored_week, season_type)
+    lake.write("games", games)
+    n_plays = 0
+    if with_plays:
+        rows = []
+        for g in games:
+            if g["status"] != "STATUS_FINAL":
+                continue
+            try:
+                summary = get_json("summary", f"{nfl_data.ESPN_NFL_URL}/summary?event={g['event_id']}")
+            except UpstreamError as e:
+                print(f"  skip plays {g['event_id']}: {e}")
+                continue
+            rows.extend(play_rows(summary, season, stored_week, g["event_id"], _team_ids(summary)))
+            time.sleep(pause_s)
+        n_plays = lake.write("plays", rows)
+    return len(games), n_plays
+
+
+def ingest_season(lake, season, weeks=None, postseason=True, with_plays=False, pause_s=0.0):
+    plan = [(w, REGULAR_SEASON) for w in (weeks or range(1, REGULAR_WEEKS + 1))]
+    if postseason and weeks is None:
+        plan += [(w, POSTSEASON) for w in range(1, POSTSEASON_WEEKS + 1)]
+    for week, season_type in plan:
+        try:
+            n_games, n_plays = ingest_week(lake, season, week, season_type, with_plays, pause_s)
+        except UpstreamError as e:
+            print(f"{season} wk{week} type{season_type}: {e}")
+            continue
+        print(f"{season} wk{week} type{season_type}: {n_games} games, {n_plays} plays")
+
+
+def snapshot_current(lake, fetch_weather=nfl_data.fetch_weather):
+    """Store the current injury report and venue weather for this week's outdoor games"""
+    data = get_json("scoreboard", f"{nfl_data.ESPN_NFL_URL}/scoreboard", expect="events")
+    season = _int(data.get("season", {}).get("year"), nfl_data.current_season())
+    week = _int(data.get("week", {}).get("number"), 0)
+    now = datetime.now(timezone.utc)
+
+    injuries = nfl_data.fetch_espn_injuries()
+    inj_rows = [{"season": season, "week": week, "snapshot": now, "team": team, "name": p["name"],
+                 "position": p["position"], "status": p["status"]}
+                for team, players in injuries.items() for p in players]
+    lake.write("injuries", inj_rows)
+
+    wx_rows = []
+    for g in game_rows(data, season, week, REGULAR_SEASON):
+        venue = team_registry.team_id(g["venue_team"])
+        if venue == team_registry.UNKNOWN or team_registry.has(team_registry.DOMES, venue) \
+                or g["status"] == "STATUS_FINAL":
+            continue
+        try:
+            wx = fetch_weather(*team_registry.STADIUMS[venue])
+        except UpstreamError:
+            continue
+        wx_rows.append({"season": season, "week": week, "event_id": g["event_id"], "venue_team": g["venue_team"],
+                        "observed": now, "temp": wx["temp"], "wind": wx["wind"], "precip": wx["precip"],
+                        "code": _int(wx["code"], 0)})
+    # Weather observations accumulate within a week, so append to the existing partition
+    if wx_rows:
+        existing = lake.read("weather", seasons=[season], weeks=[week])
+        prior = existing.select([f.name for f in SCHEMAS["weather"]]).to_pylist() if existing.num_rows else []
+        lake.write("weather", prior + wx_rows)
+    return len(inj_rows), len(wx_rows)
+
+
+def _parse_range(text):
+    out = []
+    for part in text.split(","):
+        if "-" in part:
+            a, b = part.split("-", 1)
+            out.extend(range(int(a), int(b) + 1))
+        elif part:
+            out.append(int(part))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    ing = sub.add_parser("ingest", help="walk seasons week by week into the lake")
+    ing.add_argument("--seasons", default=str(nfl_data.current_season()), help="e.g. 2021-2025 or 2023,2025")
+    ing.add_argument("--weeks", help="regular-season weeks, e.g. 1-4 (default: all + postseason)")
+    ing.add_argument("--plays", action="store_true", help="also store per-play data from summaries")
+    ing.add_argument("--pause", type=float, default=0.0, help="seconds between summary requests")
+    sub.add_parser("snapshot", help="store current injuries and venue weather")
+    sub.add_parser("info", help="list seasons and row counts")
+    for p in sub.choices.values():
+        p.add_argument("--root", default=os.environ.get("NFL_LAKE_DIR", "data/lake"))
+    args = parser.parse_args(argv)
+    ratelimit.wait_for_tokens(60)  # a season walk waits for request budget instead of skipping weeks
+
+    lake = DataLake(args.root)
+    if args.cmd == "ingest":
+        weeks = _parse_range(args.weeks) if args.weeks else None
+        for season in _parse_range(args.seasons):
+            ingest_season(lake, season, weeks, with_plays=args.plays, pause_s=args.pause)
+    elif args.cmd == "snapshot":
+        n_inj, n_wx = snapshot_current(lake)
+        print(f"{n_inj} injury rows, {n_wx} weather rows")
+    else:
+        for table in SCHEMAS:
+            for season in lake.seasons(table):
+                n = lake.read(table, columns=["event_id"] if table != "injuries" else ["team"], seasons=[season]).num_rows
+                print(f"{table:9s} {season}: {n} rows, weeks {lake.weeks_present(table, season)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Append-only journal of live game states, for reviewing and replaying a game day.
+
+Each scoreboard snapshot is reduced to the live fields of the games in progress (plus a
+game's final snapshot) and appended as a delta against the previous one: only changed
+fields, only changed games, nothing at all when the snapshot is unchanged. So extra
+viewers and the 5 s rerun cadence cost nothing on disk between plays.
+
+Records are JSON, grouped into zlib-compressed blocks appended to one segment file per
+Eastern date (<dir>/YYYY-MM-DD.jrnl). Every KEYFRAME_S a full state is written instead
+of a delta, and always at the start of a block, so a reader seeks straight to the last
+keyframe block before the requested time and replays the few deltas after it. Blocks
+are written every FLUSH_S; a crash loses at most that much.
+
+    NFL_JOURNAL_DIR=data/journal streamlit run app.py
+    python journal.py info --dir data/journal
+    python journal.py at 2026-10-18T16:42 --dir data/journal     # state of every game then
+
+Run the journal in one process only when several workers share a scoreboard.
+"""
+import argparse
+import atexit
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from datetime import datetime
+
+import livestate
+from nfl_data import eastern
+
+JOURNAL_DIR = os.environ.get("NFL_JOURNAL_DIR", "")
+FIELDS = ("away_score", "home_score", "period", "clock", "status_type", "down", "distance",
+          "yards_to_endzone", "possession_team", "is_red_zone", "poss_text", "last_play")
+KEYFRAME_S = 300
+FLUSH_S = 60
+
+BLOCK_MAGIC = b"JRNB"
+BLOCK_HEADER = struct.Struct("<4sddBI")  # magic, first ts, last ts, flags, compressed bytes
+KEYFRAME_FLAG = 1
+
+
+def live_fields(g):
+    fields = {f: g.get(f) for f in FIELDS}
+    fields["last_play"] = (g.get("last_play") or {}).get("text")
+    return fields
+
+
+def segment_date(ts):
+    return datetime.fromtimestamp(ts, eastern).strftime("%Y-%m-%d")
+
+
+# ========== WRITER ==========
+class Journal:
+    def __init__(self, root, keyframe_s=KEYFRAME_S, flush_s=FLUSH_S):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.keyframe_s = keyframe_s
+        self.flush_s = flush_s
+        self._state = {}  # {game_key: live fields} as of the last record
+        self._block = []  # encoded records not yet written
+        self._block_keyframe = False
+        self._block_first = self._block_last = None
+        self._keyframe_at = None
+        self._segment = None
+        self._lock = threading.Lock()
+        self.stats = {"snapshots": 0, "unchanged": 0, "deltas": 0, "keyframes": 0, "blocks": 0, "bytes": 0}
+
+    def append(self, games, ts=None):
+        """Journal one scoreboard snapshot; returns "keyframe", "delta" or None when nothing changed"""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self.stats["snapshots"] += 1
+            state = {k: live_fields(g) for k, g in games.items()
+                     if livestate.is_live(g) or (k in self._state and self._state[k]["status_type"] != "STATUS_FINAL")}
+            segment = segment_date(ts)
+            if not state and not self._state and segment == self._segment:
+                self.stats["unchanged"] += 1
+                return None  # no games on
+            if segment != self._segment or self._keyframe_at is None or ts - self._keyframe_at >= self.keyframe_s:
+                self._flush()
+                self._segment = segment
+                self._keyframe_at = ts
+                self._block_keyframe = True
+                record = {"t": ts, "k": 1, "g": state}
+                kind = "keyframe"
+            else:
+                changed = {}
+                for k, fields in state.items():
+                    old = self._state.get(k)
+                    diff = {f: v for f, v in fields.items() if old is None or old.get(f) != v}
+                    if diff:
+                        changed[k] = diff
+                gone = [k for k in self._state if k not in state]
+                if not changed and not gone:
+                    self.stats["unchanged"] += 1
+                    return None
+                record = {"t": ts, "g": changed}
+                if gone:
+                    record["x"] = gone
+                kind = "delta"
+            self._state = state
+            self._block.append(json.dumps(record, separators=(",", ":")))
+            self._block_first = ts if self._block_first is None else self._block_first
+            self._block_last = ts
+            self.stats[kind + "s"] += 1
+            if ts - self._block_first >= self.flush_s:
+                self._flush()
+            return kind
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._block:
+            return
+        payload = zlib.compress("\n".join(self._block).encode(), 9)
+        header = BLOCK_HEADER.pack(BLOCK_MAGIC, self._block_first, self._block_last,
+                                   KEYFRAME_FLAG if self._block_keyframe else 0, len(payload))
+        with open(os.path.join(self.root, f"{self._segment}.jrnl"), "ab") as f:
+            f.write(header + payload)
+        self.stats["blocks"] += 1
+        self.stats["bytes"] += len(header) + len(payload)
+        self._block = []
+        self._block_keyframe = False
+        self._block_first = self._block_last = None
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def journal():
+    """Process-wide journal under NFL_JOURNAL_DIR (None when unset); flushed at exit"""
+    global _journal
+    if not JOURNAL_DIR:
+        return None
+    with _journal_lock:
+        if _journal is None:
+            _journal = Journal(JOURNAL_DIR)
+            atexit.register(_journal.flush)
+        return _journal
+
+
+# ========== READER ==========
+class Reader:
+    def __init__(self, root):
+        self.root = root
+        self._index = {}  # {segment: (file size, [(offset, first ts, last ts, keyframe, bytes)])}
+
+    def segments(self):
+        return sorted(f[:-5] for f in os.listdir(self.root) if f.endswith(".jrnl"))
+
+    def blocks(self, segment):
+        """Block index of one segment, from the headers only (re-read when the file grows)"""
+        path = os.path.join(self.root, f"{segment}.jrnl")
+        size = os.path.getsize(path)
+        cached = self._index.get(segment)
+        if cached and cached[0] == size:
+            return cached[1]
+        blocks = []
+        with open(path, "rb") as f:
+            offset = 0
+            while offset + BLOCK_HEADER.size <= size:
+                f.seek(offset)
+                magic, first, last, flags, length = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+                if magic != BLOCK_MAGIC or offset + BLOCK_HEADER.size + length > size:
+                    break  # torn tail from a crash mid-write
+                blocks.append((offset, first, last, bool(flags & KEYFRAME_FLAG), length))
+                offset += BLOCK_HEADER.size + length
+        self._index[segment] = (size, blocks)
+        return blocks
+
+    def _records(self, segment, blocks):
+        with open(os.path.join(self.root, f"{segment}.jrnl"), "rb") as f:
+            for offset, _, _, _, length in blocks:
+                f.seek(offset + BLOCK_HEADER.size)
+                for line in zlib.decompress(f.read(length)).split(b"\n"):
+                    yield json.loads(line)
+
+    def _replay(self, segment, start, end):
+        """(ts, state) for each record of segment from the last keyframe at or before start up to end"""
+        blocks = self.blocks(segment)
+        firsts = [b[1] for b in blocks]
+        i = bisect_right(firsts, start) - 1
+        while i > 0 and not blocks[i][3]:
+            i -= 1
+        state = {}
+        for rec in self._records(segment, blocks[max(i, 0):bisect_right(firsts, end)]):
+            if rec["t"] > end:
+                return
+            if rec.get("k"):
+                state = rec["g"]
+            else:
+                state = dict(state)  # copy-on-write, so yielded states stay valid
+                for k, diff in rec["g"].items():
+                    state[k] = dict(state.get(k, {}), **diff)
+                for k in rec.get("x", ()):
+                    state.pop(k, None)
+            yield rec["t"], state
+
+    def frames(self, start, end):
+        """(ts, {game_key: live fields}) for every record between start and end, for replays"""
+        for segment in self.segments():
+            if segment_date(start) <= segment <= segment_date(end):
+                for t, state in self._replay(segment, start, end):
+                    if t >= start:
+                        yield t, state
+
+    def state_at(self, ts):
+        """{game_key: live fields} as of ts (the last record at or before it); {} if none that day"""
+        segment = segment_date(ts)
+        if not os.path.exists(os.path.join(self.root, f"{segment}.jrnl")):
+            return {}
+        state = {}
+        for _, state in self._replay(segment, ts, ts):
+            pass
+        return state
+
+    def info(self):
+        out = {}
+        for segment in self.segments():
+            blocks = self.blocks(segment)
+            records = sum(1 for _ in self._records(segment, blocks))
+            out[segment] = {"blocks": len(blocks), "keyframe_blocks": sum(b[3] for b in blocks),
+                            "records": records, "bytes": sum(BLOCK_HEADER.size + b[4] for b in blocks),
+                            "from": datetime.fromtimestamp(blocks[0][1], eastern).strftime("%H:%M:%S") if blocks else None,
+                            "to": datetime.fromtimestamp(blocks[-1][2], eastern).strftime("%H:%M:%S") if blocks else None}
+        return out
+
+
+def _parse_when(text):
+    when = datetime.fromisoformat(text)
+    return (eastern.localize(when) if when.tzinfo is None else when).timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cmd", choices=["info", "at"])
+    parser.add_argument("when", nargs="?", help="at: ISO time, Eastern unless it has an offset")
+    parser.add_argument("--dir", default=JOURNAL_DIR or None, required=not JOURNAL_DIR)
+    args = parser.parse_args(argv)
+
+    reader = Reader(args.dir)
+    if args.cmd == "info":
+        print(json.dumps(reader.info(), indent=2))
+    else:
+        if not args.when:
+            parser.error("at needs a time")
+        print(json.dumps(reader.state_at(_parse_when(args.when)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
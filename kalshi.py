@@ -0,0 +1,222 @@
+"""
+Kalshi KXNFLGAME market data with a local best bid/ask cache.
+
+Each game is an event (KXNFLGAME-25SEP07BUFMIA) with one yes/no market per team
+(...-BUF pays out if Buffalo wins). KalshiClient refreshes the quotes for a whole
+slate with batched `tickers=` queries over one pooled HTTPS session, and applies
+them to a BookCache that only rewrites entries whose prices changed. Calls go
+through upstream.get_json, so failures are counted per endpoint like ESPN's. When
+a refresh fails, the cached quotes keep being served along with their age.
+
+edge() compares the model's win probability with the price of buying the pick.
+
+Point NFL_KALSHI_BASE_URL at mock_exchange.py to run offline.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from nfl_data import eastern
+from nfl_teams import KALSHI_CODES
+from upstream import UpstreamError, get_json
+
+KALSHI_BASE_URL = os.environ.get("NFL_KALSHI_BASE_URL", "https://api.elections.kalshi.com").rstrip("/")
+MARKETS_URL = f"{KALSHI_BASE_URL}/trade-api/v2/markets"
+SERIES = "KXNFLGAME"
+BATCH_SIZE = 100  # tickers per markets request
+MIN_REFRESH_S = 5  # one refresh per autorefresh cycle, however many sessions ask
+PRICE_FIELDS = ("bid", "ask", "last", "status")  # a change in any of these is a quote update
+
+
+def event_ticker(away_team, home_team, game_date=None):
+    """KXNFLGAME-25SEP07BUFMIA, dated by the Eastern kickoff date (ESPN dates are UTC)"""
+    away_code = KALSHI_CODES.get(away_team, "XXX")
+    home_code = KALSHI_CODES.get(home_team, "XXX")
+    if game_date is None:
+        game_date = datetime.now(eastern)
+    elif game_date.tzinfo is not None:
+        game_date = game_date.astimezone(eastern)
+    date_str = game_date.strftime("%y%b%d").upper()
+    return f"{SERIES}-{date_str}{away_code}{home_code}"
+
+
+def market_ticker(event, team):
+    """Market that pays out if `team` wins the event's game"""
+    return f"{event}-{KALSHI_CODES.get(team, 'XXX')}"
+
+
+def market_url(event):
+    return f"https://kalshi.com/markets/{SERIES}/{event}"
+
+
+def _price(market, side):
+    """Price in dollars (0-1) from either the *_dollars strings or the legacy cent fields"""
+    dollars = market.get(f"{side}_dollars")
+    if dollars not in (None, ""):
+        return float(dollars)
+    cents = market.get(side)
+    return cents / 100 if cents is not None else None
+
+
+class BookCache:
+    """Best bid/ask per market ticker, updated in place as quotes arrive"""
+
+    def __init__(self):
+        self._quotes = {}  # {ticker: quote}
+        self._lock = threading.Lock()
+        self.version = 0  # bumped whenever any quote changes
+        self.updated_at = None
+
+    def apply(self, markets):
+        """Merge market payloads; returns the tickers whose prices changed"""
+        now = time.time()
+        changed = []
+        with self._lock:
+            for m in markets:
+                ticker = m.get("ticker")
+                if not ticker:
+                    continue
+                quote = {"bid": _price(m, "yes_bid"), "ask": _price(m, "yes_ask"),
+                         "last": _price(m, "last_price"), "volume": m.get("volume", 0),
+                         "status": m.get("status", "")}
+                old = self._quotes.get(ticker)
+                if old is not None and all(old[k] == quote[k] for k in PRICE_FIELDS):
+                    old["seen"] = now
+                    old["volume"] = quote["volume"]
+                    continue
+                quote["seen"] = quote["changed"] = now
+                self._quotes[ticker] = quote
+                changed.append(ticker)
+            if changed:
+                self.version += 1
+            self.updated_at = now
+        return changed
+
+    def get(self, ticker):
+        with self._lock:
+            quote = self._quotes.get(ticker)
+            return dict(quote) if quote else None
+
+    def snapshot(self, tickers=None):
+        with self._lock:
+            if tickers is None:
+                return {t: dict(q) for t, q in self._quotes.items()}
+            return {t: dict(self._quotes[t]) for t in tickers if t in self._quotes}
+
+    def age(self):
+        return time.time() - self.updated_at if self.updated_at else None
+
+    def __len__(self):
+        return len(self._quotes)
+
+
+class KalshiClient:
+    def __init__(self, base_url=None, cache=None, batch_size=BATCH_SIZE, min_refresh_s=MIN_REFRESH_S,
+                 pool_size=4):
+        self.markets_url = f"{base_url.rstrip('/')}/trade-api/v2/markets" if base_url else MARKETS_URL
+        self.cache = cache or BookCache()
+        self.batch_size = batch_size
+        self.min_refresh_s = min_refresh_s
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.last_error = None
+        self._refreshed = {}  # {ticker, or None for the whole series: ts}, only entries within min_refresh_s
+        self._lock = threading.Lock()
+
+    def fetch_markets(self, tickers=None, **params):
+        """All markets for `tickers` (batched) or for a query like series_ticker=..., following cursors"""
+        if tickers is not None:
+            tickers = sorted(set(tickers))
+            batches = [{"tickers": ",".join(tickers[i:i + self.batch_size])}
+                       for i in range(0, len(tickers), self.batch_size)]
+        else:
+            batches = [params]
+        markets = []
+        for query in batches:
+            cursor = None
+            while True:
+                q = dict(query, limit=1000, **({"cursor": cursor} if cursor else {}))
+                data = get_json("kalshi_markets", f"{self.markets_url}?{urlencode(q)}", timeout=5,
+                                expect="markets", session=self.session)
+                markets.extend(data["markets"])
+                cursor = data.get("cursor")
+                if not cursor or not data["markets"]:
+                    break
+        return markets
+
+    def refresh(self, tickers=None, force=False):
+        """
+        Refresh quotes for `tickers` (default: every open KXNFLGAME market), skipping
+        those refreshed within min_refresh_s. Returns changed tickers (None when nothing
+        was due). Raises UpstreamError, leaving the cache as it was.
+        """
+        now = time.time()
+        with self._lock:
+            self._refreshed = {k: t for k, t in self._refreshed.items() if now - t < self.min_refresh_s}
+            if tickers is None:
+                due = force or None not in self._refreshed
+                if due:
+                    self._refreshed[None] = now
+            else:
+                due = sorted(t for t in set(tickers) if force or t not in self._refreshed)
+                self._refreshed.update(dict.fromkeys(due, now))
+            if not due:
+                return None
+        if tickers is not None:
+            markets = self.fetch_markets(due)
+        else:
+            markets = self.fetch_markets(series_ticker=SERIES, status="open")
+        return self.cache.apply(markets)
+
+    def quotes(self, tickers):
+        """Cached quotes for `tickers` after a best-effort refresh ({ticker: quote})"""
+        try:
+            if self.refresh(tickers) is not None:
+                self.last_error = None
+        except UpstreamError as e:
+            self.last_error = e
+        return self.cache.snapshot(tickers)
+
+
+def implied(quote):
+    """Market probability for a quote: bid/ask mid, else last trade"""
+    if not quote:
+        return None
+    bid, ask = quote.get("bid"), quote.get("ask")
+    if bid is not None and ask is not None:
+        return (bid + ask) / 2
+    return quote.get("last")
+
+
+def edge(model_prob, quote):
+    """
+    Model-vs-market for buying YES on the pick: {"bid", "ask", "implied", "edge"}.
+
+    edge = model probability minus the ask (the price you would pay), in probability
+    points; None when the market has no ask.
+    """
+    if not quote:
+        return None
+    ask = quote.get("ask")
+    return {"bid": quote.get("bid"), "ask": ask, "implied": implied(quote),
+            "edge": round(model_prob - ask, 4) if ask is not None else None}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client():
+    """Process-wide client, so every session shares one book cache and connection pool"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = KalshiClient()
+        return _client
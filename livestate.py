@@ -0,0 +1,33 @@
+"""
+LiveState: pre-resolution stress classification of a live game.
+
+Overtime is MAX UNCERTAINTY, a one-score 4th quarter is ELEVATED, anything else is
+NORMAL. Each state carries the price move that typically leaks into the market.
+"""
+STATES = {
+    "MAX UNCERTAINTY": {"color": "#ff0000", "expected_move": "3-7¢"},
+    "ELEVATED": {"color": "#ffaa00", "expected_move": "1-4¢"},
+    "NORMAL": {"color": "#44ff44", "expected_move": "—"},
+}
+
+
+def score_pressure(score_diff):
+    return "Blowout" if score_diff >= 17 else "Two Poss" if score_diff >= 9 else "One Poss"
+
+
+def classify(g):
+    """LiveState of one scoreboard game: {"state", "color", "expected_move", "period_label", "score_pressure", "red_zone"}"""
+    quarter = g["period"]
+    score_diff = abs(g["home_score"] - g["away_score"])
+    if quarter >= 5:
+        state, period_label = "MAX UNCERTAINTY", "🏈 OT"
+    elif quarter == 4 and score_diff <= 8:
+        state, period_label = "ELEVATED", f"Q{quarter}"
+    else:
+        state, period_label = "NORMAL", f"Q{quarter}"
+    return dict(STATES[state], state=state, period_label=period_label, score_pressure=score_pressure(score_diff),
+                red_zone=bool(g.get("is_red_zone") and g.get("possession_team")))
+
+
+def is_live(g):
+    return g["period"] > 0 and g["status_type"] != "STATUS_FINAL"
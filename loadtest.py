@@ -0,0 +1,298 @@
+"""
+Multi-session load test: N headless viewers rerunning the app at the autorefresh cadence.
+
+Each viewer is a real Streamlit websocket session (the same BackMsg/ForwardMsg protocol
+the browser uses) that requests a rerun every --cadence seconds and times it until
+script_finished. By default the harness starts the replay stand-in and `streamlit run
+app.py` pointed at it, so upstream traffic is counted by the stand-in.
+
+    python loadtest.py --fixtures fixtures/sunday --sessions 200 --duration 120
+    python loadtest.py --app-url http://127.0.0.1:8501 --server-pid 4242 --standin-url http://127.0.0.1:8765
+
+Reports rerun latency percentiles, server CPU / RSS (total and per session, needs psutil)
+and the outbound request rate per upstream endpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+RERUN_TIMEOUT_S = 60
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rerun_msg():
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = ""
+    msg.rerun_script.is_auto_rerun = True
+    return msg.SerializeToString()
+
+
+class Results:
+    def __init__(self):
+        self.latencies = []
+        self.failures = 0
+        self.connect_errors = 0
+        self.lock = threading.Lock()
+
+    def add(self, latency):
+        with self.lock:
+            self.latencies.append(latency)
+
+    def fail(self):
+        with self.lock:
+            self.failures += 1
+
+
+async def wait_script_finished(ws):
+    while True:
+        raw = await ws.recv()
+        if not isinstance(raw, bytes):
+            continue
+        fwd = ForwardMsg()
+        fwd.ParseFromString(raw)
+        if fwd.WhichOneof("type") == "script_finished" and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+            return fwd.script_finished
+
+
+async def viewer(ws_url, cadence, start_at, deadline, results, aligned):
+    await asyncio.sleep(max(0.0, start_at - time.monotonic()))
+    try:
+        async with websockets.connect(ws_url, subprotocols=["streamlit"], max_size=None, open_timeout=30) as ws:
+            # Random phase unless the timers are aligned (e.g. every tab reloaded after a deploy)
+            next_tick = time.monotonic() + (0 if aligned else random.uniform(0, cadence))
+            while next_tick < deadline:
+                await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+                t0 = time.monotonic()
+                await ws.send(rerun_msg())
+                try:
+                    status = await asyncio.wait_for(wait_script_finished(ws), RERUN_TIMEOUT_S)
+                except asyncio.TimeoutError:
+                    results.fail()
+                else:
+                    if status == ForwardMsg.FINISHED_SUCCESSFULLY:
+                        results.add(time.monotonic() - t0)
+                    else:
+                        results.fail()
+                next_tick += cadence
+                if aligned:
+                    next_tick = max(next_tick, time.monotonic())
+    except (OSError, websockets.WebSocketException):
+        results.connect_errors += 1
+
+
+class ResourceSampler(threading.Thread):
+    """Samples CPU% and RSS of the server process (and its children) once per second"""
+
+    def __init__(self, pid, interval=1.0):
+        super().__init__(daemon=True)
+        self.proc = psutil.Process(pid)
+        self.interval = interval
+        self.cpu, self.rss = [], []
+        self._done = threading.Event()
+
+    def _procs(self):
+        try:
+            return [self.proc] + self.proc.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    def sample(self):
+        cpu, rss = 0.0, 0
+        for p in self._procs():
+            try:
+                cpu += p.cpu_percent(None)
+                rss += p.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return cpu, rss
+
+    def run(self):
+        self.sample()  # prime cpu_percent
+        while not self._done.wait(self.interval):
+            cpu, rss = self.sample()
+            self.cpu.append(cpu)
+            self.rss.append(rss)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def standin_stats(standin_url):
+    if not standin_url:
+        return None
+    try:
+        return requests.get(f"{standin_url}/__replay/stats", timeout=5).json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def start_app(port, standin_url):
+    env = dict(os.environ)
+    if standin_url:
+        env.update(NFL_ESPN_BASE_URL=standin_url, NFL_OPEN_METEO_BASE_URL=standin_url, NFL_GA4_BASE_URL=standin_url)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    health = f"http://127.0.0.1:{port}/_stcore/health"
+    for _ in range(120):
+        try:
+            if requests.get(health, timeout=1).ok:
+                return proc
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("streamlit did not become healthy")
+
+
+async def drive(ws_url, sessions, duration, cadence, ramp, aligned, results):
+    now = time.monotonic()
+    deadline = now + ramp + duration
+    tasks = [viewer(ws_url, cadence, now + (ramp * i / sessions if ramp else 0), deadline, results, aligned)
+             for i in range(sessions)]
+    await asyncio.gather(*tasks)
+
+
+def build_report(args, results, elapsed, sampler, baseline_rss, stats_before, stats_after):
+    lat_ms = [x * 1000 for x in results.latencies]
+    report = {
+        "sessions": args.sessions, "cadence_s": args.cadence, "duration_s": round(elapsed, 1),
+        "aligned": args.aligned,
+        "reruns": len(lat_ms), "failed_reruns": results.failures, "connect_errors": results.connect_errors,
+        "reruns_per_s": round(len(lat_ms) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {f"p{p}": round(percentile(lat_ms, p), 1) for p in (50, 90, 95, 99)} if lat_ms else {},
+    }
+    if lat_ms:
+        report["latency_ms"]["max"] = round(max(lat_ms), 1)
+    if sampler and sampler.cpu:
+        peak_rss = max(sampler.rss)
+        report["server"] = {
+            "cpu_pct_avg": round(sum(sampler.cpu) / len(sampler.cpu), 1),
+            "cpu_pct_peak": round(max(sampler.cpu), 1),
+            "rss_mb_baseline": round(baseline_rss / 2**20, 1),
+            "rss_mb_peak": round(peak_rss / 2**20, 1),
+            "rss_mb_per_session": round((peak_rss - baseline_rss) / 2**20 / max(1, args.sessions), 2),
+        }
+    if stats_before and stats_after:
+        before, after = stats_before.get("by_endpoint", {}), stats_after.get("by_endpoint", {})
+        per_ep = {ep: round((after.get(ep, 0) - before.get(ep, 0)) / elapsed, 2) for ep in after}
+        report["upstream_req_per_s"] = dict(sorted(per_ep.items()), total=round(sum(per_ep.values()), 2))
+    return report
+
+
+def print_report(report):
+    print(f"\n{report['sessions']} sessions @ {report['cadence_s']}s for {report['duration_s']}s"
+          f"{' (aligned timers)' if report['aligned'] else ''}")
+    print(f"reruns: {report['reruns']} ok, {report['failed_reruns']} failed, "
+          f"{report['connect_errors']} connect errors, {report['reruns_per_s']}/s")
+    if report["latency_ms"]:
+        print("rerun latency ms: " + "  ".join(f"{k}={v}" for k, v in report["latency_ms"].items()))
+    if "server" in report:
+        s = report["server"]
+        print(f"server cpu: avg {s['cpu_pct_avg']}% peak {s['cpu_pct_peak']}% | rss: baseline {s['rss_mb_baseline']}MB "
+              f"peak {s['rss_mb_peak']}MB ({s['rss_mb_per_session']}MB/session)")
+    elif not HAS_PSUTIL:
+        print("server cpu/memory: install psutil")
+    if "upstream_req_per_s" in report:
+        print("upstream req/s: " + "  ".join(f"{k}={v}" for k, v in report["upstream_req_per_s"].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of steady load after ramp-up")
+    parser.add_argument("--cadence", type=float, default=5.0, help="rerun interval per session (autorefresh = 5s)")
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which sessions connect")
+    parser.add_argument("--aligned", action="store_true", help="fire every session's rerun on the same tick")
+    parser.add_argument("--app-url", help="existing app (e.g. http://127.0.0.1:8501); default: launch one")
+    parser.add_argument("--server-pid", type=int, help="pid of an existing app server for CPU/memory sampling")
+    parser.add_argument("--fixtures", help="fixture dir to replay with an in-process stand-in")
+    parser.add_argument("--standin-url", help="existing stand-in (replay_server.py serve) for upstream counts")
+    parser.add_argument("--speed", type=float, default=1.0, help="timeline speed for the in-process stand-in")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stand-in upstream latency")
+    parser.add_argument("--json", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    standin, standin_url = None, args.standin_url
+    if args.fixtures:
+        from replay_server import FixtureStore, ReplayConfig, StandInServer, start_in_thread
+        standin = StandInServer(("127.0.0.1", 0), store=FixtureStore(args.fixtures),
+                                config=ReplayConfig(speed=args.speed, latency_ms=args.latency_ms, loop=True))
+        start_in_thread(standin)
+        standin_url = standin.url
+
+    app_proc = None
+    if args.app_url:
+        app_url, server_pid = args.app_url.rstrip("/"), args.server_pid
+    else:
+        port = free_port()
+        app_proc = start_app(port, standin_url)
+        app_url, server_pid = f"http://127.0.0.1:{port}", app_proc.pid
+    ws_url = app_url.replace("http", "ws", 1) + "/_stcore/stream"
+
+    sampler = None
+    try:
+        baseline_rss = 0
+        if HAS_PSUTIL and server_pid:
+            sampler = ResourceSampler(server_pid)
+            baseline_rss = sampler.sample()[1]
+            sampler.start()
+        stats_before = standin_stats(standin_url)
+        results = Results()
+        t0 = time.monotonic()
+        asyncio.run(drive(ws_url, args.sessions, args.duration, args.cadence, args.ramp, args.aligned, results))
+        elapsed = time.monotonic() - t0
+        stats_after = standin_stats(standin_url)
+        if sampler:
+            sampler.stop()
+        report = build_report(args, results, elapsed, sampler, baseline_rss, stats_before, stats_after)
+    finally:
+        if app_proc:
+            app_proc.terminate()
+            app_proc.wait(timeout=10)
+        if standin:
+            standin.shutdown()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
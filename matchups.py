@@ -0,0 +1,136 @@
+"""
+Precomputed static-factor contributions for every home/away pairing.
+
+Factors 1 (DVOA), 2 (defense rank), 3 (home field), 5 (home win %) and 6 (road win %)
+of calc_ml_score depend only on the team-stats snapshot and which side is home. They
+are computed for all pairings at once with NumPy broadcasting into (N, N) arrays
+indexed [home_id, away_id]: points for each side plus a bitmask of reason codes.
+Reason strings are formatted once per team and assembled from the codes on lookup.
+
+Team ids are team_registry ids (any alias resolves); the extra last id stands for any
+team missing from the snapshot (model defaults: dvoa 0, def rank 16, .500 home/away).
+
+matrix() rebuilds only when the snapshot changes, so live scoring is a lookup plus
+the dynamic factors, and what_if() answers any pairing instantly.
+
+    python matchups.py Buffalo "Kansas City"
+"""
+import sys
+import threading
+
+import numpy as np
+
+import team_registry
+import team_stats
+
+TEAMS = team_stats.TEAMS
+UNKNOWN = len(TEAMS)
+N = len(TEAMS) + 1
+
+# Reason codes (bit positions). Factors 1-3 are listed before the injury factor,
+# 5-6 after it, matching the order calc_ml_score reports reasons in.
+DVOA, DEF, HOME, HOME_WIN, ROAD_WIN, OPP_ROAD = (1 << i for i in range(6))
+PRE_INJURY = (DVOA, DEF, HOME)
+POST_INJURY = (HOME_WIN, ROAD_WIN, OPP_ROAD)
+
+
+class MatchupMatrix:
+    def __init__(self, stats):
+        self.version = stats.get("version")
+        rows = [stats["teams"].get(t, {}) for t in TEAMS] + [{}]
+        dvoa = np.array([r.get("dvoa", 0) for r in rows], dtype=np.float64)
+        def_rank = np.array([r.get("def_rank", 16) for r in rows], dtype=np.int64)
+        home_wp = np.array([r.get("home_win_pct", 0.5) for r in rows], dtype=np.float64)
+        away_wp = np.array([r.get("away_win_pct", 0.5) for r in rows], dtype=np.float64)
+
+        h = np.ones((N, 1), dtype=bool)  # broadcast helpers: rows = home, cols = away
+        a = np.ones((1, N), dtype=bool)
+        diff = dvoa[:, None] - dvoa[None, :]
+        home_dvoa = diff > 8
+        away_dvoa = diff < -8
+        home_def = (def_rank <= 5)[:, None] & a
+        away_def = h & (def_rank <= 5)[None, :]
+        home_wins = (home_wp > 0.65)[:, None] & a
+        road_win = h & (away_wp >= 0.60)[None, :]
+        opp_road = h & (away_wp <= 0.35)[None, :]
+
+        # FACTORS 1, 2, 3, 5, 6
+        self.score_home = 1.0 * home_dvoa + 1.0 * home_def + 1.0 + 0.8 * home_wins + 0.6 * opp_road
+        self.score_away = 1.0 * away_dvoa + 1.0 * away_def + 0.8 * road_win
+        self.codes_home = (DVOA * home_dvoa | DEF * home_def | HOME | HOME_WIN * home_wins
+                           | OPP_ROAD * opp_road).astype(np.uint8)
+        self.codes_away = (DVOA * away_dvoa | DEF * away_def | ROAD_WIN * road_win).astype(np.uint8)
+
+        self._text = {
+            DVOA: [f"📊 DVOA +{d:.0f}" for d in dvoa],
+            DEF: [f"🛡️ #{r} DEF" for r in def_rank],
+            HOME: ["🏠 Home"] * N,
+            HOME_WIN: [f"🏟️ {int(p*100)}% Home Win" for p in home_wp],
+        }
+        self._road_win_text = [f"✈️ {int(p*100)}% Road Win" for p in away_wp]
+        self._opp_road_text = [f"✈️ Opp {int(p*100)}% Road" for p in away_wp]
+
+        # Decode every pairing once so a live lookup is two list indexes
+        sh, sa = self.score_home.tolist(), self.score_away.tolist()
+        ch, ca = self.codes_home.tolist(), self.codes_away.tolist()
+        self._pairs = [[(sh[i][j], sa[i][j],
+                         tuple(self.reasons(ch[i][j], i, j, PRE_INJURY)), tuple(self.reasons(ch[i][j], i, j, POST_INJURY)),
+                         tuple(self.reasons(ca[i][j], j, i, PRE_INJURY)), tuple(self.reasons(ca[i][j], j, i, POST_INJURY)))
+                        for j in range(N)] for i in range(N)]
+
+    def reasons(self, codes, team, opponent, order):
+        """Reason strings for `team` (id) from its code bitmask, in factor order"""
+        out = []
+        for code in order:
+            if not codes & code:
+                continue
+            if code == ROAD_WIN:
+                out.append(self._road_win_text[team])
+            elif code == OPP_ROAD:
+                out.append(self._opp_road_text[opponent])
+            else:
+                out.append(self._text[code][team])
+        return out
+
+    def lookup(self, home_team, away_team):
+        """
+        Static contributions for one pairing:
+        (score_home, score_away, (pre_home, post_home), (pre_away, post_away))
+        where pre/post are the reasons before and after the injury factor.
+        """
+        sh, sa, pre_h, post_h, pre_a, post_a = \
+            self._pairs[team_registry.team_id(home_team, UNKNOWN)][team_registry.team_id(away_team, UNKNOWN)]
+        return sh, sa, (list(pre_h), list(post_h)), (list(pre_a), list(post_a))
+
+
+_current = (None, None)  # (snapshot key, MatchupMatrix), swapped as one tuple
+_build_lock = threading.Lock()
+
+
+def matrix(stats=None):
+    """MatchupMatrix for the snapshot, rebuilt only when the snapshot changes"""
+    global _current
+    stats = stats or team_stats.current()
+    key = (stats.get("version"), id(stats["teams"]))
+    current_key, current = _current
+    if current_key == key:
+        return current
+    with _build_lock:
+        if _current[0] != key:
+            _current = (key, MatchupMatrix(stats))
+        return _current[1]
+
+
+def what_if(home_team, away_team, stats=None):
+    """Static-factor edge for any pairing, without weather, rest, injuries or form"""
+    score_home, score_away, (pre_h, post_h), (pre_a, post_a) = matrix(stats).lookup(home_team, away_team)
+    return {"home": home_team, "away": away_team, "score_home": score_home, "score_away": score_away,
+            "reasons_home": pre_h + post_h, "reasons_away": pre_a + post_a}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit('usage: python matchups.py HOME AWAY   e.g. python matchups.py Buffalo "Kansas City"')
+    result = what_if(sys.argv[1], sys.argv[2])
+    print(f"{result['home']} {result['score_home']:.1f}  {', '.join(result['reasons_home'])}")
+    print(f"{result['away']} {result['score_away']:.1f}  {', '.join(result['reasons_away'])}")
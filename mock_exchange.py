@@ -0,0 +1,169 @@
+"""
+Local stand-in for Kalshi's public market-data API (KXNFLGAME markets only).
+
+Serves GET /trade-api/v2/markets with the `tickers`, `event_ticker`,
+`series_ticker`, `status`, `limit` and `cursor` parameters. Each market's yes
+price follows a random walk at `--tick-s`, the spread is one or two cents, and
+the two team markets of a game stay complementary.
+
+Seed it with the slate of a recorded or live ESPN scoreboard:
+    python mock_exchange.py --scoreboard-url http://127.0.0.1:8765 --port 8770
+    NFL_KALSHI_BASE_URL=http://127.0.0.1:8770 streamlit run app.py
+
+Request counts are available at /__mock/stats.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import kalshi
+
+MARKETS_PATH = "/trade-api/v2/markets"
+STATS_PATH = "/__mock/stats"
+
+
+class MockExchange(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, tick_s=2.0, volatility=0.02, seed=None):
+        super().__init__(address, MockExchangeHandler)
+        self.tick_s = tick_s
+        self.volatility = volatility
+        self.rng = random.Random(seed)
+        self.games = {}  # {event: {"away": ticker, "home": ticker, "p_home": float, "spread": cents}}
+        self.lock = threading.Lock()
+        self.last_tick = time.time()
+        self.stats = {"requests": 0, "tickers_requested": 0, "markets_served": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_game(self, away_team, home_team, game_date=None, p_home=None):
+        event = kalshi.event_ticker(away_team, home_team, game_date)
+        with self.lock:
+            self.games[event] = {"away": kalshi.market_ticker(event, away_team),
+                                 "home": kalshi.market_ticker(event, home_team),
+                                 "p_home": p_home if p_home is not None else self.rng.uniform(0.3, 0.75),
+                                 "spread": 1}
+        return event
+
+    def add_slate(self, games):
+        """Add every game from nfl_data.parse_scoreboard() output"""
+        return [self.add_game(g["away_team"], g["home_team"], g.get("game_date"))
+                for g in games.values() if g.get("away_team") and g.get("home_team")]
+
+    def _tick(self):
+        now = time.time()
+        steps = int((now - self.last_tick) / self.tick_s) if self.tick_s > 0 else 0
+        if steps <= 0:
+            return
+        self.last_tick += steps * self.tick_s
+        for game in self.games.values():
+            for _ in range(min(steps, 50)):
+                game["p_home"] = min(0.97, max(0.03, game["p_home"] + self.rng.gauss(0, self.volatility)))
+            game["spread"] = self.rng.choice((1, 2))
+
+    def markets(self):
+        """Current market payloads, two per game"""
+        with self.lock:
+            self._tick()
+            out = []
+            for event, game in self.games.items():
+                for side, p in (("home", game["p_home"]), ("away", 1 - game["p_home"])):
+                    cents = min(98, max(2, int(round(p * 100))))
+                    bid, ask = cents - 1, min(99, cents - 1 + game["spread"])
+                    out.append({"ticker": game[side], "event_ticker": event,
+                                "series_ticker": kalshi.SERIES, "status": "active",
+                                "yes_bid": bid, "yes_ask": ask, "no_bid": 100 - ask, "no_ask": 100 - bid,
+                                "last_price": cents, "volume": self.rng.randint(1000, 50000)})
+            return out
+
+    def count(self, **fields):
+        with self.lock:
+            for field, n in fields.items():
+                self.stats[field] += n
+
+
+class MockExchangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        server = self.server
+        if parts.path == STATS_PATH:
+            with server.lock:
+                self._send(200, dict(server.stats, games=len(server.games)))
+            return
+        if parts.path != MARKETS_PATH:
+            self._send(404, {"error": "not found"})
+            return
+
+        q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        markets = server.markets()
+        if "tickers" in q:
+            wanted = set(q["tickers"].split(","))
+            server.count(tickers_requested=len(wanted))
+            markets = [m for m in markets if m["ticker"] in wanted]
+        if "event_ticker" in q:
+            markets = [m for m in markets if m["event_ticker"] == q["event_ticker"]]
+        if "series_ticker" in q:
+            markets = [m for m in markets if m["series_ticker"] == q["series_ticker"]]
+        if q.get("status") == "closed":
+            markets = []
+        start = int(q.get("cursor") or 0)
+        limit = int(q.get("limit") or 100)
+        page = markets[start:start + limit]
+        cursor = str(start + limit) if start + limit < len(markets) else ""
+        server.count(requests=1, markets_served=len(page))
+        self._send(200, {"markets": page, "cursor": cursor})
+
+
+def start_in_thread(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--scoreboard-url", help="ESPN base URL (live or replay_server) to take the slate from")
+    parser.add_argument("--tick-s", type=float, default=2.0, help="seconds between price moves")
+    parser.add_argument("--volatility", type=float, default=0.02, help="std dev of each move, in probability")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = MockExchange((args.host, args.port), tick_s=args.tick_s, volatility=args.volatility, seed=args.seed)
+    if args.scoreboard_url:
+        import nfl_data
+        nfl_data.ESPN_NFL_URL = f"{args.scoreboard_url.rstrip('/')}/apis/site/v2/sports/football/nfl"
+        server.add_slate(nfl_data.fetch_espn_scores())
+    print(f"Mock exchange with {len(server.games)} games on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
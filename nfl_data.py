@@ -0,0 +1,404 @@
+"""
+ESPN / Open-Meteo data access.
+
+Each fetcher is split into the HTTP call and a pure parse_* function so the parsing
+hot paths can be benchmarked on recorded fixtures. Fetchers raise upstream.UpstreamError
+on timeouts, HTTP errors and malformed payloads instead of returning defaults, so a
+failure is never cached as good data; app.py wraps them in st.cache_data and
+upstream.Fallback. No Streamlit imports here.
+"""
+import os
+from datetime import datetime
+
+import numpy as np
+import pytz
+
+from nfl_teams import KALSHI_CODES, TEAM_ABBREVS
+from rest_index import RestIndex
+from upstream import UpstreamError, get_json, record_error
+
+eastern = pytz.timezone("US/Eastern")
+
+# ========== UPSTREAM BASE URLS ==========
+# Override via env vars to point every fetcher at a local stand-in (see replay_server.py)
+ESPN_BASE_URL = os.environ.get("NFL_ESPN_BASE_URL", "https://site.api.espn.com").rstrip("/")
+OPEN_METEO_BASE_URL = os.environ.get("NFL_OPEN_METEO_BASE_URL", "https://api.open-meteo.com").rstrip("/")
+OPEN_METEO_ARCHIVE_URL = os.environ.get("NFL_OPEN_METEO_ARCHIVE_URL", "https://archive-api.open-meteo.com").rstrip("/")
+ESPN_NFL_URL = f"{ESPN_BASE_URL}/apis/site/v2/sports/football/nfl"
+# Optional columnar history (datalake.py); form and rest days read from it when it has every past week
+LAKE_DIR = os.environ.get("NFL_LAKE_DIR", "")
+
+
+def current_season(today=None):
+    """NFL season year: the season that started in the fall (Jan/Feb games belong to last year's)"""
+    today = today or datetime.now(eastern)
+    return today.year if today.month >= 8 else today.year - 1
+
+
+def _lake():
+    if not LAKE_DIR:
+        return None
+    import datalake
+    return datalake.DataLake(LAKE_DIR)
+
+
+def _lake_season(season):
+    """
+    (lake, weeks to read from it, current week's scoreboard URL or None) when the lake holds
+    every week of the season before the current one; None to read the season from ESPN
+    """
+    lake = _lake()
+    if lake is None or not lake.has_season(season):
+        return None
+    import datalake
+    current = datalake.current_week(season)
+    if lake.missing_weeks(season, current):
+        return None
+    url = datalake.stored_week_url(season, current)
+    if url is None:
+        return lake, None, None
+    return lake, [w for w in lake.weeks_present("games", season) if w < current], url
+
+
+def _espn_date(text):
+    return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+def _fetch(endpoint, url, parse, timeout=10, expect=None):
+    """get_json + parse; a payload the parser chokes on counts as malformed"""
+    data = get_json(endpoint, url, timeout=timeout, expect=expect)
+    try:
+        return parse(data)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+        err = UpstreamError(endpoint, "malformed", f"parse failed: {e!r}")
+        record_error(err)
+        raise err from e
+
+
+# ========== WEATHER API ==========
+def parse_weather(data):
+    current = data.get("current", {})
+    return {
+        "temp": current.get("temperature_2m", 70),
+        "wind": current.get("wind_speed_10m", 0),
+        "precip": current.get("precipitation", 0),
+        "code": current.get("weather_code", 0)
+    }
+
+def fetch_weather(lat, lon):
+    """Fetch weather from Open-Meteo (free, no API key)"""
+    url = f"{OPEN_METEO_BASE_URL}/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,wind_speed_10m,precipitation,weather_code&wind_speed_unit=mph&temperature_unit=fahrenheit"
+    return _fetch("forecast", url, parse_weather, timeout=5, expect="current")
+
+
+HOURLY_WEATHER = ("temperature_2m", "wind_speed_10m", "precipitation", "weather_code")
+
+
+def parse_weather_history(data):
+    """(epoch seconds int64 array, {field: float array}) from an hourly archive response; NaN where missing"""
+    hourly = data["hourly"]
+    times = np.asarray(hourly["time"], dtype=np.int64)
+    return times, {f: np.array(hourly.get(f) or [None] * len(times), dtype=np.float64) for f in HOURLY_WEATHER}
+
+
+def fetch_weather_history(lat, lon, start_date, end_date):
+    """Hourly weather between two dates (YYYY-MM-DD, inclusive, UTC) from the Open-Meteo archive, in one request"""
+    url = (f"{OPEN_METEO_ARCHIVE_URL}/v1/archive?latitude={lat}&longitude={lon}"
+           f"&start_date={start_date}&end_date={end_date}&hourly={','.join(HOURLY_WEATHER)}"
+           f"&wind_speed_unit=mph&temperature_unit=fahrenheit&timezone=GMT&timeformat=unixtime")
+    return _fetch("archive", url, parse_weather_history, timeout=30, expect="hourly")
+
+
+# ========== RECENT FORM (Last 5 Games) ==========
+def parse_team_records(data):
+    records = {}
+    for group in data.get("children", []):
+        for team_standing in group.get("standings", {}).get("entries", []):
+            team_info = team_standing.get("team", {})
+            team_name = team_info.get("displayName", "")
+            team_key = TEAM_ABBREVS.get(team_name, team_name)
+
+            stats = team_standing.get("stats", [])
+            wins, losses, streak = 0, 0, "—"
+
+            for stat in stats:
+                if stat.get("name") == "wins":
+                    wins = int(stat.get("value", 0))
+                elif stat.get("name") == "losses":
+                    losses = int(stat.get("value", 0))
+                elif stat.get("name") == "streak":
+                    streak = stat.get("displayValue", "—")
+
+            records[team_key] = {
+                "wins": wins,
+                "losses": losses,
+                "streak": streak,
+                "win_pct": wins / (wins + losses) if (wins + losses) > 0 else 0.5
+            }
+    return records
+
+def fetch_team_records():
+    """Fetch current season records from ESPN"""
+    url = f"{ESPN_NFL_URL}/standings"
+    return _fetch("standings", url, parse_team_records, expect="children")
+
+def _final_results(data):
+    """(date, team_key, win) per team for every final game in a scoreboard payload"""
+    for event in data.get("events", []):
+        status = event.get("status", {}).get("type", {}).get("name", "")
+        if status != "STATUS_FINAL":
+            continue
+
+        comp = event.get("competitions", [{}])[0]
+        competitors = comp.get("competitors", [])
+        if len(competitors) < 2:
+            continue
+
+        game_date = event.get("date", "")
+
+        for c in competitors:
+            team_name = c.get("team", {}).get("displayName", "")
+            team_key = TEAM_ABBREVS.get(team_name, team_name)
+            yield game_date, team_key, c.get("winner", False)
+
+def parse_last_5_records(data):
+    """Last 5 game results for each team from a season scoreboard payload"""
+    return last_5_from_results(_final_results(data))
+
+def last_5_from_results(results):
+    """Last 5 game results for each team from (date, team_key, win) rows"""
+    last_5 = {}
+    team_games = {team: [] for team in KALSHI_CODES.keys()}
+
+    for game_date, team_key, winner in results:
+        if team_key in team_games:
+            team_games[team_key].append({
+                "date": game_date,
+                "win": winner
+            })
+
+    # Get last 5 for each team
+    for team, games in team_games.items():
+        games.sort(key=lambda x: x['date'], reverse=True)
+        recent = games[:5]
+        wins = sum(1 for g in recent if g['win'])
+        losses = len(recent) - wins
+
+        # Create form string (W/L pattern)
+        form = "".join(["W" if g['win'] else "L" for g in recent])
+
+        last_5[team] = {
+            "wins": wins,
+            "losses": losses,
+            "form": form,
+            "hot": wins >= 4,
+            "cold": losses >= 4
+        }
+    return last_5
+
+def fetch_last_5_records(season=None):
+    """Fetch last 5 game results for each team"""
+    season = season or current_season()
+    split = _lake_season(season)
+    if split is not None:
+        lake, weeks, week_url = split
+        results = list(lake.final_results(season, weeks))
+        if week_url:
+            results += _fetch("season_scoreboard", week_url,
+                              lambda data: [(_espn_date(d), t, w) for d, t, w in _final_results(data)], expect="events")
+        return last_5_from_results(results)
+    # Get completed games from scoreboard
+    url = f"{ESPN_NFL_URL}/scoreboard?dates={season}&limit=300"
+    return _fetch("season_scoreboard", url, parse_last_5_records, expect="events")
+
+
+# ========== REST DAYS CALCULATION ==========
+def parse_team_schedules(data, index=None):
+    """Per-team game timeline (final and scheduled) from a season scoreboard payload"""
+    index = index if index is not None else RestIndex()
+    index.add_games(_schedule_rows(data))
+    return index
+
+def _schedule_rows(data):
+    """(event_id, kickoff, home, away) for every dated game in a scoreboard payload"""
+    for event in data.get("events", []):
+        game_date_str = event.get("date", "")
+        try:
+            game_date = datetime.fromisoformat(game_date_str.replace("Z", "+00:00"))
+        except:
+            continue
+
+        comp = event.get("competitions", [{}])[0]
+        sides = {}
+        for c in comp.get("competitors", []):
+            team_name = c.get("team", {}).get("displayName", "")
+            sides[c.get("homeAway")] = TEAM_ABBREVS.get(team_name, team_name)
+        yield event.get("id", ""), game_date, sides.get("home"), sides.get("away")
+
+def fetch_team_schedules(season=None):
+    """Season-long rest-day index (rest_index.RestIndex) for every team"""
+    season = season or current_season()
+    split = _lake_season(season)
+    if split is not None:
+        lake, _, week_url = split
+        index = RestIndex(lake.schedule(season))  # every stored week, including scheduled games
+        if week_url:
+            _fetch("season_scoreboard", week_url, lambda data: parse_team_schedules(data, index), expect="events")
+        return index
+    url = f"{ESPN_NFL_URL}/scoreboard?dates={season}&limit=300"
+    return _fetch("season_scoreboard", url, parse_team_schedules, expect="events")
+
+
+# ========== LIVE SCOREBOARD ==========
+def parse_scoreboard(data):
+    games = {}
+    for event in data.get("events", []):
+        event_id = event.get("id", "")
+        comp = event.get("competitions", [{}])[0]
+        competitors = comp.get("competitors", [])
+        if len(competitors) < 2:
+            continue
+        home_team, away_team, home_score, away_score = None, None, 0, 0
+        home_id, away_id = None, None
+        home_abbrev, away_abbrev = None, None  # ESPN's actual abbreviations - KEY FIX
+        for c in competitors:
+            name = c.get("team", {}).get("displayName", "")
+            team_name = TEAM_ABBREVS.get(name, name)
+            team_id = c.get("team", {}).get("id", "")
+            espn_abbrev = c.get("team", {}).get("abbreviation", "")  # Get ESPN's abbreviation
+            score = int(c.get("score", 0) or 0)
+            if c.get("homeAway") == "home":
+                home_team, home_score, home_id = team_name, score, team_id
+                home_abbrev = espn_abbrev
+            else:
+                away_team, away_score, away_id = team_name, score, team_id
+                away_abbrev = espn_abbrev
+
+        status_obj = event.get("status", {})
+        status_type = status_obj.get("type", {}).get("name", "STATUS_SCHEDULED")
+        clock = status_obj.get("displayClock", "")
+        period = status_obj.get("period", 0)
+
+        situation = comp.get("situation", {})
+        down = situation.get("down")
+        distance = situation.get("distance")
+        yards_to_endzone = situation.get("yardsToEndzone", 50)
+        possession_id = situation.get("possession", "")
+        is_red_zone = situation.get("isRedZone", False)
+        poss_text = situation.get("possessionText", "")
+
+        # NEW: Get lastPlay for scoring detection
+        last_play = situation.get("lastPlay", {})
+
+        if possession_id == home_id:
+            possession_team = home_team
+            is_home_possession = True
+        elif possession_id == away_id:
+            possession_team = away_team
+            is_home_possession = False
+        else:
+            possession_team = None
+            is_home_possession = None
+
+        game_date_str = event.get("date", "")
+        try:
+            game_date = datetime.fromisoformat(game_date_str.replace("Z", "+00:00"))
+        except:
+            game_date = datetime.now(eastern)
+
+        game_key = f"{away_team}@{home_team}"
+        games[game_key] = {
+            "event_id": event_id, "away_team": away_team, "home_team": home_team,
+            "away_score": away_score, "home_score": home_score,
+            "away_id": away_id, "home_id": home_id,
+            "away_abbrev": away_abbrev, "home_abbrev": home_abbrev,  # KEY FIX: Store ESPN abbreviations
+            "total": away_score + home_score,
+            "period": period, "clock": clock, "status_type": status_type,
+            "game_date": game_date, "down": down, "distance": distance,
+            "yards_to_endzone": yards_to_endzone,
+            "possession_team": possession_team, "is_red_zone": is_red_zone, "poss_text": poss_text,
+            "is_home_possession": is_home_possession,
+            "raw_possession_id": possession_id,
+            "last_play": last_play  # NEW: Store lastPlay for scoring detection
+        }
+    return games
+
+def fetch_espn_scores():
+    """Current scoreboard keyed by 'Away@Home'"""
+    url = f"{ESPN_NFL_URL}/scoreboard"
+    return _fetch("scoreboard", url, parse_scoreboard, expect="events")
+
+
+# ========== PLAY BY PLAY ==========
+def parse_play_by_play(data):
+    """Last 5 plays (newest first) from an ESPN summary payload"""
+    all_plays = []
+
+    if "plays" in data:
+        all_plays = list(data.get("plays", []))  # payload may be shared by coalesced callers
+    if not all_plays and "drives" in data:
+        drives = data.get("drives", {})
+        for drive in drives.get("previous", []):
+            all_plays.extend(drive.get("plays", []))
+        current = drives.get("current", {})
+        if current:
+            all_plays.extend(current.get("plays", []))
+
+    if not all_plays:
+        return []
+
+    recent = list(reversed(all_plays[-5:] if len(all_plays) >= 5 else all_plays))
+    plays = []
+
+    for play in recent:
+        play_text = play.get("text", "") or play.get("description", "") or ""
+        is_scoring = play.get("scoringPlay", False)
+        period_data = play.get("period", {})
+        period = period_data.get("number", 0) if isinstance(period_data, dict) else (period_data or 0)
+        clock_data = play.get("clock", {})
+        clock = clock_data.get("displayValue", "") if isinstance(clock_data, dict) else str(clock_data or "")
+
+        text_lower = play_text.lower()
+        if is_scoring or "touchdown" in text_lower: icon = "🏈"
+        elif "intercept" in text_lower or "fumble" in text_lower: icon = "🔴"
+        elif "field goal" in text_lower: icon = "🥅"
+        elif "punt" in text_lower or "kickoff" in text_lower: icon = "📤"
+        elif "sack" in text_lower: icon = "💥"
+        elif "incomplete" in text_lower: icon = "❌"
+        elif "pass" in text_lower: icon = "🎯"
+        elif any(x in text_lower for x in ["rush", "run ", "middle", "tackle", "guard", "end", "scramble"]): icon = "🏃"
+        elif "kneel" in text_lower: icon = "🧎"
+        elif "penalty" in text_lower: icon = "🚩"
+        else: icon = "▶️"
+
+        if play_text:
+            plays.append({"text": play_text[:100] + "..." if len(play_text) > 100 else play_text,
+                "scoring": is_scoring, "period": period, "clock": clock, "icon": icon})
+    return plays
+
+def fetch_play_by_play(event_id):
+    url = f"{ESPN_NFL_URL}/summary?event={event_id}"
+    return _fetch("summary", url, parse_play_by_play)
+
+
+# ========== INJURIES ==========
+def parse_injuries(data):
+    injuries = {}
+    for team_data in data.get("injuries", []):
+        team_name = team_data.get("displayName", "")
+        team_key = TEAM_ABBREVS.get(team_name, team_name)
+        if not team_key:
+            continue
+        injuries[team_key] = []
+        for player in team_data.get("injuries", []):
+            athlete = player.get("athlete", {})
+            name = athlete.get("displayName", "")
+            status = player.get("status", "")
+            position = athlete.get("position", {}).get("abbreviation", "")
+            if name:
+                injuries[team_key].append({"name": name, "status": status, "position": position})
+    return injuries
+
+def fetch_espn_injuries():
+    url = f"{ESPN_NFL_URL}/injuries"
+    return _fetch("injuries", url, parse_injuries, expect="injuries")
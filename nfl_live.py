@@ -0,0 +1,221 @@
+"""Live game display helpers: scoring-play detection, ball position and the field graphic"""
+import team_registry
+from nfl_teams import KALSHI_CODES
+
+
+def detect_scoring_play(last_play):
+    """
+    Detect if the last play was a scoring play.
+    Returns: (is_scoring, play_type, scoring_team_code)
+    """
+    if not last_play:
+        return False, None, None
+    
+    play_text = last_play.get("text", "") or last_play.get("description", "") or ""
+    is_scoring = last_play.get("scoringPlay", False)
+    play_type_info = last_play.get("type", {})
+    play_type_text = play_type_info.get("text", "") if isinstance(play_type_info, dict) else ""
+    
+    text_lower = play_text.lower()
+    
+    # Detect scoring types
+    if is_scoring or "touchdown" in text_lower or play_type_text == "Touchdown":
+        return True, "touchdown", None
+    elif "field goal" in text_lower and ("good" in text_lower or "made" in text_lower):
+        return True, "field_goal", None
+    elif "extra point" in text_lower and "good" in text_lower:
+        return True, "extra_point", None
+    elif "safety" in text_lower:
+        return True, "safety", None
+    elif "two-point" in text_lower and ("good" in text_lower or "success" in text_lower):
+        return True, "two_point", None
+    
+    return False, None, None
+
+
+def get_ball_position_with_fallback(game_key, g, away_team, home_team, last_positions):
+    """
+    Calculate ball position with smart fallbacks for empty poss_text situations.
+    
+    FIX FROM EARLIER TODAY: Use ESPN's actual abbreviations (away_abbrev, home_abbrev)
+    instead of KALSHI_CODES for matching poss_text team codes.
+    
+    Returns: (ball_yard, display_mode, poss_team, poss_text)
+    display_mode: "normal", "scoring", "between_plays", "kickoff"
+    
+    last_positions is the per-session {game_key: {...}} store of last known positions
+    (st.session_state.last_ball_positions in the app); it is updated in place.
+    """
+    poss_text = g.get('poss_text', '')
+    yards_to_endzone = g.get('yards_to_endzone', 50)
+    possession_team = g.get('possession_team')
+    is_home_possession = g.get('is_home_possession')
+    last_play = g.get('last_play', {})
+    period = g.get('period', 0)
+    clock = g.get('clock', '')
+    
+    # KEY FIX: Use ESPN's actual abbreviations for comparison
+    home_abbrev = g.get('home_abbrev') or team_registry.espn_abbrev(home_team)
+    away_abbrev = g.get('away_abbrev') or team_registry.espn_abbrev(away_team)
+    # Any other alias of either team (e.g. a Kalshi code) resolves through the registry
+    home_id, away_id = team_registry.team_id(home_team), team_registry.team_id(away_team)
+    
+    # Get last known position from session state
+    last_known = last_positions.get(game_key, {})
+    
+    # CASE 1: We have valid poss_text - parse it directly
+    if poss_text and poss_text.strip():
+        parts_poss = poss_text.strip().split()
+        if len(parts_poss) >= 2:
+            try:
+                side_team = parts_poss[0].upper()
+                side_id = team_registry.team_id(side_team)
+                yard_line = int(parts_poss[-1])
+                
+                # FIX: Compare against ESPN abbreviations, not KALSHI_CODES
+                # Field layout: LEFT (0) = Away endzone, RIGHT (100) = Home endzone
+                if side_team == away_abbrev.upper() or (side_id != team_registry.UNKNOWN and side_id == away_id):
+                    # Ball is on away team's side of field (e.g., "BUF 25" = 25 yards from away endzone)
+                    ball_yard = yard_line
+                elif side_team == home_abbrev.upper() or (side_id != team_registry.UNKNOWN and side_id == home_id):
+                    # Ball is on home team's side of field (e.g., "KC 25" = 25 yards from home endzone = 75 from left)
+                    ball_yard = 100 - yard_line
+                else:
+                    # Unknown team code, use yards_to_endzone fallback
+                    if is_home_possession is not None and yards_to_endzone is not None:
+                        ball_yard = yards_to_endzone if is_home_possession else 100 - yards_to_endzone
+                    else:
+                        ball_yard = last_known.get('ball_yard', 50)
+                
+                # Update session state with valid position
+                last_positions[game_key] = {
+                    'ball_yard': ball_yard,
+                    'poss_team': possession_team,
+                    'poss_text': poss_text
+                }
+                
+                return ball_yard, "normal", possession_team, poss_text
+                
+            except (ValueError, IndexError):
+                pass
+    
+    # CASE 2: Empty poss_text - check if scoring play just happened
+    is_scoring, score_type, _ = detect_scoring_play(last_play)
+    
+    if is_scoring:
+        # Determine which endzone to show ball at
+        # If we know who scored, show at their target endzone
+        if last_known.get('poss_team'):
+            scoring_team = last_known.get('poss_team')
+            if scoring_team == home_team:
+                ball_yard = 0  # Home scored - ball at away's endzone (left)
+            else:
+                ball_yard = 100  # Away scored - ball at home's endzone (right)
+        else:
+            # Use last known ball position direction
+            last_yard = last_known.get('ball_yard', 50)
+            ball_yard = 0 if last_yard < 50 else 100
+        
+        score_emoji = "🏈" if score_type == "touchdown" else "🥅" if score_type == "field_goal" else "⚡"
+        return ball_yard, "scoring", None, f"{score_emoji} {score_type.upper().replace('_', ' ')}"
+    
+    # CASE 3: Check for kickoff/punt (ball in transition)
+    if last_play:
+        play_text = (last_play.get("text", "") or "").lower()
+        if "kickoff" in play_text or "kicks off" in play_text:
+            return 65, "kickoff", None, "⚡ KICKOFF"
+        elif "punts" in play_text:
+            return 50, "between_plays", None, "📤 PUNT"
+    
+    # CASE 4: Game in progress but no possession data - use last known or hide
+    if period > 0:
+        # Check if it's end of quarter
+        if clock == "0:00":
+            return last_known.get('ball_yard', 50), "between_plays", None, "⏱️ End of Quarter"
+        
+        # Use last known position as fallback
+        if last_known.get('ball_yard') is not None:
+            return last_known.get('ball_yard'), "between_plays", last_known.get('poss_team'), "Between Plays"
+    
+    # CASE 5: Game not started or no data - show at 50
+    return 50, "between_plays", None, ""
+
+
+def render_football_field(ball_yard, down, distance, possession_team, away_team, home_team, 
+                          yards_to_endzone=None, poss_text=None, display_mode="normal"):
+    """
+    Render football field with ball position.
+    
+    Field layout:
+    - Left (0-10%): Away team's END ZONE (where HOME attacks)
+    - Right (90-100%): Home team's END ZONE (where AWAY attacks)
+    
+    display_mode: "normal", "scoring", "between_plays", "kickoff"
+    """
+    away_code = KALSHI_CODES.get(away_team, away_team[:3].upper())
+    home_code = KALSHI_CODES.get(home_team, home_team[:3].upper())
+    
+    # Build situation text based on display mode
+    if display_mode == "scoring":
+        situation = poss_text or "🏈 SCORE!"
+        poss_display = ""
+        ball_loc = ""
+        direction = ""
+        ball_style = "font-size:28px;text-shadow:0 0 20px #ffff00"
+    elif display_mode == "kickoff":
+        situation = poss_text or "⚡ KICKOFF"
+        poss_display = ""
+        ball_loc = ""
+        direction = ""
+        ball_style = "font-size:24px;text-shadow:0 0 10px #fff"
+    elif display_mode == "between_plays" or not possession_team:
+        situation = poss_text if poss_text else "Between Plays"
+        poss_display = ""
+        ball_loc = ""
+        direction = ""
+        ball_style = "font-size:24px;opacity:0.6;text-shadow:0 0 10px #fff"
+    else:
+        situation = f"{down} & {distance}" if down and distance else ""
+        ball_loc = poss_text if poss_text else ""
+        is_home_poss = possession_team == home_team
+        
+        # Clear possession display with full team name and direction arrow
+        if is_home_poss:
+            poss_display = f"🏈 {home_team.upper()} has the ball ◄◄◄ attacking"
+            direction = "◄"
+        else:
+            poss_display = f"🏈 {away_team.upper()} has the ball ►►► attacking"
+            direction = "►"
+        ball_style = "font-size:24px;text-shadow:0 0 10px #fff"
+    
+    ball_yard = max(0, min(100, ball_yard))
+    # Scale ball_yard (0-100) to visual field (10%-90%) since endzones are 0-10% and 90-100%
+    ball_pct = 10 + (ball_yard / 100) * 80
+    
+    # Red zone indicator
+    red_zone_note = ""
+    if yards_to_endzone and yards_to_endzone <= 20 and possession_team:
+        red_zone_note = " 🔴 RED ZONE!"
+    
+    return f"""<div style="background:#1a1a1a;padding:15px;border-radius:10px;margin:10px 0">
+<div style="text-align:center;margin-bottom:10px;font-size:1.1em">
+<span style="color:#00ff00;font-weight:bold">{poss_display}</span><span style="color:#ff4444">{red_zone_note}</span></div>
+<div style="display:flex;justify-content:space-between;margin-bottom:8px">
+<span style="color:#aaa">{ball_loc}</span>
+<span style="color:#fff;font-weight:bold">{situation}</span></div>
+<div style="position:relative;height:60px;background:linear-gradient(90deg,#8B0000 0%,#8B0000 10%,#228B22 10%,#228B22 90%,#00008B 90%,#00008B 100%);border-radius:8px;overflow:hidden">
+<div style="position:absolute;left:10%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:20%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:30%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:40%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:50%;top:0;bottom:0;width:2px;background:rgba(255,255,255,0.6)"></div>
+<div style="position:absolute;left:60%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:70%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:80%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:90%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.3)"></div>
+<div style="position:absolute;left:{ball_pct}%;top:50%;transform:translate(-50%,-50%);{ball_style}">🏈</div>
+<div style="position:absolute;left:5%;top:50%;transform:translate(-50%,-50%);color:#fff;font-weight:bold;font-size:14px">{away_code}</div>
+<div style="position:absolute;left:95%;top:50%;transform:translate(-50%,-50%);color:#fff;font-weight:bold;font-size:14px">{home_code}</div></div>
+<div style="display:flex;justify-content:space-between;margin-top:5px;color:#888;font-size:11px">
+<span>← {away_code} EZ</span><span>10</span><span>20</span><span>30</span><span>40</span><span>50</span><span>40</span><span>30</span><span>20</span><span>10</span><span>{home_code} EZ →</span></div></div>"""
+
@@ -0,0 +1,187 @@
+"""
+The 10-factor moneyline model: weather impact, rest days, injuries and scoring.
+
+Pure functions over the team tables, the fetcher outputs in nfl_data and the
+derived team-stats snapshot (team_stats.current()).
+"""
+import calibration
+import matchups
+import team_registry
+import team_stats
+from nfl_data import fetch_weather
+
+
+# ========== WEATHER IMPACT ==========
+def get_weather_for_game(home_team, fetch_weather=fetch_weather):
+    """Get weather impact for a game (pass a cached fetch_weather from the app)"""
+    tid = team_registry.team_id(home_team)
+    if team_registry.has(team_registry.DOMES, tid):
+        return {"wind": 0, "precip": 0, "temp": 72, "dome": True, "impact": "none"}
+    
+    coords = team_registry.STADIUMS[tid] if tid != team_registry.UNKNOWN else None
+    if not coords:
+        return {"wind": 0, "precip": 0, "temp": 70, "dome": False, "impact": "none"}
+    
+    weather = fetch_weather(coords[0], coords[1])
+    wind = weather.get("wind", 0)
+    precip = weather.get("precip", 0)
+    temp = weather.get("temp", 70)
+    
+    # Determine impact level
+    if wind >= 20 or precip > 0.5:
+        impact = "severe"
+    elif wind >= 15 or precip > 0.1:
+        impact = "moderate"
+    elif wind >= 10:
+        impact = "light"
+    else:
+        impact = "none"
+    
+    return {"wind": wind, "precip": precip, "temp": temp, "dome": False, "impact": impact}
+
+# ========== REST DAYS ==========
+def get_rest_days(team, game_date, schedule):
+    """Days since the team's game before game_date (schedule: rest_index.RestIndex)"""
+    return max(0, schedule.rest_days(team, game_date))
+
+# ========== ENHANCED ML SCORING ==========
+def get_injury_score(team, injuries):
+    team_injuries = injuries.get(team, [])
+    tid = team_registry.team_id(team)
+    stars = team_registry.STARS[tid] if tid != team_registry.UNKNOWN else ()
+    score = 0
+    out_players = []
+    qb_out = False
+    
+    for inj in team_injuries:
+        name = inj.get("name", "")
+        status = inj.get("status", "").upper()
+        position = inj.get("position", "").upper()
+        name_lower = name.lower()
+        is_star = any(star in name_lower for star in stars)
+        is_qb = position == "QB"
+        
+        if "OUT" in status:
+            if is_qb:
+                score += 5.0
+                qb_out = True
+                out_players.append(f"🚨 {name} (QB)")
+            elif is_star:
+                score += 2.0
+                out_players.append(name)
+    
+    return score, out_players, qb_out
+
+def calc_ml_score(home_team, away_team, injuries, weather_data, last_5, schedule, game_date, stats=None):
+    """Enhanced 10-factor scoring system (stats: a team_stats snapshot, default the current one)"""
+    stats = stats or team_stats.current()
+    pass_heavy, run_heavy = team_registry.style_bits(stats)
+    home_id, away_id = team_registry.team_id(home_team), team_registry.team_id(away_team)
+    
+    # FACTORS 1-3, 5, 6: static per pairing, precomputed in matchups.matrix()
+    score_home, score_away, (pre_home, post_home), (pre_away, post_away) = \
+        matchups.matrix(stats).lookup(home_team, away_team)
+    reasons_home, reasons_away = pre_home, pre_away
+    
+    # FACTOR 4: Injuries (2.5 pts for QB out)
+    home_inj, home_out, home_qb_out = get_injury_score(home_team, injuries)
+    away_inj, away_out, away_qb_out = get_injury_score(away_team, injuries)
+    
+    if away_qb_out:
+        score_home += 2.5
+        reasons_home.append("🏥 Opp QB Out")
+    if home_qb_out:
+        score_away += 2.5
+        reasons_away.append("🏥 Opp QB Out")
+    reasons_home += post_home
+    reasons_away += post_away
+    
+    # FACTOR 7: WEATHER GATE (1.5 pts)
+    if weather_data and not weather_data.get("dome"):
+        wind = weather_data.get("wind", 0)
+        precip = weather_data.get("precip", 0)
+        
+        if wind >= 15 or precip > 0.1:
+            # Penalize pass-heavy teams, boost run-heavy teams
+            if team_registry.has(pass_heavy, away_id):
+                score_home += 1.5
+                reasons_home.append(f"🌧️ Wind {wind:.0f}")
+            elif team_registry.has(pass_heavy, home_id):
+                score_away += 1.5
+                reasons_away.append(f"🌧️ Wind {wind:.0f}")
+            
+            if team_registry.has(run_heavy, home_id):
+                score_home += 0.8
+                reasons_home.append("🏃 Run Game")
+            elif team_registry.has(run_heavy, away_id):
+                score_away += 0.8
+                reasons_away.append("🏃 Run Game")
+    
+    # FACTOR 8: REST DAYS (1.2 pts)
+    if game_date and schedule:
+        home_info = schedule.rest(home_team, game_date)
+        away_info = schedule.rest(away_team, game_date)
+        home_rest = get_rest_days(home_team, game_date, schedule)
+        away_rest = get_rest_days(away_team, game_date, schedule)
+        rest_diff = home_rest - away_rest
+        
+        if rest_diff >= 3:  # Home team more rested
+            score_home += 1.2
+            reasons_home.append(f"😴 +{rest_diff}d Rest{' (Bye)' if home_info['bye'] else ''}")
+        elif rest_diff <= -3:  # Away team more rested
+            score_away += 1.2
+            reasons_away.append(f"😴 +{abs(rest_diff)}d Rest{' (Bye)' if away_info['bye'] else ''}")
+        
+        # Short week penalty (Thursday games)
+        if home_info["short_week"]:
+            score_away += 0.5
+            reasons_away.append("📅 Short Week")
+        if away_info["short_week"]:
+            score_home += 0.5
+            reasons_home.append("📅 Short Week")
+    
+    # FACTOR 9: RECENT FORM - Last 5 (1.5 pts)
+    if last_5:
+        home_form = last_5.get(home_team, {})
+        away_form = last_5.get(away_team, {})
+        
+        if home_form.get("hot"):  # 4-1 or 5-0
+            score_home += 1.5
+            reasons_home.append(f"🔥 {home_form.get('form', '')}")
+        elif home_form.get("cold"):  # 1-4 or 0-5
+            score_away += 1.0
+            reasons_away.append(f"❄️ Opp Cold")
+        
+        if away_form.get("hot"):
+            score_away += 1.5
+            reasons_away.append(f"🔥 {away_form.get('form', '')}")
+        elif away_form.get("cold"):
+            score_home += 1.0
+            reasons_home.append(f"❄️ Opp Cold")
+    
+    # NORMALIZE TO 10-POINT SCALE
+    total = score_home + score_away
+    if total > 0:
+        home_final = round((score_home / total) * 10, 1)
+        away_final = round((score_away / total) * 10, 1)
+    else:
+        home_final, away_final = 5.0, 5.0
+    
+    if home_final >= away_final:
+        return home_team, home_final, reasons_home[:5], home_out, away_out
+    else:
+        return away_team, away_final, reasons_away[:5], home_out, away_out
+
+def win_probability(score):
+    """Calibrated win probability for a model score (see calibration.py)"""
+    return calibration.probability(score)
+
+def get_signal_tier(score):
+    if score >= 8.0:
+        return "🟢 STRONG BUY", "#00ff00"
+    elif score >= 6.5:
+        return "🔵 BUY", "#00aaff"
+    elif score >= 5.5:
+        return "🟡 LEAN", "#ffff00"
+    else:
+        return "⚪ TOSS-UP", "#888888"
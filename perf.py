@@ -0,0 +1,237 @@
+"""
+Lightweight per-stage timing for fetchers and app sections.
+
+Recording is off unless NFL_PERF=1 or a run opts in via begin_run(enabled=True) (the
+sidebar perf panel). When off, stage() hands back a shared no-op context and timed()
+calls straight through, so the instrumentation costs one flag check.
+
+Each finished stage becomes a record in a process-wide ring buffer:
+    {"ts", "run", "stage", "ms", "bytes", "cache", "status"}
+and feeds monotonic per-stage counters for Prometheus export.
+"""
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+RING_SIZE = 2000
+
+_enabled = os.environ.get("NFL_PERF", "") == "1"
+_local = threading.local()
+_lock = threading.Lock()
+_ring = deque(maxlen=RING_SIZE)
+_run_ids = itertools.count(1)
+# {stage: {"calls", "seconds", "bytes", "hit", "miss", "status": {code: n}}}
+_totals = {}
+
+
+def set_enabled(value):
+    global _enabled
+    _enabled = bool(value)
+
+
+def is_enabled():
+    return _enabled or getattr(_local, "enabled", False)
+
+
+def begin_run(enabled=False):
+    """Start a new rerun on this thread; returns its run id"""
+    end_section()
+    _local.enabled = enabled
+    _local.run = next(_run_ids)
+    _local.stack = []
+    _local.t0 = time.perf_counter()
+    return _local.run
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def bind(run, enabled):
+    """Attach a worker thread to a run started elsewhere"""
+    _local.run = run
+    _local.enabled = enabled
+    _local.stack = []
+
+
+class _Stage:
+    __slots__ = ("name", "cached", "t0", "bytes", "status", "noted")
+
+    def __init__(self, name, cached=False):
+        self.name = name
+        self.cached = cached
+        self.bytes = 0
+        self.status = None
+        self.noted = False
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = (time.perf_counter() - self.t0) * 1000
+        _local.stack.pop()
+        cache = None
+        if self.cached:
+            cache = "miss" if self.noted else "hit"
+        _record(self.name, ms, self.bytes, cache, self.status)
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL = _NullStage()
+
+
+def stage(name, cached=False):
+    """Time a block: `with perf.stage("fetch_espn_scores"): ...`"""
+    if not is_enabled():
+        return _NULL
+    return _Stage(name, cached)
+
+
+def timed(name, cached=False):
+    """Decorator form of stage(); cached=True reports hit/miss for st.cache_data wrappers"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return fn(*args, **kwargs)
+            with _Stage(name, cached):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def note_response(resp):
+    """Attribute an upstream response (bytes, status code) to the innermost open stage"""
+    if not is_enabled():
+        return
+    stack = getattr(_local, "stack", None)
+    if stack:
+        top = stack[-1]
+        top.bytes += len(resp.content)
+        top.status = resp.status_code
+        top.noted = True
+        for outer in stack[:-1]:
+            outer.noted = True
+
+
+def note_error(status="error"):
+    """Attribute a failed upstream call (timeout, connection error, bad payload)"""
+    if not is_enabled():
+        return
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].status = status
+        for s in stack:
+            s.noted = True
+
+
+def section(name):
+    """Close the current top-level app section (if any) and open the next one"""
+    end_section()
+    if name and is_enabled():
+        _local.section = _Stage(f"section:{name}").__enter__()
+
+
+def mark(name):
+    """Record a point in the rerun (e.g. first meaningful paint) as ms since begin_run()"""
+    t0 = getattr(_local, "t0", None)
+    if t0 is None or not is_enabled():
+        return
+    _record(f"mark:{name}", (time.perf_counter() - t0) * 1000, 0, None, None)
+
+
+def end_section():
+    open_section = getattr(_local, "section", None)
+    if open_section is not None:
+        _local.section = None
+        open_section.__exit__(None, None, None)
+
+
+def _record(name, ms, nbytes, cache, status):
+    rec = {"ts": time.time(), "run": current_run(), "stage": name, "ms": round(ms, 3),
+           "bytes": nbytes, "cache": cache, "status": status}
+    with _lock:
+        _ring.append(rec)
+        tot = _totals.get(name)
+        if tot is None:
+            tot = _totals[name] = {"calls": 0, "seconds": 0.0, "bytes": 0, "hit": 0, "miss": 0, "status": {}}
+        tot["calls"] += 1
+        tot["seconds"] += ms / 1000
+        tot["bytes"] += nbytes
+        if cache:
+            tot[cache] += 1
+        if status is not None:
+            tot["status"][str(status)] = tot["status"].get(str(status), 0) + 1
+
+
+# ========== READERS / EXPORT ==========
+def records(run=None):
+    with _lock:
+        recs = list(_ring)
+    return [r for r in recs if run is None or r["run"] == run]
+
+
+def totals():
+    with _lock:
+        return {k: dict(v, status=dict(v["status"])) for k, v in _totals.items()}
+
+
+def to_json(run=None):
+    return json.dumps({"records": records(run), "totals": totals()}, indent=2)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_prometheus(prefix="nfl"):
+    """Prometheus text exposition of the cumulative per-stage counters"""
+    tots = totals()
+    lines = []
+
+    def family(name, help_text, kind="counter"):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+    family("stage_calls_total", "Completed stage executions")
+    for stage_name, t in sorted(tots.items()):
+        lines.append(f'{prefix}_stage_calls_total{{stage="{_label(stage_name)}"}} {t["calls"]}')
+    family("stage_seconds_total", "Wall time spent in each stage")
+    for stage_name, t in sorted(tots.items()):
+        lines.append(f'{prefix}_stage_seconds_total{{stage="{_label(stage_name)}"}} {t["seconds"]:.6f}')
+    family("stage_bytes_total", "Bytes downloaded from upstream per stage")
+    for stage_name, t in sorted(tots.items()):
+        lines.append(f'{prefix}_stage_bytes_total{{stage="{_label(stage_name)}"}} {t["bytes"]}')
+    family("stage_cache_total", "Cache lookups per stage by result")
+    for stage_name, t in sorted(tots.items()):
+        for result in ("hit", "miss"):
+            if t[result]:
+                lines.append(f'{prefix}_stage_cache_total{{stage="{_label(stage_name)}",result="{result}"}} {t[result]}')
+    family("upstream_responses_total", "Upstream responses per stage by status code")
+    for stage_name, t in sorted(tots.items()):
+        for code, n in sorted(t["status"].items()):
+            lines.append(f'{prefix}_upstream_responses_total{{stage="{_label(stage_name)}",status="{_label(code)}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _ring.clear()
+        _totals.clear()
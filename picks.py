@@ -0,0 +1,230 @@
+"""
+Headless pick generation: the slate's moneyline picks, reasons and LiveState as JSON.
+
+Only the data and model layers are imported (no Streamlit), so cron jobs and other
+services can consume picks without the page:
+
+    python picks.py slate                  # picks + live states for the current slate
+    python picks.py slate --picks-only --pretty
+    python picks.py serve --port 8780      # GET /slate, /picks, /live, /healthz
+
+The server builds the slate at most once per --ttl seconds, however many clients ask,
+and answers everything in between from the encoded JSON. It fetches through the same
+upstream fallbacks and SWR caches as the app, so a failing upstream serves last-good
+data.
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import calibration
+import livestate
+import nfl_data
+import swr_cache
+import team_stats
+import upstream
+from nfl_model import calc_ml_score, get_signal_tier, get_weather_for_game, win_probability
+from rest_index import RestIndex
+
+DEFAULT_TTL_S = 5
+WEATHER_DEFAULT = {"temp": 70, "wind": 0, "precip": 0, "code": 0}
+
+log = logging.getLogger(__name__)
+
+
+# ========== SCORING ==========
+def score_slate(games, injuries, last_5, schedule, stats, fetch_weather=nfl_data.fetch_weather):
+    """
+    Moneyline pick for every scheduled game, best first. A game the model can't score is
+    left out, logged and counted as a "model" malformed error in upstream.status().
+    """
+    ml_results = []
+    for game_key, g in games.items():
+        if g['status_type'] != "STATUS_SCHEDULED":
+            continue
+        away = g["away_team"]
+        home = g["home_team"]
+
+        weather_data = get_weather_for_game(home, fetch_weather)
+
+        try:
+            pick, score, reasons, home_out, away_out = calc_ml_score(home, away, injuries, weather_data, last_5, schedule, g.get('game_date'), stats)
+            tier, color = get_signal_tier(score)
+
+            # Get DVOA for both teams
+            home_dvoa = stats["teams"].get(home, {}).get('dvoa', 0)
+            away_dvoa = stats["teams"].get(away, {}).get('dvoa', 0)
+
+            ml_results.append({
+                "pick": pick, "score": score, "color": color, "reasons": reasons,
+                "away": away, "home": home, "game_date": g.get('game_date'), "game_key": game_key,
+                "weather": weather_data, "home_out": home_out, "away_out": away_out,
+                "home_dvoa": home_dvoa, "away_dvoa": away_dvoa
+            })
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            log.warning("could not score %s: %r", game_key, e)
+            upstream.record_error(upstream.UpstreamError("model", "malformed", f"{game_key}: {e!r}"))
+            continue
+        upstream.record_ok("model")
+
+    ml_results.sort(key=lambda x: x["score"], reverse=True)
+    return ml_results
+
+
+def pick_json(r):
+    tier, _ = get_signal_tier(r["score"])
+    return {"game": r["game_key"], "away": r["away"], "home": r["home"],
+            "kickoff": r["game_date"].isoformat() if r["game_date"] else None,
+            "pick": r["pick"], "score": r["score"], "tier": tier, "win_prob": round(win_probability(r["score"]), 4),
+            "reasons": r["reasons"], "weather": r["weather"],
+            "injuries_out": {"home": r["home_out"], "away": r["away_out"]},
+            "dvoa": {"home": r["home_dvoa"], "away": r["away_dvoa"]}}
+
+
+def live_json(games):
+    out = []
+    for game_key, g in games.items():
+        if not livestate.is_live(g):
+            continue
+        ls = livestate.classify(g)
+        out.append({"game": game_key, "away": g["away_team"], "home": g["home_team"],
+                    "away_score": g["away_score"], "home_score": g["home_score"],
+                    "period": g["period"], "clock": g["clock"], "possession": g.get("possession_team"),
+                    "state": ls["state"], "expected_move": ls["expected_move"],
+                    "score_pressure": ls["score_pressure"], "red_zone": ls["red_zone"]})
+    return out
+
+
+# ========== FETCH ==========
+# Own registry names, so a process that also runs the app never swaps the app's fetchers
+_sources = None
+_sources_lock = threading.Lock()
+
+
+def sources():
+    global _sources
+    with _sources_lock:
+        if _sources is None:
+            def swr(name, fn, ttl):
+                return swr_cache.cached(f"headless:{name}", fn, ttl)
+            _sources = {
+                "scores": upstream.fallback("headless:scores", "scoreboard", nfl_data.fetch_espn_scores, {}, backoff_s=5),
+                "injuries": upstream.fallback("headless:injuries", "injuries", nfl_data.fetch_espn_injuries, {}),
+                "last_5": upstream.fallback("headless:last_5", "season_scoreboard",
+                                            swr("last_5", nfl_data.fetch_last_5_records, 3600), {}),
+                "schedule": upstream.fallback("headless:schedule", "season_scoreboard",
+                                              swr("schedule", nfl_data.fetch_team_schedules, 86400), RestIndex),
+                "weather": upstream.fallback("headless:weather", "forecast",
+                                             swr("weather", nfl_data.fetch_weather, 1800), WEATHER_DEFAULT),
+            }
+        return _sources
+
+
+def slate(picks=True, live=True):
+    """The current slate as a JSON-ready dict"""
+    src = sources()
+    res = src["scores"].result()
+    games = res.value
+    out = {"generated_at": datetime.now(nfl_data.eastern).isoformat(),
+           "scoreboard": {"ok": res.ok, "stale": res.stale, "age_s": round(res.age_s, 1) if res.age_s is not None else None}}
+    if picks:
+        stats = team_stats.current()
+        schedule = src["schedule"]()
+        schedule.add_games((g["event_id"], g["game_date"], g["home_team"], g["away_team"]) for g in games.values())
+        results = score_slate(games, src["injuries"](), src["last_5"](), schedule, stats, src["weather"])
+        out["model"] = {"stats_version": stats.get("version"), "calibration": calibration.info().get("method")}
+        out["picks"] = [pick_json(r) for r in results]
+    if live:
+        out["live"] = live_json(games)
+    return out
+
+
+# ========== HTTP ==========
+class PicksServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, ttl_s=DEFAULT_TTL_S):
+        super().__init__(address, PicksHandler)
+        self.ttl_s = ttl_s
+        self._body = None  # (built_at, {"slate": bytes, "picks": bytes, "live": bytes})
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def bodies(self):
+        """Encoded responses, rebuilt by one thread at most every ttl_s"""
+        cached = self._body
+        if cached and time.time() - cached[0] < self.ttl_s:
+            return cached[1]
+        with self._lock:
+            cached = self._body
+            if cached and time.time() - cached[0] < self.ttl_s:
+                return cached[1]
+            data = slate()
+            bodies = {"slate": json.dumps(data).encode(),
+                      "picks": json.dumps({k: v for k, v in data.items() if k != "live"}).encode(),
+                      "live": json.dumps({k: v for k, v in data.items() if k not in ("picks", "model")}).encode()}
+            self._body = (time.time(), bodies)
+            return bodies
+
+
+class PicksHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.strip("/")
+        if path == "healthz":
+            self._send(200, b'{"ok": true}')
+        elif path in ("slate", "picks", "live"):
+            self._send(200, self.server.bodies()[path])
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("slate", help="print the current slate as JSON")
+    s.add_argument("--picks-only", action="store_true")
+    s.add_argument("--live-only", action="store_true")
+    s.add_argument("--pretty", action="store_true")
+    v = sub.add_parser("serve", help="serve the slate over HTTP")
+    v.add_argument("--host", default="127.0.0.1")
+    v.add_argument("--port", type=int, default=8780)
+    v.add_argument("--ttl", type=float, default=DEFAULT_TTL_S, help="seconds a built slate is served for")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "slate":
+        data = slate(picks=not args.live_only, live=not args.picks_only)
+        print(json.dumps(data, indent=2 if args.pretty else None, ensure_ascii=False))
+        return
+    server = PicksServer((args.host, args.port), ttl_s=args.ttl)
+    print(f"Serving picks on {server.url}/slate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
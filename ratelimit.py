@@ -0,0 +1,157 @@
+"""
+Token-bucket request budgets per upstream host and per endpoint.
+
+Without a limit, upstream volume is sessions x reruns x fetchers. Every request
+upstream.get_json() sends, and every GA4 event, first takes a token from its endpoint's
+bucket and from its host's bucket. Buckets refill continuously at their budget's rate,
+up to its burst. A request over either budget is not sent: get_json raises
+UpstreamError with kind "throttled". upstream.Fallback answers that with the last good
+value (counted as throttled_stale), or with the default when nothing is cached (counted
+as throttled_dropped). A throttled call does not start the failure backoff, so the next
+rerun retries as soon as a token is back. Cache hits and coalesced duplicates never
+reach the limiter.
+
+Budgets are per process (see shared_cache.py to fetch once for several workers). The
+defaults are in BUDGETS, as requests per minute and burst. NFL_RATE_LIMITS overrides or
+adds entries as a comma-separated name=per_minute[:burst] list. A name with a dot is a
+host, and "*" is the budget of any other host (e.g. a replay_server stand-in):
+
+    NFL_RATE_LIMITS="scoreboard=30:10,site.api.espn.com=300" streamlit run app.py
+    NFL_RATE_LIMITS=off streamlit run app.py          # no limits
+
+Batch jobs call wait_for_tokens(max_s) to sleep for a token instead of being refused.
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# {endpoint or host: (requests per minute, burst)}
+BUDGETS = {
+    "scoreboard": (30, 10),
+    "summary": (120, 40),
+    "injuries": (6, 3),
+    "standings": (6, 3),
+    "season_scoreboard": (12, 6),
+    "forecast": (60, 40),
+    "archive": (60, 30),
+    "kalshi_markets": (120, 20),
+    "collect": (60, 20),
+    "site.api.espn.com": (300, 60),
+    "api.open-meteo.com": (100, 40),
+    "archive-api.open-meteo.com": (60, 30),
+    "www.google-analytics.com": (120, 30),
+    "*": (600, 100),
+}
+
+
+def parse_budgets(text, base=BUDGETS):
+    """BUDGETS updated with an NFL_RATE_LIMITS string; None for "off" """
+    if text.strip().lower() == "off":
+        return None
+    out = dict(base)
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, spec = part.partition("=")
+        rate, _, burst = spec.partition(":")
+        out[name.strip()] = (float(rate), float(burst) if burst else max(1.0, float(rate) / 6))
+    return out
+
+
+class TokenBucket:
+    def __init__(self, per_minute, burst):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.stats = {"allowed": 0, "throttled": 0, "waited": 0}
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_s(self):
+        """Seconds until a token is available (0 when one is)"""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class Limiter:
+    def __init__(self, budgets):
+        self.budgets = budgets
+        self._buckets = {}  # {name: TokenBucket}, created on first use
+        self._lock = threading.Lock()
+
+    def _bucket(self, name, default=None):
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            budget = self.budgets.get(name, default)
+            if budget is None:
+                return None
+            bucket = self._buckets[name] = TokenBucket(*budget)
+        return bucket
+
+    def acquire(self, endpoint, url, max_wait_s=0.0):
+        """Take a token from the endpoint's and the host's bucket; False if over budget for longer than max_wait_s"""
+        host = urlsplit(url).hostname or ""
+        deadline = time.monotonic() + max_wait_s
+        waited = False
+        while True:
+            with self._lock:
+                buckets = [b for b in (self._bucket(endpoint), self._bucket(host, self.budgets.get("*")))
+                           if b is not None]
+                now = time.monotonic()
+                for b in buckets:
+                    b.refill(now)
+                delay = max((b.wait_s() for b in buckets), default=0.0)
+                if delay == 0:
+                    for b in buckets:
+                        b.tokens -= 1
+                        b.stats["allowed"] += 1
+                        b.stats["waited"] += waited
+                    return True
+                if now + delay > deadline:
+                    for b in buckets:
+                        b.stats["throttled"] += b.wait_s() > 0  # only the budgets that were short
+                    return False
+            waited = True
+            time.sleep(delay)
+
+    def status(self):
+        """{bucket: {"per_minute", "burst", "tokens", "allowed", "throttled", "waited"}}"""
+        now = time.monotonic()
+        with self._lock:
+            out = {}
+            for name, b in self._buckets.items():
+                b.refill(now)
+                out[name] = dict(b.stats, per_minute=round(b.rate * 60, 1), burst=b.burst, tokens=round(b.tokens, 1))
+            return out
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+_max_wait_s = 0.0
+
+
+def limiter():
+    """Process-wide Limiter from BUDGETS and NFL_RATE_LIMITS (None when limits are off)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            budgets = parse_budgets(os.environ.get("NFL_RATE_LIMITS", ""))
+            _limiter = Limiter(budgets) if budgets is not None else False
+        return _limiter or None
+
+
+def wait_for_tokens(max_s):
+    """Make acquire() sleep up to max_s for a token instead of refusing (for batch jobs, not the app)"""
+    global _max_wait_s
+    _max_wait_s = max_s
+
+
+def acquire(endpoint, url):
+    lim = limiter()
+    return lim is None or lim.acquire(endpoint, url, _max_wait_s)
+
+
+def status():
+    lim = limiter()
+    return lim.status() if lim is not None else {}
@@ -0,0 +1,323 @@
+"""
+Local ESPN / Open-Meteo / GA4 stand-in for offline load and latency testing.
+
+Record a live timeline by running the app through the recording proxy:
+    python replay_server.py record fixtures/sunday --port 8765
+    NFL_ESPN_BASE_URL=http://127.0.0.1:8765 NFL_OPEN_METEO_BASE_URL=http://127.0.0.1:8765 \\
+        NFL_GA4_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+    NFL_OPEN_METEO_ARCHIVE_URL=http://127.0.0.1:8765 python weather_history.py backfill --dir data/weather
+
+Replay it (e.g. a full Sunday at 10x, with latency, jitter and error injection):
+    python replay_server.py serve fixtures/sunday --speed 10 --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+
+Fixture layout: recordings.jsonl (one line per captured response, with its offset
+from the start of the capture) plus bodies/<sha1>.json.gz, deduplicated by content.
+"""
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+# Path prefix -> real upstream used by the recording proxy. GA4 is never forwarded.
+UPSTREAMS = {
+    "/apis/": "https://site.api.espn.com",
+    "/v1/forecast": "https://api.open-meteo.com",
+    "/v1/archive": "https://archive-api.open-meteo.com",
+}
+GA4_PATH = "/mp/collect"
+STATS_PATH = "/__replay/stats"
+ALERTS_PATH = "/__alerts"  # webhook receiver for alerts.WebhookSink
+
+
+def request_key(path, query):
+    """Normalize path + query so parameter order doesn't matter"""
+    return f"{path}?{urlencode(sorted(parse_qsl(query, keep_blank_values=True)))}"
+
+
+def endpoint_name(path):
+    """Short endpoint label for stats, e.g. 'scoreboard', 'summary', 'forecast'"""
+    return path.rstrip("/").rsplit("/", 1)[-1] or "/"
+
+
+class FixtureStore:
+    """Timeline of recorded responses per request key"""
+
+    def __init__(self, fixture_dir):
+        self.fixture_dir = fixture_dir
+        self.timelines = {}  # {key: ([t, ...], [recording, ...])}
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.duration = 0.0
+        path = os.path.join(fixture_dir, "recordings.jsonl")
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+        for times, recs in self.timelines.values():
+            order = sorted(range(len(times)), key=lambda i: times[i])
+            times[:] = [times[i] for i in order]
+            recs[:] = [recs[i] for i in order]
+
+    def _add(self, rec):
+        times, recs = self.timelines.setdefault(request_key(rec["path"], rec.get("query", "")), ([], []))
+        times.append(rec["t"])
+        recs.append(rec)
+        self.duration = max(self.duration, rec["t"])
+
+    def body(self, rec):
+        name = rec["body"]
+        with self._lock:
+            if name not in self._bodies:
+                with gzip.open(os.path.join(self.fixture_dir, name), "rb") as f:
+                    self._bodies[name] = f.read()
+            return self._bodies[name]
+
+    def lookup(self, path, query, t):
+        """Latest recording at or before timeline offset t (first one if t precedes it)"""
+        timeline = self.timelines.get(request_key(path, query))
+        if not timeline:
+            return None
+        times, recs = timeline
+        idx = bisect.bisect_right(times, t) - 1
+        return recs[max(0, idx)]
+
+
+class Recorder:
+    """Appends proxied upstream responses to a fixture directory"""
+
+    def __init__(self, fixture_dir):
+        self.fixture_dir = fixture_dir
+        os.makedirs(os.path.join(fixture_dir, "bodies"), exist_ok=True)
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._log = open(os.path.join(fixture_dir, "recordings.jsonl"), "a")
+
+    def record(self, path, query, status, content_type, body):
+        digest = hashlib.sha1(body).hexdigest()
+        name = f"bodies/{digest}.json.gz"
+        rec = {"t": round(time.time() - self.started, 3), "path": path, "query": query,
+               "status": status, "content_type": content_type, "body": name}
+        with self._lock:
+            full = os.path.join(self.fixture_dir, name)
+            if not os.path.exists(full):
+                with gzip.open(full, "wb") as f:
+                    f.write(body)
+            self._log.write(json.dumps(rec) + "\n")
+            self._log.flush()
+
+
+class ReplayConfig:
+    def __init__(self, speed=1.0, start_at=0.0, loop=False, latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, error_status=503, timeout_rate=0.0, timeout_s=15.0,
+                 malformed_rate=0.0, seed=None):
+        self.speed = speed
+        self.start_at = start_at
+        self.loop = loop
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+        self.timeout_s = timeout_s
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(seed)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store=None, recorder=None, config=None):
+        super().__init__(address, StandInHandler)
+        self.store = store
+        self.recorder = recorder
+        self.config = config or ReplayConfig()
+        self.started = time.time()
+        self.stats_lock = threading.Lock()
+        self.alerts = deque(maxlen=500)
+        self.stats = {"requests": 0, "by_endpoint": {}, "errors_injected": 0,
+                      "timeouts_injected": 0, "malformed_injected": 0, "misses": 0, "ga4_events": 0,
+                      "alerts": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def timeline_offset(self):
+        cfg = self.config
+        t = cfg.start_at + (time.time() - self.started) * cfg.speed
+        if cfg.loop and self.store and self.store.duration > 0:
+            t %= self.store.duration
+        return t
+
+    def count(self, field, endpoint=None):
+        with self.stats_lock:
+            self.stats[field] = self.stats.get(field, 0) + 1
+            if endpoint:
+                by_ep = self.stats["by_endpoint"]
+                by_ep[endpoint] = by_ep.get(endpoint, 0) + 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        body = self.rfile.read(length) if length else b""
+        path = urlsplit(self.path).path
+        if path == GA4_PATH:
+            self.server.count("ga4_events", "collect")
+            self._send(204, b"")
+        elif path == ALERTS_PATH:
+            try:
+                alert = json.loads(body)
+            except ValueError:
+                self._send(400, b'{"error": "invalid json"}')
+                return
+            with self.server.stats_lock:
+                self.server.alerts.append(alert)
+            self.server.count("alerts")
+            self._send(204, b"")
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path, query = parts.path, parts.query
+        server = self.server
+        if path == STATS_PATH:
+            with server.stats_lock:
+                stats = dict(server.stats, uptime_s=round(time.time() - server.started, 3),
+                             timeline_t=round(server.timeline_offset(), 3))
+            self._send(200, json.dumps(stats).encode())
+            return
+        if path == ALERTS_PATH:
+            with server.stats_lock:
+                received = list(server.alerts)
+            self._send(200, json.dumps({"alerts": received}).encode())
+            return
+
+        server.count("requests", endpoint_name(path))
+        if server.recorder:
+            self._proxy(path, query)
+        else:
+            self._replay(path, query)
+
+    def _proxy(self, path, query):
+        upstream = next((base for prefix, base in UPSTREAMS.items() if path.startswith(prefix)), None)
+        if not upstream:
+            self._send(404, b'{"error": "no upstream for path"}')
+            return
+        try:
+            resp = requests.get(f"{upstream}{path}" + (f"?{query}" if query else ""), timeout=15)
+        except requests.RequestException as e:
+            self._send(502, json.dumps({"error": str(e)}).encode())
+            return
+        content_type = resp.headers.get("Content-Type", "application/json")
+        self.server.recorder.record(path, query, resp.status_code, content_type, resp.content)
+        self._send(resp.status_code, resp.content, content_type)
+
+    def _replay(self, path, query):
+        server = self.server
+        cfg = server.config
+        delay = cfg.latency_ms + cfg.rng.uniform(-cfg.jitter_ms, cfg.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        roll = cfg.rng.random()
+        if roll < cfg.timeout_rate:
+            server.count("timeouts_injected")
+            time.sleep(cfg.timeout_s)
+        elif roll < cfg.timeout_rate + cfg.error_rate:
+            server.count("errors_injected")
+            self._send(cfg.error_status, b'{"error": "injected"}')
+            return
+
+        rec = server.store.lookup(path, query, server.timeline_offset()) if server.store else None
+        if rec is None:
+            server.count("misses")
+            self._send(404, json.dumps({"error": "no recording", "key": request_key(path, query)}).encode())
+            return
+        body = server.store.body(rec)
+        if cfg.rng.random() < cfg.malformed_rate:
+            server.count("malformed_injected")
+            body = body[:len(body) // 2]
+        self._send(rec.get("status", 200), body, rec.get("content_type", "application/json"))
+
+
+def start_in_thread(server):
+    """Run a StandInServer on a daemon thread (for benchmarks and load tests)"""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    rec = sub.add_parser("record", help="proxy to the live APIs and record every response")
+    rec.add_argument("fixture_dir")
+
+    srv = sub.add_parser("serve", help="replay a recorded timeline")
+    srv.add_argument("fixture_dir")
+    srv.add_argument("--speed", type=float, default=1.0, help="timeline speed multiplier (10 = 10x)")
+    srv.add_argument("--start-at", type=float, default=0.0, help="timeline offset in seconds to start from")
+    srv.add_argument("--loop", action="store_true", help="wrap around at the end of the timeline")
+    srv.add_argument("--latency-ms", type=float, default=0.0)
+    srv.add_argument("--jitter-ms", type=float, default=0.0)
+    srv.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    srv.add_argument("--error-status", type=int, default=503)
+    srv.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of requests stalled for --timeout-s")
+    srv.add_argument("--timeout-s", type=float, default=15.0)
+    srv.add_argument("--malformed-rate", type=float, default=0.0, help="fraction of bodies truncated mid-JSON")
+    srv.add_argument("--seed", type=int, default=None)
+
+    for p in (rec, srv):
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8765)
+
+    args = parser.parse_args(argv)
+    if args.mode == "record":
+        server = StandInServer((args.host, args.port), recorder=Recorder(args.fixture_dir))
+        print(f"Recording to {args.fixture_dir} via {server.url}")
+    else:
+        store = FixtureStore(args.fixture_dir)
+        config = ReplayConfig(speed=args.speed, start_at=args.start_at, loop=args.loop,
+                              latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              error_rate=args.error_rate, error_status=args.error_status,
+                              timeout_rate=args.timeout_rate, timeout_s=args.timeout_s,
+                              malformed_rate=args.malformed_rate, seed=args.seed)
+        server = StandInServer((args.host, args.port), store=store, config=config)
+        print(f"Replaying {len(store.timelines)} endpoints ({store.duration:.0f}s timeline) on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
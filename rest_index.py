@@ -0,0 +1,99 @@
+"""
+Per-team game timeline for exact rest-day lookups.
+
+Each team keeps its games (past and scheduled) sorted by kickoff. rest(team, when)
+bisects to the game that actually precedes `when`, so a Thursday game measures rest
+from the previous Sunday even if later games are already final, and a scheduled game
+next week measures from this week's game rather than the last final one.
+
+The index is built once per season from the season scoreboard and extended in place
+from the weekly scoreboard; add_games() upserts by event id, so re-adding a game
+(or a flexed kickoff) is safe.
+"""
+import threading
+from bisect import bisect_left, insort
+
+import pytz
+
+eastern = pytz.timezone("US/Eastern")
+
+DEFAULT_REST_DAYS = 7
+SHORT_WEEK_DAYS = 4  # Thursday after Sunday
+BYE_REST_DAYS = 13  # Sunday two weeks after Sunday
+
+
+def _as_eastern(when):
+    return eastern.localize(when) if when.tzinfo is None else when.astimezone(eastern)
+
+
+class RestIndex:
+    def __init__(self, games=()):
+        self._timelines = {}  # {team: sorted [(kickoff, event_id)]}
+        self._kickoffs = {}  # {event_id: (kickoff, home, away)}
+        self._lock = threading.Lock()
+        self.add_games(games)
+
+    def add_games(self, games):
+        """Upsert (event_id, kickoff, home, away) rows; returns how many changed"""
+        changed = 0
+        with self._lock:
+            for event_id, kickoff, home, away in games:
+                if kickoff is None or not event_id:
+                    continue
+                kickoff = _as_eastern(kickoff)
+                entry = (kickoff, home, away)
+                old = self._kickoffs.get(event_id)
+                if old == entry:
+                    continue
+                if old is not None:
+                    for team in old[1:]:
+                        timeline = self._timelines.get(team, [])
+                        i = bisect_left(timeline, (old[0], event_id))
+                        if i < len(timeline) and timeline[i] == (old[0], event_id):
+                            del timeline[i]
+                self._kickoffs[event_id] = entry
+                for team in (home, away):
+                    if team:
+                        insort(self._timelines.setdefault(team, []), (kickoff, event_id))
+                changed += 1
+        return changed
+
+    def rest(self, team, when):
+        """
+        {"days", "short_week", "bye", "prev", "next"} for `team` playing at `when`.
+
+        days counts Eastern calendar days since the team's previous game (None when it
+        has none this season); prev/next are the neighbouring kickoffs.
+        """
+        when = _as_eastern(when)
+        with self._lock:
+            timeline = self._timelines.get(team, [])
+            # Everything strictly before `when`; a game at exactly `when` is this game
+            i = bisect_left(timeline, (when, ""))
+            prev = timeline[i - 1][0] if i > 0 else None
+            j = i + 1 if i < len(timeline) and timeline[i][0] == when else i
+            nxt = timeline[j][0] if j < len(timeline) else None
+        days = (when.date() - prev.date()).days if prev is not None else None
+        return {"days": days,
+                "short_week": days is not None and days <= SHORT_WEEK_DAYS,
+                "bye": days is not None and days >= BYE_REST_DAYS,
+                "prev": prev, "next": nxt}
+
+    def rest_days(self, team, when, default=DEFAULT_REST_DAYS):
+        days = self.rest(team, when)["days"]
+        return default if days is None else days
+
+    def teams(self):
+        with self._lock:
+            return list(self._timelines)
+
+    def rows(self):
+        """Every game as (event_id, kickoff, home, away); RestIndex(index.rows()) rebuilds it"""
+        with self._lock:
+            return [(event_id, *entry) for event_id, entry in self._kickoffs.items()]
+
+    def __len__(self):
+        return len(self._kickoffs)
+
+    def __contains__(self, team):
+        return team in self._timelines
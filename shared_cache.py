@@ -0,0 +1,386 @@
+"""
+Cross-process snapshot cache for running several Streamlit workers behind a load balancer.
+
+Without it every worker keeps its own st.cache_data / SWR entries and polls ESPN and
+Open-Meteo on its own, so upstream calls and memory grow with the worker count. With
+NFL_SHARED_CACHE_DIR set (ideally on tmpfs, e.g. /dev/shm), the scoreboard, injuries,
+season results and weather go through one snapshot file per source and arguments:
+
+    header  magic, format version, codec, seq, written_at, payload length
+    payload msgpack (JSON when msgpack isn't installed); datetimes and RestIndex as ext types
+
+Writers replace the file atomically (temp file + rename) and bump seq. Readers stat the
+file and only decode when it changed, straight from a read-only mmap of the page cache;
+the decoded value is then reused by every session in that worker until the next version.
+When a snapshot goes stale, whichever worker takes its flock first refreshes it in the
+background while everyone keeps serving the old version (stale-while-revalidate across
+processes). A cold snapshot is loaded by one worker while the others wait for it.
+
+A sidecar can do all the refreshing instead; workers then only read:
+
+    NFL_SHARED_CACHE_DIR=/dev/shm/nfl streamlit run app.py --server.port 8501
+    NFL_SHARED_CACHE_DIR=/dev/shm/nfl streamlit run app.py --server.port 8502
+    python shared_cache.py sidecar --dir /dev/shm/nfl     # optional
+    python shared_cache.py status --dir /dev/shm/nfl
+"""
+import argparse
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from rest_index import RestIndex
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+SHARED_DIR = os.environ.get("NFL_SHARED_CACHE_DIR", "")
+# Seconds a snapshot is served before it is refreshed; shared by the workers and the sidecar
+TTLS = {
+    "fetch_espn_scores": 5,
+    "fetch_espn_injuries": 60,
+    "fetch_weather": 1800,
+    "fetch_team_records": 3600,
+    "fetch_last_5_records": 3600,
+    "fetch_team_schedules": 86400,
+}
+REFRESH_RETRY_S = 30
+COLD_WAIT_S = 15  # how long a worker waits for another worker's cold load before fetching itself
+LOCK_POLL_S = 0.05
+SIDECAR_AHEAD = 0.8  # the sidecar refreshes at this fraction of the TTL, before workers see it stale
+
+MAGIC = b"NFLS"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBxxQdI")  # magic, format version, codec, seq, written_at, payload bytes
+CODEC_MSGPACK, CODEC_JSON = 1, 2
+EXT_DATETIME, EXT_REST_INDEX = 1, 2
+
+
+# ========== SERIALIZATION ==========
+def _pack_default(obj):
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, RestIndex):
+        return msgpack.ExtType(EXT_REST_INDEX, msgpack.packb(obj.rows(), default=_pack_default))
+    raise TypeError(f"can't share {type(obj).__name__}")
+
+
+def _ext_hook(code, data):
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == EXT_REST_INDEX:
+        return RestIndex(msgpack.unpackb(data, ext_hook=_ext_hook))
+    return msgpack.ExtType(code, data)
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return {"__dt__": obj.isoformat()}
+    if isinstance(obj, RestIndex):
+        return {"__rest__": obj.rows()}
+    raise TypeError(f"can't share {type(obj).__name__}")
+
+
+def _json_hook(d):
+    if len(d) == 1:
+        if "__dt__" in d:
+            return datetime.fromisoformat(d["__dt__"])
+        if "__rest__" in d:
+            return RestIndex(d["__rest__"])
+    return d
+
+
+def encode(value):
+    """(codec, payload bytes)"""
+    if HAS_MSGPACK:
+        return CODEC_MSGPACK, msgpack.packb(value, default=_pack_default)
+    return CODEC_JSON, json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+def decode(codec, payload):
+    if codec == CODEC_MSGPACK:
+        return msgpack.unpackb(payload, ext_hook=_ext_hook)
+    return json.loads(bytes(payload), object_hook=_json_hook)
+
+
+# ========== SNAPSHOT FILES ==========
+class SnapshotStore:
+    def __init__(self, root):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self._decoded = {}  # {path: (file identity, value, written_at, seq)}
+        self._lock = threading.Lock()
+
+    def path(self, name, args=()):
+        key = f"-{hashlib.sha1(repr(args).encode()).hexdigest()[:12]}" if args else ""
+        return os.path.join(self.root, f"{name.replace(os.sep, '_')}{key}.snap")
+
+    def read(self, path):
+        """(value, written_at, seq) of the current version, or None; decoded once per version"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        ident = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            hit = self._decoded.get(path)
+        if hit is not None and hit[0] == ident:
+            return hit[1:]
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                magic, fmt, codec, seq, written_at, size = HEADER.unpack_from(m)
+                if magic != MAGIC or fmt != FORMAT_VERSION or codec not in (CODEC_MSGPACK, CODEC_JSON):
+                    return None
+                if codec == CODEC_MSGPACK and not HAS_MSGPACK:
+                    return None
+                with memoryview(m)[HEADER.size:HEADER.size + size] as payload:
+                    value = decode(codec, payload)
+        except (FileNotFoundError, ValueError, struct.error):
+            return None  # replaced or truncated under us; the caller treats it as cold
+        with self._lock:
+            self._decoded[path] = (ident, value, written_at, seq)
+        return value, written_at, seq
+
+    def header(self, path):
+        """(seq, written_at, payload bytes, codec) without decoding, or None"""
+        try:
+            with open(path, "rb") as f:
+                magic, fmt, codec, seq, written_at, size = HEADER.unpack(f.read(HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return None
+        return (seq, written_at, size, codec) if magic == MAGIC else None
+
+    def write(self, path, value, seq):
+        codec, payload = encode(value)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, codec, seq, time.time(), len(payload)))
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @contextmanager
+    def leader(self, path, wait_s=0):
+        """Hold path's refresh lock; yields False if another process (or thread) still holds it after wait_s"""
+        fd = os.open(path + ".lock", os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            deadline = time.time() + wait_s
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    held = True
+                    break
+                except BlockingIOError:
+                    if time.time() >= deadline:
+                        held = False
+                        break
+                    time.sleep(LOCK_POLL_S)
+            yield held
+        finally:
+            os.close(fd)  # releases the flock
+
+    def snapshots(self):
+        """{file name: {"seq", "age_s", "bytes", "codec"}} for every snapshot in the directory"""
+        out = {}
+        now = time.time()
+        for fname in sorted(os.listdir(self.root)):
+            if fname.endswith(".snap"):
+                head = self.header(os.path.join(self.root, fname))
+                if head:
+                    seq, written_at, size, codec = head
+                    out[fname] = {"seq": seq, "age_s": round(now - written_at, 1), "bytes": size,
+                                  "codec": "msgpack" if codec == CODEC_MSGPACK else "json"}
+        return out
+
+
+# ========== SHARED FETCHERS ==========
+class SharedSnapshot:
+    def __init__(self, store, name, fn, ttl, retry_s=REFRESH_RETRY_S):
+        self.store = store
+        self.name = name
+        self.fn = fn
+        self.ttl = ttl
+        self.retry_s = retry_s
+        self._refreshing = set()  # args with a background refresh running in this process
+        self._failed_at = {}  # {args: ts of last failed refresh}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "waited": 0, "loads": 0, "load_errors": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def __call__(self, *args):
+        path = self.store.path(self.name, args)
+        snap = self.store.read(path)
+        if snap is not None:
+            value, written_at, _ = snap
+            now = time.time()
+            if now - written_at < self.ttl:
+                self._count("hits")
+                return value
+            with self._lock:
+                self.stats["stale_hits"] += 1
+                start = args not in self._refreshing and now - self._failed_at.get(args, 0) >= self.retry_s
+                if start:
+                    self._refreshing.add(args)
+            if start:
+                threading.Thread(target=self._refresh, args=(path, args), daemon=True,
+                                 name=f"shared-{self.name}").start()
+            return value
+
+        # Cold: load it here, or wait for the worker that already is
+        self._count("misses")
+        with self.store.leader(path, wait_s=COLD_WAIT_S) as held:
+            snap = self.store.read(path)
+            if snap is not None:
+                self._count("waited")
+                return snap[0]
+            value = self.fn(*args)
+            if held:
+                self.store.write(path, value, 1)
+                self._count("loads")
+            return value
+
+    def _refresh(self, path, args, fresh_for=None):
+        """Reload and publish one snapshot unless another process is already doing it; True if written"""
+        fresh_for = self.ttl if fresh_for is None else fresh_for
+        try:
+            with self.store.leader(path) as held:
+                if not held:
+                    return False
+                snap = self.store.read(path)
+                if snap is not None and time.time() - snap[1] < fresh_for:
+                    return False  # another worker refreshed it while we were deciding
+                value = self.fn(*args)
+                self.store.write(path, value, (snap[2] if snap else 0) + 1)
+            with self._lock:
+                self.stats["loads"] += 1
+                self._failed_at.pop(args, None)
+            return True
+        except Exception:
+            with self._lock:
+                self.stats["load_errors"] += 1
+                self._failed_at[args] = time.time()
+            return False
+        finally:
+            with self._lock:
+                self._refreshing.discard(args)
+
+
+_store = None
+_snapshots = {}
+_registry_lock = threading.Lock()
+
+
+def enabled():
+    return bool(SHARED_DIR)
+
+
+def store():
+    global _store
+    with _registry_lock:
+        if _store is None:
+            _store = SnapshotStore(SHARED_DIR)
+        return _store
+
+
+def shared(name, fn, ttl=None):
+    """
+    fn backed by the shared snapshot `name` (TTL from TTLS unless given); fn itself when
+    NFL_SHARED_CACHE_DIR isn't set. Registered per process like swr_cache.cached().
+    """
+    if not enabled():
+        return fn
+    snapshots = store()
+    with _registry_lock:
+        snap = _snapshots.get(name)
+        if snap is None:
+            snap = _snapshots[name] = SharedSnapshot(snapshots, name, fn, ttl or TTLS[name])
+        else:
+            snap.fn = fn
+        return snap
+
+
+def refresh(name, *args):
+    """Reload a shared snapshot now (pre-warming); False if unknown, already refreshing elsewhere, or failed"""
+    with _registry_lock:
+        snap = _snapshots.get(name)
+    return snap._refresh(snap.store.path(name, args), args, fresh_for=0) if snap else False
+
+
+def status():
+    """This worker's counters per shared source ({} when disabled)"""
+    with _registry_lock:
+        snaps = list(_snapshots.values())
+    out = {}
+    for snap in snaps:
+        with snap._lock:
+            out[snap.name] = dict(snap.stats, ttl_s=snap.ttl, refreshing=len(snap._refreshing))
+    return out
+
+
+# ========== SIDECAR ==========
+def sidecar_sources():
+    """[(name, fn, [args, ...])] matching the names and arguments app.py shares"""
+    import nfl_data
+    import team_registry
+    outdoor = [c for tid, c in enumerate(team_registry.STADIUMS) if c and not team_registry.IS_DOME[tid]]
+    return [("fetch_espn_scores", nfl_data.fetch_espn_scores, [()]),
+            ("fetch_espn_injuries", nfl_data.fetch_espn_injuries, [()]),
+            ("fetch_weather", nfl_data.fetch_weather, outdoor),
+            ("fetch_team_records", nfl_data.fetch_team_records, [()]),
+            ("fetch_last_5_records", nfl_data.fetch_last_5_records, [()]),
+            ("fetch_team_schedules", nfl_data.fetch_team_schedules, [()])]
+
+
+def run_sidecar(snapshots, sources, tick_s=1.0, once=False):
+    """Keep every source fresh, refreshing at SIDECAR_AHEAD of its TTL"""
+    fetchers = [(SharedSnapshot(snapshots, name, fn, TTLS[name]), arg_list) for name, fn, arg_list in sources]
+    while True:
+        for snap, arg_list in fetchers:
+            for args in arg_list:
+                path = snapshots.path(snap.name, args)
+                head = snapshots.header(path)
+                if head is None or time.time() - head[1] >= snap.ttl * SIDECAR_AHEAD:
+                    snap._refresh(path, args, fresh_for=snap.ttl * SIDECAR_AHEAD)
+        if once:
+            return {snap.name: snap.stats for snap, _ in fetchers}
+        time.sleep(tick_s)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cmd", choices=["status", "sidecar"])
+    parser.add_argument("--dir", default=SHARED_DIR or None, required=not SHARED_DIR)
+    parser.add_argument("--once", action="store_true", help="sidecar: refresh everything due once and exit")
+    args = parser.parse_args(argv)
+
+    snapshots = SnapshotStore(args.dir)
+    if args.cmd == "status":
+        print(json.dumps(snapshots.snapshots(), indent=2))
+        return
+    print(f"Refreshing shared snapshots in {args.dir} ({'msgpack' if HAS_MSGPACK else 'json'})")
+    try:
+        stats = run_sidecar(snapshots, sidecar_sources(), once=args.once)
+        if stats:
+            print(json.dumps(stats, indent=2))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Monte Carlo P&L for the open positions on a slate.
+
+Game outcomes are correlated through a one-factor Gaussian copula. Each simulation
+draws a slate-wide shock M (the model or the market being wrong across the slate)
+plus an independent shock per game:
+
+    z_g = sqrt(rho) * M + sqrt(1 - rho) * e_g      the book's side wins when z_g < inv_cdf(p_side)
+
+Per game, the book reduces to two numbers: portfolio P&L if home wins and if away
+wins. Every position on the game counts, on either side. The book's side of a game is
+the one its net exposure is on, so a high M hurts every pick at once, whether it is a
+home or an away pick. Portfolio P&L is then one (n_sims x n_games) @ (n_games,) product.
+
+The latent draws are kept per game (common random numbers), so when one game's
+probability changes only that column is re-thresholded and the P&L vector is
+patched in O(n_sims). Adding a game draws one new column; changing contracts or
+prices only re-does the product; columns of games that leave the book are dropped.
+
+The app asks slate_risk() for a report. The process keeps one simulator per (game set,
+rho), shared by every session whose book covers those games, and memoizes reports on
+their inputs (book, probabilities, rho), so a rerun with nothing new costs a dict lookup.
+"""
+import threading
+from collections import OrderedDict
+from statistics import NormalDist
+
+import numpy as np
+
+N_SIMS = 100_000
+DEFAULT_RHO = 0.1
+MAX_SIMULATORS = 4  # ~0.4 MB per game each at N_SIMS
+MAX_REPORTS = 64
+_NORMAL = NormalDist()
+
+
+def _threshold(p_home):
+    if p_home >= 1:
+        return np.inf
+    if p_home <= 0:
+        return -np.inf
+    return _NORMAL.inv_cdf(p_home)
+
+
+def position_payoffs(pos):
+    """(P&L if the pick wins, P&L if it loses) in dollars for one position"""
+    price = pos.get("price", 50)
+    contracts = pos.get("contracts", 1)
+    return (100 - price) * contracts / 100, -price * contracts / 100
+
+
+class SlateSimulator:
+    def __init__(self, n_sims=N_SIMS, rho=DEFAULT_RHO, seed=None):
+        self.n_sims = n_sims
+        self.rho = rho
+        self.rng = np.random.default_rng(seed)
+        self.market = self.rng.standard_normal(n_sims).astype(np.float32)
+        self.games = []  # column order
+        self._latent = {}  # {game: z column}
+        self._home_wins = np.zeros((n_sims, 0), dtype=np.float32)
+        self._probs = {}  # {game: p_home}
+        self._sides = {}  # {game: 1 when the book is on home, -1 when on away}
+        self._if_home = np.zeros(0)
+        self._if_away = np.zeros(0)
+        self._pnl = np.zeros(n_sims, dtype=np.float64)
+
+    # ========== BOOK ==========
+    def set_positions(self, positions):
+        """
+        positions: [{"game": "Away@Home", "pick": team, "price": cents, "contracts": n}]
+        Draws columns only for new games; returns the game keys in column order.
+        """
+        if_home, if_away = {}, {}
+        for pos in positions:
+            game = pos["game"]
+            home = game.split("@")[1]
+            win, lose = position_payoffs(pos)
+            picked_home = pos.get("pick") == home
+            if_home[game] = if_home.get(game, 0.0) + (win if picked_home else lose)
+            if_away[game] = if_away.get(game, 0.0) + (lose if picked_home else win)
+
+        games = list(if_home)
+        sides = {g: 1 if if_home[g] >= if_away[g] else -1 for g in games}
+        if games != self.games or sides != self._sides:
+            for game in set(self._latent) - set(games):
+                del self._latent[game]
+                self._probs.pop(game, None)
+            for game in games:
+                if game not in self._latent:
+                    self._draw(game)
+            self.games = games
+            self._sides = sides
+            self._stack()
+        self._if_home = np.array([if_home[g] for g in games])
+        self._if_away = np.array([if_away[g] for g in games])
+        self._recompute()
+        return games
+
+    def _draw(self, game):
+        eps = self.rng.standard_normal(self.n_sims).astype(np.float32)
+        self._latent[game] = np.sqrt(self.rho) * self.market + np.sqrt(1 - self.rho) * eps
+
+    def _stack(self):
+        cols = [self._column(g, self._probs.get(g, 0.5)) for g in self.games]
+        self._home_wins = np.column_stack(cols) if cols else np.zeros((self.n_sims, 0), dtype=np.float32)
+
+    def _column(self, game, p_home):
+        """1 where home wins; the latent is flipped for an away-side game so M moves it like the rest"""
+        self._probs[game] = p_home
+        return (self._sides[game] * self._latent[game] < _threshold(p_home)).astype(np.float32)
+
+    def _recompute(self):
+        self._pnl = self._if_away.sum() + self._home_wins @ (self._if_home - self._if_away).astype(np.float32)
+
+    # ========== PROBABILITIES ==========
+    def set_probability(self, game, p_home):
+        """Update one game's home win probability; patches P&L incrementally"""
+        if game not in self.games:
+            self._probs[game] = p_home
+            return False
+        if self._probs.get(game) == p_home:
+            return False
+        i = self.games.index(game)
+        old = self._home_wins[:, i].copy()
+        new = self._column(game, p_home)
+        self._home_wins[:, i] = new
+        self._pnl = self._pnl + (new - old) * float(self._if_home[i] - self._if_away[i])
+        return True
+
+    def set_probabilities(self, probs):
+        """{game: p_home}; returns how many columns changed"""
+        return sum(self.set_probability(g, p) for g, p in probs.items())
+
+    def set_rho(self, rho):
+        """Change the slate correlation (redraws every game's column)"""
+        if rho == self.rho:
+            return
+        self.rho = rho
+        self._latent.clear()
+        for game in self.games:
+            self._draw(game)
+        self._stack()
+        self._recompute()
+
+    # ========== REPORT ==========
+    def pnl(self):
+        return self._pnl
+
+    def report(self, bins=30):
+        """Expected P&L, spread, VaR/CVaR (as positive losses), P(loss) and a histogram"""
+        pnl = self._pnl
+        if not self.games:
+            return None
+        q = np.percentile(pnl, [1, 5, 50, 95])
+        var95, var99 = -q[1], -q[0]
+        tail = pnl[pnl <= q[1]]
+        counts, edges = np.histogram(pnl, bins=bins)
+        return {
+            "n_sims": self.n_sims, "games": len(self.games), "rho": self.rho,
+            "mean": float(pnl.mean()), "std": float(pnl.std()),
+            "p5": float(q[1]), "median": float(q[2]), "p95": float(q[3]),
+            "var95": float(var95), "var99": float(var99),
+            "cvar95": float(-tail.mean()) if len(tail) else float(var95),
+            "p_loss": float((pnl < 0).mean()),
+            "worst": float(self._if_away.sum() + np.minimum(self._if_home - self._if_away, 0).sum()),
+            "best": float(self._if_away.sum() + np.maximum(self._if_home - self._if_away, 0).sum()),
+            "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+        }
+
+
+# ========== PROCESS-WIDE ==========
+_sims = OrderedDict()  # {(games, rho): SlateSimulator}, least recently used first
+_reports = OrderedDict()  # {inputs: report}
+_lock = threading.Lock()
+
+
+def _inputs(positions, probs, rho):
+    games = tuple(sorted({p["game"] for p in positions}))
+    book = tuple(sorted((p["game"], p.get("pick"), p.get("price", 50), p.get("contracts", 1)) for p in positions))
+    return games, (book, tuple((g, round(probs.get(g, 0.5), 4)) for g in games), rho)
+
+
+def slate_risk(positions, probs, rho=DEFAULT_RHO):
+    """
+    report() for a book and {game: p_home}, from the process-wide simulator for its
+    games and rho; only simulated when those inputs change. Treat the result as read-only.
+    """
+    games, key = _inputs(positions, probs, rho)
+    with _lock:
+        report = _reports.get(key)
+        if report is not None:
+            _reports.move_to_end(key)
+            return report
+        sim = _sims.pop((games, rho), None) or SlateSimulator(rho=rho)
+        _sims[(games, rho)] = sim
+        while len(_sims) > MAX_SIMULATORS:
+            _sims.popitem(last=False)
+        sim.set_positions(positions)
+        sim.set_probabilities({g: probs.get(g, 0.5) for g in games})
+        report = _reports[key] = sim.report()
+        while len(_reports) > MAX_REPORTS:
+            _reports.popitem(last=False)
+        return report
@@ -0,0 +1,33 @@
+"""
+Last rendered page data, shared by every session in the process.
+
+Each rerun saves what its sections drew (scoreboard, key injuries, picks). The next
+rerun, in any session, draws its section skeletons from this snapshot before its own
+fetches land, so the page shows the last known state instead of a blank screen.
+"""
+import threading
+import time
+
+_lock = threading.Lock()
+_snapshot = {}  # {section: value, "saved_at": {section: ts}}
+
+
+def save(**sections):
+    """Replace the given sections; sections not passed keep their previous value"""
+    now = time.time()
+    with _lock:
+        saved_at = dict(_snapshot.get("saved_at", {}))
+        saved_at.update((name, now) for name in sections)
+        _snapshot.update(sections, saved_at=saved_at)
+
+
+def last():
+    """The current snapshot ({} before the first save); treat it as read-only"""
+    with _lock:
+        return dict(_snapshot)
+
+
+def age(section):
+    with _lock:
+        ts = _snapshot.get("saved_at", {}).get(section)
+    return time.time() - ts if ts else None
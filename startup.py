@@ -0,0 +1,133 @@
+"""
+Concurrent loader for the page's startup fetches.
+
+Tasks are named functions with the names of the tasks they depend on. Every task
+whose dependencies are met starts at once on a shared thread pool, so a cold page
+waits for the slowest fetch instead of the sum of all of them. Dependents start as
+soon as their inputs arrive and receive them as arguments.
+
+load() returns at the deadline even if some tasks are still running. Those keep
+going in the background and fill their caches (Fallback / SWR / st.cache_data), so
+the next rerun finds them warm. For this rerun, a task's optional `late` hook can
+supply a value it already has (e.g. the fetcher's last good response); dependents of
+such values then run inline, so keep them cheap. Anything left is in `missing` and
+the page draws a placeholder for the sections that need it.
+
+    loaded = startup.load({
+        "scores": (fetch_scores, ()),
+        "schedule": (fetch_schedule, ()),
+        "schedule_ext": (lambda games, schedule: ..., ("scores", "schedule")),
+        "injuries": (fetch_injuries, (), injuries_last_good),  # optional late hook
+    }, deadline_s=4)
+    loaded.values, loaded.missing, loaded.late, loaded.errors, loaded.timings
+"""
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import perf
+
+DEADLINE_S = float(os.environ.get("NFL_STARTUP_DEADLINE_S", "4"))
+MAX_WORKERS = 16
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool():
+    """Process-wide worker pool shared by every session's startup load"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="startup")
+        return _pool
+
+
+class Loaded:
+    def __init__(self):
+        self.values = {}  # {task: value}
+        self.missing = set()  # tasks not finished by the deadline (or failed, or blocked by one that did)
+        self.late = set()  # tasks past the deadline whose value came from their late hook
+        self.errors = {}  # {task: exception}
+        self.timings = {}  # {task: ms from load() start to completion}
+        self.elapsed_ms = None
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+    def ready(self, *names):
+        return not any(n in self.missing for n in names)
+
+
+def _bound(fn, run, enabled):
+    """Run fn in a worker thread attributed to the caller's perf run"""
+    def call(*args):
+        perf.bind(run, enabled)
+        return fn(*args)
+    return call
+
+
+def load(tasks, deadline_s=DEADLINE_S, executor=None):
+    """
+    Run {name: (fn, deps[, late])} concurrently in dependency order until done or
+    deadline_s has passed. fn receives the values of its deps, in order; late() is
+    asked for a stand-in value (None for none) if fn hasn't finished by the deadline.
+    """
+    executor = executor or pool()
+    run, enabled = perf.current_run(), perf.is_enabled()
+    t0 = time.perf_counter()
+    deadline = t0 + deadline_s
+    out = Loaded()
+    pending = dict(tasks)
+    running = {}  # {future: name}
+
+    def start_ready(inline=False):
+        """Start (or, inline, run) every pending task whose deps are in; returns how many"""
+        started = 0
+        for name, (fn, deps, *_) in list(pending.items()):
+            if any(d in out.errors for d in deps):
+                del pending[name]
+                out.errors[name] = RuntimeError(f"dependency failed: {[d for d in deps if d in out.errors]}")
+            elif all(d in out.values for d in deps):
+                del pending[name]
+                started += 1
+                args = [out.values[d] for d in deps]
+                if not inline:
+                    running[executor.submit(_bound(fn, run, enabled), *args)] = name
+                    continue
+                try:
+                    out.values[name] = fn(*args)
+                except Exception as e:
+                    out.errors[name] = e
+        return started
+
+    start_ready()
+    while running:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            out.timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+            try:
+                out.values[name] = future.result()
+            except Exception as e:
+                out.errors[name] = e
+        start_ready()
+
+    # Past the deadline: stand-in values for unfinished tasks, then their cheap dependents
+    for name in list(running.values()) + list(pending):
+        late = tasks[name][2] if len(tasks[name]) > 2 else None
+        value = late() if late else None
+        if value is not None:
+            out.values[name] = value
+            out.late.add(name)
+            pending.pop(name, None)
+    while start_ready(inline=True):
+        pass
+
+    out.missing = set(tasks) - set(out.values)
+    out.elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return out
@@ -0,0 +1,223 @@
+"""
+LiveState stress events and the market moves that follow them.
+
+The sidebar claims MAX UNCERTAINTY and ELEVATED games move prices 3-7¢ and 1-4¢. This
+module measures that. On every scoreboard snapshot the recorder classifies each live
+game with livestate.classify() and logs a transition whenever its state changes (time,
+from/to state, score, period, clock, possession, red zone). It also keeps a price tape
+of the home team's Kalshi mid for each live game, written only when the mid changes.
+Both are kept per Eastern date under NFL_STRESS_DIR:
+
+    events-YYYY-MM-DD.jsonl   one transition per line (a handful per game)
+    prices-YYYY-MM-DD.bin     fixed-width (t float64, game uint32, mid float32) rows
+
+A season of 5 s prices loads with one np.fromfile per day. report() sorts the tape by
+game and time and, game by game, uses searchsorted to find the as-of mid at each
+transition and the prices until that game's next transition (at most WINDOW_S). The
+realized move of an event is its largest excursion from the entry mid, in cents.
+
+    NFL_STRESS_DIR=data/stress streamlit run app.py
+    python stress.py record --dir data/stress          # headless, every 5 s
+    python stress.py report --dir data/stress [--since 2026-09-04]
+"""
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+import kalshi
+import livestate
+from nfl_data import eastern
+
+STRESS_DIR = os.environ.get("NFL_STRESS_DIR", "")
+WINDOW_S = 900  # longest stretch after a transition that counts towards its move
+TAPE_DTYPE = np.dtype([("t", "<f8"), ("game", "<u4"), ("mid", "<f4")])
+RECORD_INTERVAL_S = 5
+
+
+def game_id(g):
+    """ESPN event id as an integer (numeric in practice; hashed otherwise)"""
+    event_id = str(g.get("event_id") or "")
+    return int(event_id) if event_id.isdigit() else zlib.crc32(event_id.encode())
+
+
+def _day(ts):
+    return datetime.fromtimestamp(ts, eastern).strftime("%Y-%m-%d")
+
+
+# ========== RECORDER ==========
+class StressRecorder:
+    def __init__(self, root):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self._states = {}  # {game id: LiveState}
+        self._mids = {}  # {game id: last recorded mid}
+        self._lock = threading.Lock()
+        self.stats = {"snapshots": 0, "transitions": 0, "prices": 0}
+
+    def observe(self, games, quotes=None, ts=None):
+        """
+        Log state transitions and changed home-team mids for the live games in one
+        snapshot; quotes(tickers) -> {ticker: quote} defaults to the shared Kalshi client.
+        Returns the transitions logged.
+        """
+        ts = time.time() if ts is None else ts
+        live = {game_id(g): g for g in games.values() if livestate.is_live(g)}
+        tickers = {gid: kalshi.market_ticker(kalshi.event_ticker(g["away_team"], g["home_team"], g.get("game_date")),
+                                             g["home_team"]) for gid, g in live.items()}
+        book = (quotes or kalshi.client().quotes)(list(tickers.values())) if tickers else {}
+
+        events, prices = [], []
+        with self._lock:
+            self.stats["snapshots"] += 1
+            for gid, g in live.items():
+                ls = livestate.classify(g)
+                prev = self._states.get(gid)
+                if ls["state"] != prev:
+                    self._states[gid] = ls["state"]
+                    events.append({"t": ts, "game": gid, "matchup": f"{g['away_team']}@{g['home_team']}",
+                                   "from": prev, "to": ls["state"],
+                                   "away_score": g["away_score"], "home_score": g["home_score"],
+                                   "period": g["period"], "clock": g["clock"],
+                                   "possession": g.get("possession_team"), "red_zone": ls["red_zone"]})
+                mid = kalshi.implied(book.get(tickers[gid]))
+                if mid is not None and mid != self._mids.get(gid):
+                    self._mids[gid] = mid
+                    prices.append((ts, gid, mid))
+            self.stats["transitions"] += len(events)
+            self.stats["prices"] += len(prices)
+            day = _day(ts)
+            if events:
+                with open(os.path.join(self.root, f"events-{day}.jsonl"), "a") as f:
+                    f.writelines(json.dumps(e) + "\n" for e in events)
+            if prices:
+                with open(os.path.join(self.root, f"prices-{day}.bin"), "ab") as f:
+                    f.write(np.array(prices, dtype=TAPE_DTYPE).tobytes())
+        return events
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def recorder():
+    """Process-wide recorder under NFL_STRESS_DIR (None when unset)"""
+    global _recorder
+    if not STRESS_DIR:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = StressRecorder(STRESS_DIR)
+        return _recorder
+
+
+# ========== ANALYSIS ==========
+def _files(root, prefix, suffix, since=None):
+    paths = sorted(glob.glob(os.path.join(root, f"{prefix}-*{suffix}")))
+    return [p for p in paths if since is None or os.path.basename(p)[len(prefix) + 1:-len(suffix)] >= since]
+
+
+def load_events(root, since=None):
+    events = []
+    for path in _files(root, "events", ".jsonl", since):
+        with open(path) as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    return events
+
+
+def load_tape(root, since=None):
+    """Every recorded price as one TAPE_DTYPE array, sorted by (game, t)"""
+    parts = [np.fromfile(p, dtype=TAPE_DTYPE) for p in _files(root, "prices", ".bin", since)]
+    tape = np.concatenate(parts) if parts else np.empty(0, dtype=TAPE_DTYPE)
+    return tape[np.lexsort((tape["t"], tape["game"]))]
+
+
+def realized_moves(events, tape, window_s=WINDOW_S):
+    """
+    Each transition with "entry_mid", "max_move" and "net_move" (cents; None without prices).
+
+    The window runs from the transition to the same game's next transition, at most
+    window_s. entry_mid is the last mid at or before the transition.
+    """
+    games, starts = np.unique(tape["game"], return_index=True)
+    ends = np.append(starts[1:], len(tape))
+    slices = {int(g): (s, e) for g, s, e in zip(games, starts, ends)}
+
+    by_game = {}
+    for e in sorted(events, key=lambda e: e["t"]):
+        by_game.setdefault(e["game"], []).append(e)
+
+    out = []
+    for gid, game_events in by_game.items():
+        t0 = np.array([e["t"] for e in game_events])
+        t1 = np.minimum(np.append(t0[1:], np.inf), t0 + window_s)
+        s, e = slices.get(gid, (0, 0))
+        times, mids = tape["t"][s:e], tape["mid"][s:e].astype(np.float64)
+        entry = np.searchsorted(times, t0, side="right") - 1  # as-of: last price at or before t0
+        stop = np.searchsorted(times, t1, side="right")
+        for ev, i, j in zip(game_events, entry, stop):
+            row = dict(ev, entry_mid=None, max_move=None, net_move=None)
+            if i >= 0:
+                base = mids[i]
+                path = mids[i:j]
+                row["entry_mid"] = round(float(base), 4)
+                row["max_move"] = round(float(np.abs(path - base).max()) * 100, 2)
+                row["net_move"] = round(float(path[-1] - base) * 100, 2)
+            out.append(row)
+    return out
+
+
+def report(events, tape, window_s=WINDOW_S):
+    """Per state: transitions into it, how many had prices, and the realized moves against the claim"""
+    rows = [r for r in realized_moves(events, tape, window_s) if r["from"] is not None]
+    out = {}
+    for state, info in livestate.STATES.items():
+        moves = np.array([r["max_move"] for r in rows if r["to"] == state and r["max_move"] is not None])
+        nets = np.array([abs(r["net_move"]) for r in rows if r["to"] == state and r["net_move"] is not None])
+        out[state] = {"claimed": info["expected_move"],
+                      "transitions": sum(1 for r in rows if r["to"] == state), "priced": len(moves)}
+        if len(moves):
+            out[state].update(median_max_move=round(float(np.median(moves)), 2),
+                              mean_max_move=round(float(moves.mean()), 2),
+                              p90_max_move=round(float(np.percentile(moves, 90)), 2),
+                              mean_abs_net_move=round(float(nets.mean()), 2))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cmd", choices=["record", "report"])
+    parser.add_argument("--dir", default=STRESS_DIR or None, required=not STRESS_DIR)
+    parser.add_argument("--since", help="report: first date (YYYY-MM-DD)")
+    parser.add_argument("--window", type=float, default=WINDOW_S, help="report: longest window after a transition, seconds")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "report":
+        print(json.dumps(report(load_events(args.dir, args.since), load_tape(args.dir, args.since), args.window),
+                         indent=2, ensure_ascii=False))
+        return
+
+    import nfl_data
+    from upstream import UpstreamError
+    rec = StressRecorder(args.dir)
+    print(f"Recording LiveState transitions and prices to {args.dir} every {RECORD_INTERVAL_S}s")
+    try:
+        while True:
+            try:
+                for e in rec.observe(nfl_data.fetch_espn_scores()):
+                    print(f"{e['matchup']}: {e['from']} -> {e['to']} (Q{e['period']} {e['clock']})")
+            except UpstreamError as e:
+                print(f"skipped: {e}")
+            time.sleep(RECORD_INTERVAL_S)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
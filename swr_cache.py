@@ -0,0 +1,148 @@
+"""
+Stale-while-revalidate cache for the season-scale fetchers (standings, form, schedules).
+
+Within the TTL an entry is served as-is. After the TTL it is still served immediately
+while a single background thread refreshes it, so no rerun ever waits for a
+season-scale download. Only a cold key loads inline, and concurrent cold callers share
+that one load (single-flight). A failed refresh keeps the old value and is retried
+after retry_s; a failed cold load raises to the caller (upstream.Fallback handles it).
+"""
+import threading
+import time
+
+from upstream import UpstreamError
+
+REFRESH_RETRY_S = 60
+
+
+class SWRCache:
+    def __init__(self, name, fn, ttl, retry_s=REFRESH_RETRY_S):
+        self.name = name
+        self.fn = fn
+        self.ttl = ttl
+        self.retry_s = retry_s
+        self._entries = {}  # {args: (value, loaded_at)}
+        self._inflight = {}  # {args: threading.Event}
+        self._errors = {}  # {args: last load error} for coalesced cold callers
+        self._failed_at = {}  # {args: ts of last failed refresh}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0,
+                      "refreshes": 0, "refresh_errors": 0}
+
+    def __call__(self, *args):
+        now = time.time()
+        refresh = None
+        with self._lock:
+            entry = self._entries.get(args)
+            if entry is not None:
+                value, loaded_at = entry
+                if now - loaded_at < self.ttl:
+                    self.stats["hits"] += 1
+                    return value
+                self.stats["stale_hits"] += 1
+                if args not in self._inflight and now - self._failed_at.get(args, 0) >= self.retry_s:
+                    refresh = self._inflight[args] = threading.Event()
+            else:
+                done = self._inflight.get(args)
+                owner = done is None
+                if owner:
+                    done = self._inflight[args] = threading.Event()
+                    self.stats["misses"] += 1
+                else:
+                    self.stats["coalesced"] += 1
+
+        if entry is not None:
+            if refresh is not None:
+                threading.Thread(target=self._load, args=(args, refresh), daemon=True,
+                                 name=f"swr-{self.name}").start()
+            return value
+
+        if owner:
+            return self._load(args, done, raise_errors=True)
+        done.wait()
+        with self._lock:
+            entry = self._entries.get(args)
+            error = self._errors.get(args)
+        if entry is not None:
+            return entry[0]
+        raise error or UpstreamError(self.name, "coalesced", "shared load failed")
+
+    def _load(self, args, done, raise_errors=False):
+        background = not raise_errors
+        try:
+            value = self.fn(*args)
+        except Exception as e:
+            with self._lock:
+                self._errors[args] = e
+                if background:
+                    self.stats["refresh_errors"] += 1
+                    self._failed_at[args] = time.time()
+            if raise_errors:
+                raise
+            return None
+        else:
+            with self._lock:
+                self._entries[args] = (value, time.time())
+                self._errors.pop(args, None)
+                self._failed_at.pop(args, None)
+                if background:
+                    self.stats["refreshes"] += 1
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(args, None)
+            done.set()
+
+    def refresh(self, *args):
+        """Reload now in the calling thread (pre-warming); False if already loading or it failed"""
+        with self._lock:
+            if args in self._inflight:
+                return False
+            done = self._inflight[args] = threading.Event()
+        return self._load(args, done) is not None
+
+    def age(self):
+        """Age in seconds of the oldest entry (None when empty)"""
+        with self._lock:
+            if not self._entries:
+                return None
+            return time.time() - min(t for _, t in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._failed_at.clear()
+
+
+_caches = {}
+_registry_lock = threading.Lock()
+
+
+def cached(name, fn, ttl, retry_s=REFRESH_RETRY_S):
+    """Process-wide SWRCache registered under `name` (survives Streamlit reruns)"""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = SWRCache(name, fn, ttl, retry_s)
+        else:
+            cache.fn = fn
+        return cache
+
+
+def refresh(name, *args):
+    """Refresh a registered cache's entry now; False if there is no such cache"""
+    with _registry_lock:
+        cache = _caches.get(name)
+    return cache.refresh(*args) if cache else False
+
+
+def status():
+    out = {}
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        with cache._lock:
+            stats = dict(cache.stats, refreshing=len(cache._inflight))
+        age = cache.age()
+        out[cache.name] = dict(stats, ttl_s=cache.ttl, age_s=round(age, 1) if age is not None else None)
+    return out
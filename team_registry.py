@@ -0,0 +1,112 @@
+"""
+Canonical integer ids for the 32 franchises, and team attributes indexed by them.
+
+Ids are 0-31 in KALSHI_CODES order, the order team_stats and matchups already index
+their arrays by. team_id() resolves any alias with one dict lookup: the short name
+used across the app ("Green Bay"), the ESPN displayName, the ESPN abbreviation, the
+ESPN team id and the Kalshi code, with a case-insensitive retry. Unknown names get
+UNKNOWN (-1).
+
+The static tables in nfl_teams become tuples and NumPy arrays indexed by id, and the
+team sets (domes, pass-heavy, run-heavy) become int bitsets, so a membership test is a
+shift and a mask. ids() turns a column of names into an id array for batch pipelines.
+
+    tid = team_registry.team_id("GB")      # == team_id("Green Bay Packers") == team_id("9")
+    team_registry.has(team_registry.DOMES, tid), team_registry.STADIUMS[tid]
+    team_registry.ids(games["home"])       # np.int64 array, -1 for unknown names
+"""
+import numpy as np
+
+from nfl_teams import (DOME_STADIUMS, ESPN_ABBREVS, ESPN_TEAM_IDS, KALSHI_CODES, PASS_HEAVY_TEAMS,
+                       RUN_HEAVY_TEAMS, STADIUM_COORDS, STAR_PLAYERS, TEAM_ABBREVS, TEAM_STATS)
+
+TEAMS = tuple(KALSHI_CODES)
+N_TEAMS = len(TEAMS)
+UNKNOWN = -1
+
+
+def _aliases():
+    out = {}
+
+    def add(alias, tid):
+        if out.setdefault(alias, tid) != tid:
+            raise ValueError(f"team alias {alias!r} is ambiguous: {TEAMS[out[alias]]} / {TEAMS[tid]}")
+
+    for tid, team in enumerate(TEAMS):
+        for alias in (team, KALSHI_CODES[team], ESPN_ABBREVS[team], ESPN_TEAM_IDS[team]):
+            add(alias, tid)
+    for display, team in TEAM_ABBREVS.items():
+        add(display, TEAMS.index(team))
+    return out
+
+
+ALIASES = _aliases()  # {alias: team id}
+_FOLDED = {alias.upper(): tid for alias, tid in ALIASES.items()}
+
+
+def team_id(alias, default=UNKNOWN):
+    tid = ALIASES.get(alias)
+    if tid is None and isinstance(alias, str):
+        tid = _FOLDED.get(alias.strip().upper())
+    return default if tid is None else tid
+
+
+def ids(names):
+    """Team ids for a sequence of aliases as an int64 array (UNKNOWN where unresolved)"""
+    return np.fromiter((ALIASES[n] if n in ALIASES else team_id(n) for n in names),
+                       dtype=np.int64, count=len(names))
+
+
+def bitset(names):
+    mask = 0
+    for name in names:
+        tid = team_id(name)
+        if tid != UNKNOWN:
+            mask |= 1 << tid
+    return mask
+
+
+def has(mask, tid):
+    return tid != UNKNOWN and (mask >> tid) & 1 == 1
+
+
+def members(mask):
+    return [TEAMS[tid] for tid in range(N_TEAMS) if (mask >> tid) & 1]
+
+
+# ========== ATTRIBUTES (indexed by id) ==========
+KALSHI = tuple(KALSHI_CODES[t] for t in TEAMS)
+ESPN_ABBREV = tuple(ESPN_ABBREVS[t] for t in TEAMS)
+ESPN_ID = tuple(ESPN_TEAM_IDS[t] for t in TEAMS)
+STADIUMS = tuple(STADIUM_COORDS.get(t) for t in TEAMS)  # (lat, lon) as floats, for fetcher keys
+COORDS = np.array([STADIUM_COORDS.get(t, (np.nan, np.nan)) for t in TEAMS], dtype=np.float64)
+STARS = tuple(tuple(p.lower() for p in STAR_PLAYERS.get(t, ())) for t in TEAMS)
+
+DOMES = bitset(DOME_STADIUMS)
+IS_DOME = np.array([has(DOMES, tid) for tid in range(N_TEAMS)])
+PASS_HEAVY = bitset(PASS_HEAVY_TEAMS)
+RUN_HEAVY = bitset(RUN_HEAVY_TEAMS)
+
+# Model defaults for a team without a row: DVOA 0, defense rank 16, .500 home/away
+STAT_DEFAULTS = {"dvoa": 0.0, "def_rank": 16, "home_win_pct": 0.5, "away_win_pct": 0.5}
+
+
+def stat_arrays(teams=TEAM_STATS):
+    """{field: array indexed by id} for a {team: row} table such as a team_stats snapshot's "teams" """
+    rows = [teams.get(t) or {} for t in TEAMS]
+    return {field: np.array([r.get(field, default) for r in rows], dtype=type(default))
+            for field, default in STAT_DEFAULTS.items()}
+
+
+def style_bits(stats):
+    """(pass_heavy, run_heavy) bitsets of a team_stats snapshot; precomputed by team_stats.current()"""
+    bits = stats.get("style_bits")
+    if bits is None:
+        bits = (bitset(stats["pass_heavy"]), bitset(stats["run_heavy"]))
+    return bits
+
+
+def espn_abbrev(team):
+    """ESPN abbreviation for any alias; the first three letters for an unknown team"""
+    tid = team_id(team)
+    return ESPN_ABBREV[tid] if tid != UNKNOWN else team[:3].upper()
@@ -0,0 +1,301 @@
+"""
+Derived per-team features, recomputed from stored results and play-by-play.
+
+Replaces the hand-maintained TEAM_STATS / PASS_HEAVY_TEAMS / RUN_HEAVY_TEAMS literals
+with values computed from the data lake (datalake.py):
+
+    dvoa          efficiency proxy: scoring margin per game on a DVOA-like % scale
+    def_rank      1..32 by points allowed per game (yards allowed per play breaks ties)
+    home_win_pct  home wins / home games, shrunk toward .500 early in the season
+    away_win_pct  same for road games
+    pass_ratio    pass plays / (pass + run plays), from play-by-play
+    ypp_margin    offensive minus defensive yards per play
+
+The pipeline keeps per-week sufficient statistics (sums and counts per team), so a
+weekly update only aggregates the new week's games and plays before re-deriving
+ranks and rates for the whole league. Aggregation is vectorized with NumPy.
+
+Each build publishes a versioned snapshot (team_stats-vNNNNN.json) and atomically
+repoints LATEST at it; calc_ml_score reads current(), which falls back to the static
+tables in nfl_teams until a snapshot exists.
+
+    python team_stats.py build --root data/lake --season 2025      # incremental
+    python team_stats.py build --root data/lake --season 2025 --full
+    python team_stats.py show
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import team_registry
+from nfl_teams import PASS_HEAVY_TEAMS, RUN_HEAVY_TEAMS, TEAM_STATS
+
+TEAMS = list(team_registry.TEAMS)
+
+# Columns of the per-week, per-team sums
+SUMS = ["games", "points_for", "points_against", "home_games", "home_wins", "away_games", "away_wins",
+        "off_plays", "off_yards", "def_plays", "def_yards", "pass_plays", "run_plays"]
+COL = {name: i for i, name in enumerate(SUMS)}
+
+# ~2.5% DVOA per point of average scoring margin keeps the model's +/-8 threshold meaningful
+DVOA_PER_POINT = 2.5
+# Pseudo-games at .500 added to home/away win rates so 1-0 isn't "100%"
+WIN_PCT_PRIOR_GAMES = 2
+PASS_HEAVY_QUANTILE = 0.78
+RUN_HEAVY_QUANTILE = 0.16
+
+STATS_DIR = os.environ.get("NFL_TEAM_STATS_DIR") or (
+    os.path.join(os.environ["NFL_LAKE_DIR"], "features", "team_stats") if os.environ.get("NFL_LAKE_DIR") else "")
+
+
+def _add(out, idx, col, values, mask=None):
+    keep = idx >= 0 if mask is None else (idx >= 0) & mask
+    np.add.at(out[:, COL[col]], idx[keep], values[keep] if np.ndim(values) else values)
+
+
+# ========== AGGREGATION ==========
+def week_sums(games, plays=None):
+    """
+    Sum one week's final games (and plays) into a (32, len(SUMS)) array.
+
+    games: columns event_id, home, away, home_score, away_score, home_win, away_win
+    plays: columns event_id, team, type, yards (optional)
+    Columns are anything np.asarray accepts (lists, NumPy arrays, Arrow chunked arrays).
+    """
+    out = np.zeros((len(TEAMS), len(SUMS)), dtype=np.float64)
+    home = team_registry.ids(list(games["home"]))
+    away = team_registry.ids(list(games["away"]))
+    hs = np.asarray(games["home_score"], dtype=np.float64)
+    as_ = np.asarray(games["away_score"], dtype=np.float64)
+    hw = np.asarray(games["home_win"], dtype=bool)
+    aw = np.asarray(games["away_win"], dtype=bool)
+
+    _add(out, home, "games", 1.0)
+    _add(out, away, "games", 1.0)
+    _add(out, home, "points_for", hs)
+    _add(out, home, "points_against", as_)
+    _add(out, away, "points_for", as_)
+    _add(out, away, "points_against", hs)
+    _add(out, home, "home_games", 1.0)
+    _add(out, home, "home_wins", hw.astype(np.float64))
+    _add(out, away, "away_games", 1.0)
+    _add(out, away, "away_wins", aw.astype(np.float64))
+
+    if plays is not None and len(plays["event_id"]) and len(home):
+        # Defense for each play = the other side of its game
+        event_ids = np.asarray(games["event_id"], dtype=object)
+        order = np.argsort(event_ids)
+        sorted_ids = event_ids[order]
+        p_event = np.asarray(plays["event_id"], dtype=object)
+        pos = np.clip(np.searchsorted(sorted_ids, p_event), 0, len(sorted_ids) - 1)
+        known = sorted_ids[pos] == p_event
+        g = order[pos]
+        offense = team_registry.ids([t or "" for t in plays["team"]])
+        defense = np.where(offense == home[g], away[g], home[g])
+        defense = np.where(known & (offense >= 0), defense, -1)
+
+        kind = np.char.lower(np.asarray([t or "" for t in plays["type"]], dtype=str))
+        is_pass = (np.char.find(kind, "pass") >= 0) | (np.char.find(kind, "sack") >= 0) | \
+                  (np.char.find(kind, "interception") >= 0)
+        is_run = np.char.find(kind, "rush") >= 0
+        scrimmage = is_pass | is_run
+        yards = np.asarray([y if y is not None else 0 for y in plays["yards"]], dtype=np.float64)
+
+        _add(out, offense, "off_plays", 1.0, scrimmage)
+        _add(out, offense, "off_yards", yards, scrimmage)
+        _add(out, defense, "def_plays", 1.0, scrimmage)
+        _add(out, defense, "def_yards", yards, scrimmage)
+        _add(out, offense, "pass_plays", 1.0, is_pass)
+        _add(out, offense, "run_plays", 1.0, is_run)
+    return out
+
+
+def derive(totals):
+    """Feature table from season-to-date sums: ({team: features}, pass_heavy, run_heavy)"""
+    t = {name: totals[:, i] for name, i in COL.items()}
+    games = t["games"]
+    played = games > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = np.where(played, (t["points_for"] - t["points_against"]) / games, 0.0)
+        pa_pg = np.where(played, t["points_against"] / games, np.inf)
+        ypp_def = np.where(t["def_plays"] > 0, t["def_yards"] / t["def_plays"], np.inf)
+        ypp_off = np.where(t["off_plays"] > 0, t["off_yards"] / t["off_plays"], 0.0)
+        scrimmage = t["pass_plays"] + t["run_plays"]
+        pass_ratio = np.where(scrimmage > 0, t["pass_plays"] / scrimmage, np.nan)
+    k = WIN_PCT_PRIOR_GAMES
+    home_pct = (t["home_wins"] + 0.5 * k) / (t["home_games"] + k)
+    away_pct = (t["away_wins"] + 0.5 * k) / (t["away_games"] + k)
+
+    # Fewest points allowed = #1 among teams that have played (lexsort sorts by the last key
+    # first); a team with no finals yet gets the model's neutral rank instead of a low index
+    def_rank = np.full(len(TEAMS), team_registry.STAT_DEFAULTS["def_rank"], dtype=np.int64)
+    ranked = np.flatnonzero(played)
+    def_rank[ranked[np.lexsort((ypp_def[ranked], pa_pg[ranked]))]] = np.arange(1, len(ranked) + 1)
+
+    # Without enough play-by-play the pass/run split keeps the static lists
+    pass_heavy, run_heavy = list(PASS_HEAVY_TEAMS), list(RUN_HEAVY_TEAMS)
+    rated = ~np.isnan(pass_ratio)
+    if rated.sum() >= 8:
+        hi, lo = np.quantile(pass_ratio[rated], [PASS_HEAVY_QUANTILE, RUN_HEAVY_QUANTILE])
+        pass_heavy = [TEAMS[i] for i in np.flatnonzero(rated & (pass_ratio >= hi))]
+        run_heavy = [TEAMS[i] for i in np.flatnonzero(rated & (pass_ratio <= lo))]
+
+    teams = {}
+    for i, team in enumerate(TEAMS):
+        teams[team] = {
+            "dvoa": round(float(margin[i] * DVOA_PER_POINT), 1),
+            "def_rank": int(def_rank[i]),
+            "home_win_pct": round(float(home_pct[i]), 3),
+            "away_win_pct": round(float(away_pct[i]), 3),
+            "pass_ratio": None if np.isnan(pass_ratio[i]) else round(float(pass_ratio[i]), 3),
+            "ypp_margin": round(float(ypp_off[i] - ypp_def[i]), 2) if np.isfinite(ypp_def[i]) else None,
+            "games": int(games[i]),
+        }
+    return teams, pass_heavy, run_heavy
+
+
+# ========== PIPELINE ==========
+def _lake_week(lake, season, week):
+    games = lake.read("games", columns=["event_id", "home", "away", "home_score", "away_score", "home_win", "away_win"],
+                      seasons=[season], weeks=[week], filters=[("status", "=", "STATUS_FINAL")]).to_pydict()
+    plays = lake.read("plays", columns=["event_id", "team", "type", "yards"], seasons=[season], weeks=[week])
+    return games, plays.to_pydict() if plays.num_rows else None
+
+
+def build(lake, season, stats_dir=STATS_DIR, full=False):
+    """
+    Update the season's feature snapshot from the lake and publish a new version.
+
+    Incremental by default: reuses the stored per-week sums of the latest snapshot for
+    this season and re-aggregates only weeks that are new, plus its most recent week
+    (which may have been partial when it was built).
+    """
+    prev = None if full else load_latest(stats_dir)
+    week_totals = {}
+    if prev and prev.get("season") == season:
+        week_totals = {int(w): np.asarray(v, dtype=np.float64) for w, v in prev["week_sums"].items()}
+    weeks = lake.weeks_present("games", season)
+    stale = set(weeks) - set(week_totals)
+    if week_totals:
+        stale.add(max(week_totals))
+    for week in sorted(stale & set(weeks)):
+        games, plays = _lake_week(lake, season, week)
+        week_totals[week] = week_sums(games, plays)
+
+    totals = sum(week_totals.values()) if week_totals else np.zeros((len(TEAMS), len(SUMS)))
+    teams, pass_heavy, run_heavy = derive(totals)
+    snapshot = {
+        "season": season,
+        "through_week": max(week_totals) if week_totals else 0,
+        "built_at": time.time(),
+        "recomputed_weeks": sorted(stale & set(weeks)),
+        "teams": teams,
+        "pass_heavy": pass_heavy,
+        "run_heavy": run_heavy,
+        "week_sums": {str(w): v.tolist() for w, v in sorted(week_totals.items())},
+    }
+    return publish(snapshot, stats_dir)
+
+
+def publish(snapshot, stats_dir=STATS_DIR):
+    """Write the next version and atomically repoint LATEST; returns the version"""
+    os.makedirs(stats_dir, exist_ok=True)
+    existing = [int(f[len("team_stats-v"):-len(".json")]) for f in os.listdir(stats_dir)
+                if f.startswith("team_stats-v") and f.endswith(".json")]
+    version = max(existing, default=0) + 1
+    snapshot = dict(snapshot, version=version)
+    name = f"team_stats-v{version:05d}.json"
+    with open(os.path.join(stats_dir, name), "w") as f:
+        json.dump(snapshot, f)
+    tmp = os.path.join(stats_dir, "LATEST.tmp")
+    with open(tmp, "w") as f:
+        f.write(name)
+    os.replace(tmp, os.path.join(stats_dir, "LATEST"))
+    return version
+
+
+def load_latest(stats_dir=STATS_DIR):
+    if not stats_dir:
+        return None
+    try:
+        with open(os.path.join(stats_dir, "LATEST")) as f:
+            name = f.read().strip()
+        with open(os.path.join(stats_dir, name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ========== READER ==========
+STATIC = {"version": 0, "season": None, "teams": TEAM_STATS,
+          "pass_heavy": PASS_HEAVY_TEAMS, "run_heavy": RUN_HEAVY_TEAMS,
+          "style_bits": (team_registry.PASS_HEAVY, team_registry.RUN_HEAVY)}
+
+_current = {"key": None, "snapshot": STATIC}
+_current_lock = threading.Lock()
+
+
+def current(stats_dir=None):
+    """
+    The latest published snapshot ({"version", "teams", "pass_heavy", "run_heavy", ...}).
+
+    Re-read only when LATEST changes; the static nfl_teams tables until one exists.
+    Teams missing from a snapshot fall back to their static row.
+    """
+    stats_dir = STATS_DIR if stats_dir is None else stats_dir
+    if not stats_dir:
+        return STATIC
+    try:
+        st = os.stat(os.path.join(stats_dir, "LATEST"))
+        key = (stats_dir, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return STATIC
+    with _current_lock:
+        if _current["key"] != key:
+            snap = load_latest(stats_dir)
+            if snap:
+                snap["teams"] = {t: snap["teams"].get(t) or TEAM_STATS.get(t, {}) for t in TEAMS}
+                snap.pop("week_sums", None)
+                snap["style_bits"] = team_registry.style_bits(snap)
+            _current["key"] = key
+            _current["snapshot"] = snap or STATIC
+        return _current["snapshot"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="recompute features from the lake and publish a snapshot")
+    b.add_argument("--root", default=os.environ.get("NFL_LAKE_DIR", "data/lake"))
+    b.add_argument("--season", type=int)
+    b.add_argument("--full", action="store_true", help="ignore stored weekly sums and rebuild every week")
+    sub.add_parser("show", help="print the current snapshot")
+    for p in sub.choices.values():
+        p.add_argument("--stats-dir")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        import datalake
+        import nfl_data
+        stats_dir = args.stats_dir or STATS_DIR or os.path.join(args.root, "features", "team_stats")
+        season = args.season or nfl_data.current_season()
+        t0 = time.perf_counter()
+        version = build(datalake.DataLake(args.root), season, stats_dir, full=args.full)
+        snap = load_latest(stats_dir)
+        print(f"v{version}: season {season} through week {snap['through_week']}, "
+              f"recomputed weeks {snap['recomputed_weeks']} in {time.perf_counter() - t0:.2f}s")
+    else:
+        snap = current(args.stats_dir)
+        print(f"version {snap['version']} season {snap['season']}")
+        print(f"pass heavy: {', '.join(snap['pass_heavy'])}")
+        print(f"run heavy:  {', '.join(snap['run_heavy'])}")
+        for team, row in sorted(snap["teams"].items(), key=lambda kv: kv[1].get("def_rank", 99)):
+            print(f"  {team:14s} {json.dumps(row)}")
+
+
+if __name__ == "__main__":
+    main()
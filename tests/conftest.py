@@ -0,0 +1,11 @@
+"""
+Unit tests for the data layer, engines and stores. No network: anything that talks HTTP
+runs against replay_server.py's stand-in on a local port.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
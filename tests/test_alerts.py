@@ -0,0 +1,87 @@
+import alerts
+
+
+def _game(home_score, away_score, period=2, clock="10:00", status="STATUS_IN_PROGRESS"):
+    return {"BUF@KC": {"away_team": "BUF", "home_team": "KC", "home_score": home_score, "away_score": away_score,
+                       "period": period, "clock": clock, "status_type": status,
+                       "possession_team": None, "is_red_zone": False}}
+
+
+def _run(engine, snapshots, sessions):
+    fired = []
+    for games in snapshots:
+        for sid, positions in sessions.items():
+            engine.set_positions(positions, session=sid)
+            fired += engine.evaluate(games)
+    return fired
+
+
+def test_band_hysteresis():
+    assert alerts.band(7) == "LEADING"
+    assert alerts.band(6, current="LEADING") == "LEADING"  # within the margin
+    assert alerts.band(5, current="LEADING") == "AHEAD"
+
+
+def test_status_alert_is_debounced():
+    engine = alerts.AlertEngine()
+    positions = [{"game": "BUF@KC", "pick": "KC", "price": 60, "contracts": 10}]
+    # KC leads, then falls behind for one snapshot only (a corrected score): no alert
+    fired = _run(engine, [_game(10, 0, clock="9:00"), _game(10, 21, clock="8:00"), _game(10, 0, clock="7:00")],
+                 {"a": positions})
+    assert fired == []
+    # Behind for two consecutive changes: one alert
+    fired = _run(engine, [_game(10, 21, clock="6:00"), _game(10, 21, clock="5:00"), _game(10, 21, clock="4:00")],
+                 {"a": positions})
+    assert [(a["rule"], a["to"], a["session"]) for a in fired] == [("status", "BEHIND", "a")]
+
+
+def test_alerts_fire_with_several_sessions():
+    engine = alerts.AlertEngine()
+    sessions = {"a": [{"game": "BUF@KC", "pick": "KC", "price": 60, "contracts": 10}],
+                "b": [{"game": "BUF@KC", "pick": "BUF", "price": 40, "contracts": 5}]}
+    # KC up 10, then BUF scores 21 unanswered: KC holders go BEHIND
+    snapshots = [_game(10, 0, clock="9:00"), _game(10, 21, clock="8:00"), _game(10, 21, clock="7:00"),
+                 _game(10, 21, clock="6:00")]
+    fired = _run(engine, snapshots, sessions)
+    assert [(a["session"], a["to"]) for a in fired] == [("a", "BEHIND")]
+
+    # The game ends with BUF winning: each session gets its own FINAL
+    fired = _run(engine, [_game(10, 21, period=4, clock="0:00", status="STATUS_FINAL")], sessions)
+    assert sorted((a["session"], a["rule"], a["to"]) for a in fired) == [("a", "final", "lost"), ("b", "final", "won")]
+
+
+def test_new_session_gets_a_baseline_without_firing():
+    engine = alerts.AlertEngine()
+    a = [{"game": "BUF@KC", "pick": "KC"}]
+    _run(engine, [_game(10, 0, clock="9:00")], {"a": a})
+    # b joins while KC trails; its first look is a baseline, not a transition
+    fired = _run(engine, [_game(10, 0, clock="9:00")], {"a": a, "b": [{"game": "BUF@KC", "pick": "BUF"}]})
+    assert fired == []
+    assert engine.stats["games_evaluated"] == 1
+
+
+def test_idle_sessions_expire(monkeypatch):
+    engine = alerts.AlertEngine()
+    engine.set_positions([{"game": "BUF@KC", "pick": "KC"}], session="a")
+    now = alerts.time.time()
+    monkeypatch.setattr(alerts.time, "time", lambda: now + alerts.SESSION_TTL_S + 1)
+    engine.set_positions([{"game": "BUF@KC", "pick": "BUF"}], session="b")
+    assert list(engine._positions) == [("b", "BUF@KC", "BUF")]
+
+
+def test_unchanged_reruns_sweep_on_a_timer(monkeypatch):
+    engine = alerts.AlertEngine()
+    now = 1_000_000.0
+    monkeypatch.setattr(alerts.time, "time", lambda: now)
+    engine.set_positions([{"game": "BUF@KC", "pick": "KC"}], session="a")
+    engine.set_positions([{"game": "BUF@KC", "pick": "BUF"}], session="b")
+    now += alerts.SESSION_TTL_S + 1
+    engine.set_positions([{"game": "BUF@KC", "pick": "BUF"}], session="b")  # sweeps: "a" went idle
+    assert list(engine._positions) == [("b", "BUF@KC", "BUF")]
+    index = engine._by_game
+    now += 1
+    engine.set_positions([{"game": "BUF@KC", "pick": "BUF"}], session="b")
+    assert engine._by_game is index  # unchanged and swept recently: nothing rebuilt
+    now += alerts.SESSION_SWEEP_S
+    engine.set_positions([{"game": "BUF@KC", "pick": "BUF"}], session="b")
+    assert engine._by_game is index  # swept, nothing expired
@@ -0,0 +1,40 @@
+"""The Streamlit script end to end, against a stand-in that fails every upstream call"""
+import os
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+
+import nfl_data  # noqa: E402
+import replay_server  # noqa: E402
+import snapshot  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+@pytest.fixture
+def failing_upstream(tmp_path, monkeypatch):
+    server = replay_server.StandInServer(("127.0.0.1", 0), store=replay_server.FixtureStore(str(tmp_path)),
+                                         config=replay_server.ReplayConfig(error_rate=1.0))
+    replay_server.start_in_thread(server)
+    monkeypatch.setattr(nfl_data, "ESPN_NFL_URL", f"{server.url}/apis/site/v2/sports/football/nfl")
+    monkeypatch.setattr(nfl_data, "OPEN_METEO_BASE_URL", server.url)
+    monkeypatch.setenv("NFL_GA4_BASE_URL", server.url)
+    monkeypatch.chdir(tmp_path)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_failed_scoreboard_keeps_the_snapshot(failing_upstream):
+    last_slate = nfl_data.parse_scoreboard({"events": [{
+        "id": "401772", "date": "2025-10-19T20:25Z", "status": {"type": {"name": "STATUS_SCHEDULED"}},
+        "competitions": [{"competitors": [
+            {"homeAway": "home", "score": "0", "team": {"id": "12", "displayName": "Kansas City Chiefs"}},
+            {"homeAway": "away", "score": "0", "team": {"id": "2", "displayName": "Buffalo Bills"}}]}]}]})
+    snapshot.save(games=last_slate)
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert any("ESPN fetch error" in e.value for e in at.error)
+    assert snapshot.last()["games"] == last_slate
@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+import pytest
+
+import calibration
+
+
+def _rows(n=2000, seed=3):
+    rng = np.random.default_rng(seed)
+    scores = np.round(rng.uniform(5.0, 10.0, n), 1)
+    return list(zip(scores.tolist(), (rng.random(n) < scores / 10).tolist()))
+
+
+@pytest.mark.parametrize("method", ["isotonic", "platt"])
+def test_table_is_monotone_and_mirrored(method):
+    table = np.array(calibration.fit(_rows(), method)["table"])
+    assert len(table) == len(calibration.GRID)
+    assert (np.diff(table) >= -1e-12).all()
+    assert ((table >= calibration.P_MIN) & (table <= calibration.P_MAX)).all()
+    # (score, won) and (10 - score, lost): p(s) + p(10 - s) == 1
+    np.testing.assert_allclose(table + table[::-1], 1.0, atol=2e-4)
+    assert table[50] == pytest.approx(0.5, abs=2e-4)
+
+
+def test_isotonic_pools_violators():
+    table = calibration.fit_isotonic([1.0, 2.0, 3.0, 4.0], [0, 1, 0, 1])
+    assert table[10] == calibration.P_MIN
+    assert table[20] == table[30] == 0.5  # 2.0 and 3.0 pooled
+    assert table[40] == calibration.P_MAX
+
+
+def test_fit_needs_rows():
+    with pytest.raises(ValueError):
+        calibration.fit([])
+
+
+def test_load_rejects_malformed_artifacts(tmp_path):
+    path = tmp_path / "calibration.json"
+    good = calibration.fit(_rows(200))
+    path.write_text(json.dumps(good))
+    assert calibration.load(str(path))["table"] == good["table"]
+
+    for bad in ("{", "[]", json.dumps({"method": "isotonic"}), json.dumps({"table": [0.5] * 100}),
+                json.dumps({"table": [0.5] * 100 + ["x"]}), json.dumps({"table": [0.5] * 100 + [1.5]})):
+        path.write_text(bad)
+        assert calibration.load(str(path)) is None
+    assert calibration.load(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import datalake  # noqa: E402
+import nfl_data  # noqa: E402
+
+
+def _scoreboard(*matchups):
+    events = []
+    for i, (away, home) in enumerate(matchups):
+        events.append({"id": str(401000 + i), "date": "2025-12-14T18:00Z",
+                       "status": {"type": {"name": "STATUS_SCHEDULED"}},
+                       "competitions": [{"competitors": [
+                           {"homeAway": "home", "team": {"displayName": home}, "score": "0"},
+                           {"homeAway": "away", "team": {"displayName": away}, "score": "0"}]}]})
+    return {"season": {"year": 2025}, "week": {"number": 15}, "events": events}
+
+
+def test_snapshot_stores_outdoor_venue_weather(tmp_path, monkeypatch):
+    data = _scoreboard(("Buffalo Bills", "Green Bay Packers"), ("Chicago Bears", "Detroit Lions"))
+    monkeypatch.setattr(datalake, "get_json", lambda *a, **k: data)
+    monkeypatch.setattr(datalake.nfl_data, "fetch_espn_injuries", lambda: {})
+    calls = []
+
+    def fetch_weather(lat, lon):
+        calls.append((lat, lon))
+        return {"temp": 21.0, "wind": 14.0, "precip": 0.0, "code": 71}
+
+    lake = datalake.DataLake(str(tmp_path))
+    assert datalake.snapshot_current(lake, fetch_weather=fetch_weather) == (0, 1)  # Detroit is a dome
+    assert len(calls) == 1
+    rows = lake.read("weather", seasons=[2025], weeks=[15]).to_pylist()
+    assert [(r["venue_team"], r["wind"], r["code"]) for r in rows] == [("Green Bay", 14.0, 71)]
+
+
+@pytest.mark.parametrize("day, week", [("2024-09-02", 0), ("2024-09-03", 1), ("2024-09-09", 1), ("2024-09-10", 2),
+                                       ("2025-01-05", 18), ("2025-01-12", 101), ("2025-02-09", 105),
+                                       ("2025-02-11", datalake.SEASON_OVER)])
+def test_current_week(day, week):
+    assert datalake.current_week(2024, datetime.fromisoformat(day)) == week
+
+
+def _week(week, *games, status="STATUS_FINAL"):
+    """Scoreboard payload for one week; games are (away, home, home won)"""
+    day = f"2024-09-{7 * week + 1:02d}T17:00Z"
+    return {"events": [{"id": f"{week}{i:02d}", "date": day, "status": {"type": {"name": status}},
+                        "competitions": [{"competitors": [
+                            {"homeAway": "home", "team": {"displayName": home}, "winner": status == "STATUS_FINAL" and won},
+                            {"homeAway": "away", "team": {"displayName": away}, "winner": status == "STATUS_FINAL" and not won}]}]}
+                       for i, (away, home, won) in enumerate(games)]}
+
+
+@pytest.fixture
+def lake(tmp_path, monkeypatch):
+    monkeypatch.setattr(nfl_data, "LAKE_DIR", str(tmp_path))
+    monkeypatch.setattr(datalake, "current_week", lambda season, today=None: 3)
+    lake = datalake.DataLake(str(tmp_path))
+    lake.write("games", datalake.game_rows(_week(1, ("Buffalo Bills", "Miami Dolphins", True)),
+                                           2024, 1, datalake.REGULAR_SEASON))
+    return lake
+
+
+def _serve(monkeypatch, payloads):
+    urls = []
+
+    def get_json(endpoint, url, **kw):
+        urls.append(url)
+        return payloads[url]
+    monkeypatch.setattr(nfl_data, "get_json", get_json)
+    return urls
+
+
+def test_partly_ingested_season_falls_back_to_espn(lake, monkeypatch):
+    season_url = f"{nfl_data.ESPN_NFL_URL}/scoreboard?dates=2024&limit=300"
+    season = _week(1, ("Buffalo Bills", "Miami Dolphins", True))
+    season["events"] += _week(2, ("Buffalo Bills", "Jacksonville Jaguars", False))["events"]
+    urls = _serve(monkeypatch, {season_url: season})
+    assert lake.missing_weeks(2024, 3) == [2]
+    assert nfl_data.fetch_last_5_records(2024)["Buffalo"]["form"] == "WL"
+    assert "Buffalo" in nfl_data.fetch_team_schedules(2024).teams()
+    assert urls == [season_url, season_url]
+
+
+def test_unfinished_week_counts_as_missing(lake):
+    lake.write("games", datalake.game_rows(_week(2, ("Buffalo Bills", "Jacksonville Jaguars", False),
+                                                 status="STATUS_SCHEDULED"), 2024, 2, datalake.REGULAR_SEASON))
+    assert lake.missing_weeks(2024, 3) == [2]
+    assert lake.missing_weeks(2024, 3, now=datetime.fromisoformat("2024-09-15T18:00+00:00")) == []  # still on
+
+
+def test_ingested_weeks_come_from_the_lake_and_the_current_week_from_espn(lake, monkeypatch):
+    lake.write("games", datalake.game_rows(_week(2, ("Buffalo Bills", "Jacksonville Jaguars", False)),
+                                           2024, 2, datalake.REGULAR_SEASON))
+    # A stale copy of the current week in the lake is ignored in favour of ESPN's
+    lake.write("games", datalake.game_rows(_week(3, ("Buffalo Bills", "Miami Dolphins", False), status="STATUS_SCHEDULED"),
+                                           2024, 3, datalake.REGULAR_SEASON))
+    week_url = datalake.week_url(2024, 3)
+    urls = _serve(monkeypatch, {week_url: _week(3, ("Buffalo Bills", "Miami Dolphins", True))})
+    assert nfl_data.fetch_last_5_records(2024)["Buffalo"]["form"] == "LWL"  # newest first: weeks 3, 2, 1
+    schedule = nfl_data.fetch_team_schedules(2024)
+    assert schedule.rest_days("Buffalo", datetime.fromisoformat("2024-09-29T17:00+00:00")) == 7
+    assert len(schedule) == 3
+    assert urls == [week_url, week_url]
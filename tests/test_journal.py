@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import journal
+from nfl_data import eastern
+
+KICKOFF = eastern.localize(datetime(2026, 10, 18, 13, 0)).timestamp()
+
+
+def game(away_score=0, home_score=0, period=1, clock="15:00", status="STATUS_IN_PROGRESS", play=None):
+    return {"away_score": away_score, "home_score": home_score, "period": period, "clock": clock,
+            "status_type": status, "down": 1, "distance": 10, "yards_to_endzone": 75,
+            "possession_team": "Chicago", "is_red_zone": False, "poss_text": "CHI 25",
+            "last_play": {"text": play} if play else None, "home_team": "Green Bay"}
+
+
+def test_roundtrip(tmp_path):
+    j = journal.Journal(str(tmp_path), keyframe_s=300, flush_s=60)
+    pregame = {"CHI@GB": game(period=0, status="STATUS_SCHEDULED")}
+    assert j.append(pregame, KICKOFF - 60) == "keyframe"  # a new day starts with one, empty
+    assert j.append(pregame, KICKOFF - 30) is None
+
+    snapshots = [
+        (KICKOFF, {"CHI@GB": game()}),
+        (KICKOFF + 5, {"CHI@GB": game()}),  # unchanged
+        (KICKOFF + 90, {"CHI@GB": game(clock="13:30", play="Pass complete")}),
+        (KICKOFF + 400, {"CHI@GB": game(7, 0, clock="9:12", play="Touchdown")}),  # past keyframe_s
+        (KICKOFF + 460, {"CHI@GB": game(7, 0, clock="8:40"), "DET@MIN": game(period=1)}),
+        (KICKOFF + 600, {"CHI@GB": game(7, 3, 4, "0:00", "STATUS_FINAL"), "DET@MIN": game(period=1)}),
+        (KICKOFF + 605, {"CHI@GB": game(7, 3, 4, "0:00", "STATUS_FINAL"), "DET@MIN": game(period=1)}),
+    ]
+    kinds = [j.append(games, ts) for ts, games in snapshots]
+    j.flush()
+    assert kinds == ["delta", None, "delta", "keyframe", "delta", "delta", "delta"]
+
+    reader = journal.Reader(str(tmp_path))
+    assert reader.segments() == ["2026-10-18"]
+    assert reader.state_at(KICKOFF - 90) == {}
+    assert reader.state_at(KICKOFF - 1) == {}
+    assert reader.state_at(KICKOFF + 100) == {"CHI@GB": journal.live_fields(snapshots[2][1]["CHI@GB"])}
+    at_460 = reader.state_at(KICKOFF + 500)
+    assert at_460 == {k: journal.live_fields(g) for k, g in snapshots[4][1].items()}
+    assert reader.state_at(KICKOFF + 600)["CHI@GB"]["status_type"] == "STATUS_FINAL"  # the final snapshot is kept
+    assert list(reader.state_at(KICKOFF + 605)) == ["DET@MIN"]  # then dropped
+    assert reader.state_at(KICKOFF + 86400) == {}
+
+    frames = list(reader.frames(KICKOFF + 60, KICKOFF + 460))
+    assert [t - KICKOFF for t, _ in frames] == [90, 400, 460]
+    assert frames[0][1]["CHI@GB"]["last_play"] == "Pass complete"
+    assert frames[-1][1] == at_460
+
+    info = reader.info()["2026-10-18"]
+    assert (info["records"], info["keyframe_blocks"], info["from"]) == (7, 2, "12:59:00")
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    j = journal.Journal(str(tmp_path))
+    j.append({"CHI@GB": game()}, KICKOFF)
+    j.flush()
+    with open(tmp_path / "2026-10-18.jrnl", "ab") as f:
+        f.write(journal.BLOCK_HEADER.pack(journal.BLOCK_MAGIC, KICKOFF + 5, KICKOFF + 5, 0, 999) + b"partial")
+    reader = journal.Reader(str(tmp_path))
+    assert len(reader.blocks("2026-10-18")) == 1
+    assert reader.state_at(KICKOFF + 10)["CHI@GB"]["clock"] == "15:00"
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+import kalshi
+from nfl_data import eastern
+
+
+def test_event_ticker_uses_eastern_kickoff_date():
+    # Sunday Night Football, 8:20 PM ET on Sep 7 = 00:20Z on Sep 8
+    snf = datetime(2025, 9, 8, 0, 20, tzinfo=timezone.utc)
+    assert kalshi.event_ticker("Baltimore", "Buffalo", snf) == "KXNFLGAME-25SEP07BALBUF"
+    # Monday night, 8:15 PM ET on Sep 15 = 00:15Z on Sep 16
+    mnf = datetime(2025, 9, 16, 0, 15, tzinfo=timezone.utc)
+    assert kalshi.event_ticker("LA Chargers", "Las Vegas", mnf).startswith("KXNFLGAME-25SEP15")
+    # Afternoon kickoffs and Eastern datetimes are unchanged
+    assert kalshi.event_ticker("Baltimore", "Buffalo", datetime(2025, 9, 7, 17, 0, tzinfo=timezone.utc)) \
+        == "KXNFLGAME-25SEP07BALBUF"
+    assert kalshi.event_ticker("Baltimore", "Buffalo", eastern.localize(datetime(2025, 9, 7, 23, 30))) \
+        == "KXNFLGAME-25SEP07BALBUF"
+
+
+def test_refresh_bookkeeping_is_per_ticker_and_bounded(monkeypatch):
+    client = kalshi.KalshiClient(min_refresh_s=5)
+    fetched = []
+    monkeypatch.setattr(client, "fetch_markets", lambda tickers=None, **params: fetched.append(tickers) or [])
+    now = [1000.0]
+    monkeypatch.setattr(kalshi.time, "time", lambda: now[0])
+
+    client.refresh(["A", "B"])
+    client.refresh(["B", "C"])  # only C is due
+    assert client.refresh(["A", "C"]) is None
+    assert fetched == [["A", "B"], ["C"]]
+
+    # Thousands of distinct ticker sets leave nothing behind once they age out
+    for i in range(1000):
+        client.refresh([f"T{i}", f"T{i + 1}"])
+    now[0] += 6
+    client.refresh(["A"])
+    assert set(client._refreshed) == {"A"}
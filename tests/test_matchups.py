@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+import matchups
+import team_stats
+
+
+def _baseline(home_team, away_team, stats):
+    """Factors 1, 2, 3, 5 and 6 as calc_ml_score computed them per game before the matrix"""
+    home = stats["teams"].get(home_team, {})
+    away = stats["teams"].get(away_team, {})
+    score_home, score_away = 0, 0
+    pre_home, pre_away, post_home, post_away = [], [], [], []
+
+    home_dvoa = home.get('dvoa', 0)
+    away_dvoa = away.get('dvoa', 0)
+    dvoa_diff = home_dvoa - away_dvoa
+    if dvoa_diff > 8:
+        score_home += 1.0
+        pre_home.append(f"📊 DVOA +{home_dvoa:.0f}")
+    elif dvoa_diff < -8:
+        score_away += 1.0
+        pre_away.append(f"📊 DVOA +{away_dvoa:.0f}")
+
+    home_def = home.get('def_rank', 16)
+    away_def = away.get('def_rank', 16)
+    if home_def <= 5:
+        score_home += 1.0
+        pre_home.append(f"🛡️ #{home_def} DEF")
+    if away_def <= 5:
+        score_away += 1.0
+        pre_away.append(f"🛡️ #{away_def} DEF")
+
+    score_home += 1.0
+    pre_home.append("🏠 Home")
+
+    home_hw = home.get('home_win_pct', 0.5)
+    if home_hw > 0.65:
+        score_home += 0.8
+        post_home.append(f"🏟️ {int(home_hw*100)}% Home Win")
+
+    away_aw = away.get('away_win_pct', 0.5)
+    if away_aw >= 0.60:
+        score_away += 0.8
+        post_away.append(f"✈️ {int(away_aw*100)}% Road Win")
+    elif away_aw <= 0.35:
+        score_home += 0.6
+        post_home.append(f"✈️ Opp {int(away_aw*100)}% Road")
+    return score_home, score_away, (pre_home, post_home), (pre_away, post_away)
+
+
+def _varied(seed=3):
+    """A snapshot that hits every threshold's edges, with a few teams missing"""
+    rng = random.Random(seed)
+    teams = {}
+    for team in team_stats.TEAMS[:-3]:
+        teams[team] = {"dvoa": rng.choice([-20, -8, -7.5, 0, 0.5, 8, 8.5, 16.4]) + rng.random() * 0.01,
+                       "def_rank": rng.randint(1, 32),
+                       "home_win_pct": rng.choice([0.3, 0.5, 0.65, 0.66, 0.9]),
+                       "away_win_pct": rng.choice([0.2, 0.35, 0.36, 0.5, 0.59, 0.6, 0.75])}
+    return {"version": "test-varied", "teams": teams}
+
+
+@pytest.mark.parametrize("stats", [team_stats.STATIC, _varied()], ids=["static", "varied"])
+def test_matrix_matches_per_game_factors(stats):
+    m = matchups.MatchupMatrix(stats)
+    names = team_stats.TEAMS + ["Nowhere"]
+    for home in names:
+        for away in names:
+            sh, sa, reasons_h, reasons_a = m.lookup(home, away)
+            bh, ba, base_h, base_a = _baseline(home, away, stats)
+            assert (sh, sa) == pytest.approx((bh, ba), abs=1e-12), (home, away)
+            assert (reasons_h, reasons_a) == (base_h, base_a), (home, away)
+
+
+def test_matrix_rebuilds_only_on_a_new_snapshot():
+    stats = _varied()
+    first = matchups.matrix(stats)
+    assert matchups.matrix(stats) is first
+    assert matchups.matrix(dict(stats, version="test-next", teams=dict(stats["teams"]))) is not first
@@ -0,0 +1,71 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import nfl_data
+import picks
+import replay_server
+import team_stats
+import upstream
+from rest_index import RestIndex
+
+
+def _game(away, home):
+    return {"status_type": "STATUS_SCHEDULED", "away_team": away, "home_team": home,
+            "game_date": nfl_data.eastern.localize(datetime(2025, 10, 19, 13, 0))}
+
+
+def test_unscorable_game_is_logged_and_counted(monkeypatch, caplog):
+    calc = picks.calc_ml_score
+
+    def calc_ml_score(home, *args):
+        if home == "Denver":
+            raise KeyError("dvoa")
+        return calc(home, *args)
+    monkeypatch.setattr(picks, "calc_ml_score", calc_ml_score)
+    games = {"Buffalo@Kansas City": _game("Buffalo", "Kansas City"), "Las Vegas@Denver": _game("Las Vegas", "Denver")}
+    before = upstream.status().get("model", {"errors": {}})["errors"].get("malformed", 0)
+
+    with caplog.at_level(logging.WARNING, logger="picks"):
+        results = picks.score_slate(games, {}, {}, RestIndex(), team_stats.current(),
+                                    fetch_weather=lambda lat, lon: picks.WEATHER_DEFAULT)
+    assert [r["game_key"] for r in results] == ["Buffalo@Kansas City"]
+    model = upstream.status()["model"]
+    assert model["errors"]["malformed"] == before + 1
+    assert "Las Vegas@Denver" in model["last_error_msg"]
+    assert "Las Vegas@Denver" in caplog.text
+
+
+def test_slate_json_on_a_replayed_scoreboard(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    store = replay_server.FixtureStore(os.path.join(root, "fixtures", "bench"))
+    server = replay_server.StandInServer(("127.0.0.1", 0), store=store)
+    replay_server.start_in_thread(server)
+    try:
+        env = dict(os.environ, NFL_ESPN_BASE_URL=server.url, NFL_OPEN_METEO_BASE_URL=server.url,
+                   NFL_GA4_BASE_URL=server.url)
+        out = subprocess.run([sys.executable, os.path.join(root, "picks.py"), "slate"], cwd=tmp_path, env=env,
+                             capture_output=True, text=True, timeout=60, check=True).stdout
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    data = json.loads(out)
+    _, recordings = store.timelines[replay_server.request_key("/apis/site/v2/sports/football/nfl/scoreboard", "")]
+    games = nfl_data.parse_scoreboard(json.loads(store.body(recordings[-1])))
+    scheduled = {k for k, g in games.items() if g["status_type"] == "STATUS_SCHEDULED"}
+    live = {k for k, g in games.items() if g["period"] > 0 and g["status_type"] != "STATUS_FINAL"}
+
+    assert scheduled and live
+    assert data["scoreboard"]["ok"] is True
+    assert {p["game"] for p in data["picks"]} == scheduled
+    assert [p["score"] for p in data["picks"]] == sorted((p["score"] for p in data["picks"]), reverse=True)
+    for p in data["picks"]:
+        assert p["pick"] in (p["home"], p["away"])
+        assert 0 < p["win_prob"] < 1 and p["tier"] and p["reasons"]
+        assert datetime.fromisoformat(p["kickoff"])
+    assert {g["game"] for g in data["live"]} == live
+    assert {g["state"] for g in data["live"]} <= {"MAX UNCERTAINTY", "ELEVATED", "NORMAL"}
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+import ratelimit
+import upstream
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, s):
+        self.now += s
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, "time", SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    return clock
+
+
+def test_parse_budgets():
+    budgets = ratelimit.parse_budgets("scoreboard=30:10, site.api.espn.com=300,new=12")
+    assert budgets["scoreboard"] == (30.0, 10.0)
+    assert budgets["site.api.espn.com"] == (300.0, 50.0)  # burst defaults to 10 s of budget
+    assert budgets["new"] == (12.0, 2.0)
+    assert budgets["injuries"] == ratelimit.BUDGETS["injuries"]
+    assert ratelimit.parse_budgets("") == ratelimit.BUDGETS
+    assert ratelimit.parse_budgets(" OFF ") is None
+
+
+def test_burst_then_refill(clock):
+    lim = ratelimit.Limiter({"scoreboard": (60, 3), "*": (600, 100)})
+    url = "http://127.0.0.1:8000/apis/site/v2/sports/football/nfl/scoreboard"
+    assert [lim.acquire("scoreboard", url) for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5
+    assert not lim.acquire("scoreboard", url)  # half a token
+    clock.now += 0.5
+    assert lim.acquire("scoreboard", url)
+    clock.now += 60
+    assert [lim.acquire("scoreboard", url) for _ in range(4)] == [True, True, True, False]  # capped at burst
+
+    status = lim.status()
+    assert status["scoreboard"] == {"per_minute": 60.0, "burst": 3.0, "tokens": 0.0,
+                                    "allowed": 7, "throttled": 3, "waited": 0}
+    assert status["127.0.0.1"]["allowed"] == 7 and status["127.0.0.1"]["throttled"] == 0
+
+
+def test_host_budget_is_shared_across_endpoints(clock):
+    lim = ratelimit.Limiter({"scoreboard": (60, 5), "summary": (60, 5), "site.api.espn.com": (60, 2)})
+    url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/"
+    assert lim.acquire("scoreboard", url + "scoreboard")
+    assert lim.acquire("summary", url + "summary")
+    assert not lim.acquire("summary", url + "summary")
+    assert lim.acquire("other", "https://example.com/x")  # no endpoint budget and no "*": unlimited
+    assert lim.status()["summary"]["throttled"] == 0  # only the short budget counts the refusal
+
+
+def test_wait_for_a_token(clock):
+    lim = ratelimit.Limiter({"archive": (60, 1)})
+    assert lim.acquire("archive", "http://x/")
+    assert not lim.acquire("archive", "http://x/", max_wait_s=0.5)
+    start = clock.now
+    assert lim.acquire("archive", "http://x/", max_wait_s=5)
+    assert clock.now - start == pytest.approx(1.0)
+    assert lim.status()["archive"]["waited"] == 1
+
+
+def test_throttled_fetch_serves_stale_without_backoff(clock, monkeypatch):
+    monkeypatch.setattr(ratelimit, "_limiter", ratelimit.Limiter({"rl_test": (60, 1)}))
+    monkeypatch.setattr(ratelimit, "_max_wait_s", 0.0)
+    sent = []
+    monkeypatch.setattr(upstream, "_request_json", lambda endpoint, url, *a: sent.append(url) or {"n": len(sent)})
+    fb = upstream.Fallback("rl_test", lambda q: upstream.get_json("rl_test", "http://x/" + q), default=dict)
+
+    assert fb.result("a").value == {"n": 1}
+    res = fb.result("a")
+    assert (res.value, res.ok, res.stale, res.error.kind) == ({"n": 1}, False, True, "throttled")
+    assert fb.result("b").value == {}  # nothing cached: the default
+    assert fb.staleness() is None  # a throttle is not a failure
+
+    clock.now += 1
+    assert fb.result("a").value == {"n": 2}  # retried as soon as a token is back, no backoff
+    assert sent == ["http://x/a", "http://x/a"]
+    ep = upstream.status()["rl_test"]
+    assert (ep["throttled"], ep["throttled_stale"], ep["throttled_dropped"]) == (2, 1, 1)
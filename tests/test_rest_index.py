@@ -0,0 +1,78 @@
+import random
+from datetime import datetime, timedelta
+
+from rest_index import RestIndex, eastern
+
+SLOTS = [(0, 20, 15), (3, 13, 0), (3, 16, 25), (3, 20, 20), (4, 20, 15)]  # (days after Thursday, hour, minute)
+TEAMS = [f"T{i:02d}" for i in range(32)]
+
+
+def _season(seed=7, weeks=18):
+    """(event_id, kickoff, home, away) for a random season: Thursday-Monday slots, a few byes a week"""
+    rng = random.Random(seed)
+    games = []
+    for week in range(weeks):
+        thursday = datetime(2024, 9, 5) + timedelta(weeks=week)
+        teams = rng.sample(TEAMS, len(TEAMS) - (4 if 4 <= week <= 13 else 0))
+        for n, (home, away) in enumerate(zip(teams[::2], teams[1::2])):
+            days, hour, minute = rng.choice(SLOTS)
+            kickoff = thursday + timedelta(days=days, hours=hour, minutes=minute)
+            games.append((f"{week}-{n}", kickoff, home, away))
+    return games
+
+
+def _old_rest_days(team, game_date, last_games):
+    """The calculation RestIndex replaced: whole days since the team's last final game"""
+    if team not in last_games:
+        return 7
+    last_game = last_games[team]
+    if game_date.tzinfo is None:
+        game_date = eastern.localize(game_date)
+    if last_game.tzinfo is None:
+        last_game = eastern.localize(last_game)
+    return max(0, (game_date - last_game).days)
+
+
+def test_rest_matches_the_last_final_game_calculation():
+    games = _season()
+    index = RestIndex(games)
+    compared = 0
+    for _, kickoff, home, away in games:
+        # Before this kickoff, every earlier game is final
+        last_games = {}
+        for _, other, h, a in games:
+            if other < kickoff:
+                for team in (h, a):
+                    last_games[team] = max(last_games.get(team, other), other)
+        for team in (home, away):
+            old = _old_rest_days(team, kickoff, last_games)
+            new = index.rest_days(team, kickoff)
+            prev = last_games.get(team)
+            if prev is not None and eastern.localize(prev).dst() != eastern.localize(kickoff).dst():
+                # Across the fall-back hour the old delta gains an hour
+                assert new in (old, old + 1), (team, kickoff)
+            elif prev is not None and kickoff.time() < prev.time():
+                # An earlier kickoff time loses the part-day under floor division; calendar days don't
+                assert new == old + 1, (team, kickoff)
+            else:
+                assert new == old, (team, kickoff)
+            compared += 1
+    assert compared == 2 * len(games)
+
+
+def test_rest_ignores_later_games_and_flags_short_weeks_and_byes():
+    thursday = datetime(2024, 9, 12, 20, 15)
+    index = RestIndex([("1", datetime(2024, 9, 8, 13), "A", "B"),
+                       ("2", thursday, "A", "C"),
+                       ("3", datetime(2024, 9, 29, 13), "A", "D")])
+    # Game 2 is final by now, yet a rerun for it still measures from game 1
+    rest = index.rest("A", thursday)
+    assert (rest["days"], rest["short_week"], rest["bye"]) == (4, True, False)
+    assert rest["next"] == eastern.localize(datetime(2024, 9, 29, 13))
+    bye = index.rest("A", datetime(2024, 9, 29, 13))
+    assert (bye["days"], bye["bye"]) == (17, True)
+    assert index.rest_days("D", datetime(2024, 9, 29, 13)) == 7
+
+    # Re-adding a flexed game moves it rather than duplicating it
+    assert index.add_games([("2", datetime(2024, 9, 15, 13), "A", "C")]) == 1
+    assert index.rest_days("A", datetime(2024, 9, 29, 13)) == 14 and len(index) == 3
@@ -0,0 +1,61 @@
+import numpy as np
+
+import slate_sim
+
+
+def _pos(game, pick, price=50, contracts=10):
+    return {"game": game, "pick": pick, "price": price, "contracts": contracts}
+
+
+def test_single_game_matches_probability():
+    sim = slate_sim.SlateSimulator(n_sims=20_000, seed=1)
+    sim.set_positions([_pos("Buffalo@Kansas City", "Kansas City", price=40)])
+    sim.set_probability("Buffalo@Kansas City", 0.7)
+    report = sim.report()
+    assert abs(report["p_loss"] - 0.3) < 0.02
+    assert abs(report["mean"] - (0.7 * 6.0 - 0.3 * 4.0)) < 0.15
+
+
+def test_latents_are_dropped_with_their_games():
+    sim = slate_sim.SlateSimulator(n_sims=1000, seed=1)
+    sim.set_positions([_pos("A@B", "B"), _pos("C@D", "C")])
+    sim.set_positions([_pos("C@D", "C"), _pos("E@F", "F")])
+    assert set(sim._latent) == {"C@D", "E@F"}
+    assert set(sim._probs) <= {"C@D", "E@F"}
+
+
+def test_slate_risk_is_shared_and_memoized(monkeypatch):
+    monkeypatch.setattr(slate_sim, "_sims", slate_sim.OrderedDict())
+    monkeypatch.setattr(slate_sim, "_reports", slate_sim.OrderedDict())
+    runs = []
+    report = slate_sim.SlateSimulator.report
+    monkeypatch.setattr(slate_sim.SlateSimulator, "report", lambda self, bins=30: runs.append(1) or report(self, bins))
+
+    book = [_pos("A@B", "B"), _pos("C@D", "C")]
+    first = slate_sim.slate_risk(book, {"A@B": 0.6, "C@D": 0.4})
+    # Another session's rerun with the same inputs: no simulation
+    assert slate_sim.slate_risk(list(reversed(book)), {"A@B": 0.6, "C@D": 0.4}) is first
+    assert len(runs) == 1
+    # A different book on the same games reuses the simulator
+    slate_sim.slate_risk([_pos("A@B", "A", contracts=3), _pos("C@D", "C")], {"A@B": 0.6, "C@D": 0.4})
+    assert len(slate_sim._sims) == 1 and len(runs) == 2
+    # A probability move recomputes
+    moved = slate_sim.slate_risk(book, {"A@B": 0.9, "C@D": 0.4})
+    assert moved["mean"] > first["mean"] and len(runs) == 3
+
+    for i in range(slate_sim.MAX_SIMULATORS + 3):
+        slate_sim.slate_risk([_pos(f"X{i}@Y{i}", f"Y{i}")], {})
+    assert len(slate_sim._sims) == slate_sim.MAX_SIMULATORS
+    assert np.isfinite(moved["var95"])
+
+
+def test_shock_moves_home_and_away_picks_together():
+    sim = slate_sim.SlateSimulator(n_sims=20_000, rho=0.5, seed=2)
+    sim.set_positions([_pos("A@B", "B"), _pos("C@D", "C")])  # one home pick, one away pick
+    sim.set_probabilities({"A@B": 0.5, "C@D": 0.5})
+    both_lose = (sim.pnl() == -10).mean()
+    assert both_lose > 0.3  # 0.25 if independent; the copula gives 1/3 at rho 0.5
+    # Flipping the away pick to home re-orients its column, keeping its marginal
+    sim.set_positions([_pos("A@B", "B"), _pos("C@D", "D")])
+    assert abs((sim.pnl() == -10).mean() - both_lose) < 0.02
+    assert abs(sim.report()["p_loss"] - both_lose) < 0.02
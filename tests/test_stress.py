@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import stress
+
+T = 1_790_000_000.0
+
+
+def event(game, t, to, prev="NORMAL"):
+    return {"t": T + t, "game": game, "from": prev, "to": to}
+
+
+def tape(rows):
+    return np.array([(T + t, g, mid) for t, g, mid in rows], dtype=stress.TAPE_DTYPE)
+
+
+def write_tape(root, day, rows):
+    with open(root / f"prices-{day}.bin", "ab") as f:
+        f.write(tape(rows).tobytes())
+
+
+def test_as_of_merge(tmp_path):
+    # two games interleaved and out of order across files, as the recorder can leave them
+    write_tape(tmp_path, "2026-10-19", [(1000, 2, 0.30)])
+    write_tape(tmp_path, "2026-10-18", [(0, 1, 0.50), (0, 2, 0.40), (60, 1, 0.53), (100, 1, 0.56),
+                                        (130, 2, 0.35), (200, 1, 0.48), (400, 1, 0.60)])
+    prices = stress.load_tape(str(tmp_path))
+    assert prices["game"].tolist() == [1, 1, 1, 1, 1, 2, 2, 2]
+    assert prices["t"].tolist() == sorted(prices["t"][:5]) + sorted(prices["t"][5:])
+
+    events = [event(1, 100, "ELEVATED"),  # exactly at a price: entry is that price
+              event(1, 250, "MAX UNCERTAINTY", "ELEVATED"),  # between prices: entry is the one before
+              event(2, -10, "ELEVATED"),  # before any price of its game
+              event(2, 50, "NORMAL", "ELEVATED"),
+              event(3, 0, "ELEVATED")]  # never priced
+    rows = {(r["game"], r["t"] - T): r for r in stress.realized_moves(events, prices, window_s=120)}
+
+    r = rows[(1, 100)]  # window ends at 220 (window_s), before the next transition at 250
+    assert (r["entry_mid"], r["max_move"], r["net_move"]) == (pytest.approx(0.56), 8.0, -8.0)
+    r = rows[(1, 250)]  # 0.48 as of 250; 0.60 at 400 is past the window
+    assert (r["entry_mid"], r["max_move"], r["net_move"]) == (pytest.approx(0.48), 0.0, 0.0)
+    assert rows[(2, -10)]["entry_mid"] is None and rows[(2, -10)]["max_move"] is None
+    r = rows[(2, 50)]  # 0.40 as of 50; 0.35 at 130 is inside the window
+    assert (r["entry_mid"], r["max_move"], r["net_move"]) == (pytest.approx(0.40), 5.0, -5.0)
+    assert rows[(3, 0)]["max_move"] is None
+
+    out = stress.report(events, prices, window_s=120)
+    assert out["MAX UNCERTAINTY"] == {"claimed": "3-7¢", "transitions": 1, "priced": 1, "median_max_move": 0.0,
+                                      "mean_max_move": 0.0, "p90_max_move": 0.0, "mean_abs_net_move": 0.0}
+    assert (out["ELEVATED"]["transitions"], out["ELEVATED"]["priced"]) == (3, 1)
+    assert out["NORMAL"]["mean_max_move"] == 5.0
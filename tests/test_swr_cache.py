@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+import swr_cache
+from upstream import UpstreamError
+
+
+class Source:
+    """Loader whose value and failure are set by the test; each call can be held on `gate`"""
+    def __init__(self):
+        self.value = "v1"
+        self.fail = False
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, key):
+        self.calls += 1
+        self.gate.wait(5)
+        if self.fail:
+            raise UpstreamError("test", "http", "down")
+        return f"{self.value}:{key}"
+
+
+def _age(cache, key, seconds):
+    value, loaded_at = cache._entries[(key,)]
+    cache._entries[(key,)] = (value, loaded_at - seconds)
+
+
+def _wait_idle(cache):
+    for _ in range(500):
+        with cache._lock:
+            if not cache._inflight:
+                return
+        time.sleep(0.01)
+    raise AssertionError("refresh did not finish")
+
+
+def test_cold_load_then_hit():
+    src = Source()
+    cache = swr_cache.SWRCache("test", src, ttl=60)
+    assert cache("a") == "v1:a"
+    assert cache("a") == "v1:a"
+    assert src.calls == 1
+    assert (cache.stats["misses"], cache.stats["hits"]) == (1, 1)
+
+
+def test_stale_entry_is_served_while_refreshing_in_background():
+    src = Source()
+    cache = swr_cache.SWRCache("test", src, ttl=60)
+    cache("a")
+    _age(cache, "a", 61)
+    src.value = "v2"
+    src.gate.clear()
+    started = time.monotonic()
+    assert cache("a") == "v1:a"  # returns without waiting for the held loader
+    assert time.monotonic() - started < 1
+    assert cache("a") == "v1:a"  # a refresh is already running: no second one
+    src.gate.set()
+    _wait_idle(cache)
+    assert cache("a") == "v2:a"
+    assert src.calls == 2
+    assert (cache.stats["stale_hits"], cache.stats["refreshes"]) == (2, 1)
+
+
+def test_failed_refresh_keeps_the_old_value_and_waits_to_retry():
+    src = Source()
+    cache = swr_cache.SWRCache("test", src, ttl=60, retry_s=60)
+    cache("a")
+    _age(cache, "a", 61)
+    src.fail = True
+    assert cache("a") == "v1:a"
+    _wait_idle(cache)
+    assert cache.stats["refresh_errors"] == 1
+    assert cache("a") == "v1:a"
+    assert src.calls == 2  # within retry_s the failing source isn't called again
+
+
+def test_concurrent_cold_callers_share_one_load():
+    src = Source()
+    src.gate.clear()
+    cache = swr_cache.SWRCache("test", src, ttl=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache("a"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while cache.stats["misses"] + cache.stats["coalesced"] < 4:
+        time.sleep(0.01)
+    src.gate.set()
+    for t in threads:
+        t.join()
+    assert results == ["v1:a"] * 4 and src.calls == 1
+    assert cache.stats["coalesced"] == 3
+
+
+def test_failed_cold_load_raises():
+    src = Source()
+    src.fail = True
+    cache = swr_cache.SWRCache("test", src, ttl=60)
+    with pytest.raises(UpstreamError):
+        cache("a")
+    src.fail = False
+    assert cache("a") == "v1:a"
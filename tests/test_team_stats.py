@@ -0,0 +1,27 @@
+import numpy as np
+
+import team_stats
+
+
+def _week(*results):
+    """week_sums for (away, home, away_score, home_score) finals"""
+    cols = {"event_id": [], "home": [], "away": [], "home_score": [], "away_score": [], "home_win": [], "away_win": []}
+    for i, (away, home, away_score, home_score) in enumerate(results):
+        for key, value in (("event_id", str(i)), ("home", home), ("away", away), ("home_score", home_score),
+                           ("away_score", away_score), ("home_win", home_score > away_score),
+                           ("away_win", away_score > home_score)):
+            cols[key].append(value)
+    return team_stats.week_sums(cols)
+
+
+def test_def_rank_before_week_one_is_neutral():
+    teams, _, _ = team_stats.derive(np.zeros((len(team_stats.TEAMS), len(team_stats.SUMS))))
+    assert {row["def_rank"] for row in teams.values()} == {16}
+
+
+def test_def_rank_only_ranks_teams_that_played():
+    teams, _, _ = team_stats.derive(_week(("Buffalo", "Kansas City", 10, 24), ("Chicago", "Green Bay", 3, 7)))
+    ranks = {team: row["def_rank"] for team, row in teams.items()}
+    assert ranks["Green Bay"] == 1 and ranks["Chicago"] == 2 and ranks["Buffalo"] == 4
+    assert sorted(ranks[t] for t in ("Buffalo", "Kansas City", "Chicago", "Green Bay")) == [1, 2, 3, 4]
+    assert ranks["Arizona"] == ranks["Atlanta"] == 16
@@ -0,0 +1,102 @@
+import os
+import threading
+
+import pytest
+
+import ratelimit
+import replay_server
+import upstream
+
+SCOREBOARD = "/apis/site/v2/sports/football/nfl/scoreboard"
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """Stand-in replaying fixtures/bench, with the process-wide rate limits off"""
+    monkeypatch.setattr(ratelimit, "_limiter", False)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = replay_server.StandInServer(("127.0.0.1", 0),
+                                         store=replay_server.FixtureStore(os.path.join(root, "fixtures", "bench")))
+    replay_server.start_in_thread(server)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _errors(endpoint):
+    return upstream.status().get(endpoint, {}).get("errors", {})
+
+
+@pytest.mark.parametrize("config, kind, status", [
+    ({"timeout_rate": 1.0, "timeout_s": 1.0}, "timeout", None),
+    ({"error_rate": 1.0, "error_status": 503}, "http", 503),
+    ({"malformed_rate": 1.0}, "malformed", None),
+])
+def test_failures_are_classified(standin, config, kind, status):
+    standin.config = replay_server.ReplayConfig(**config)
+    endpoint = f"test_{kind}"
+    with pytest.raises(upstream.UpstreamError) as e:
+        upstream.get_json(endpoint, standin.url + SCOREBOARD, timeout=0.3, expect="events")
+    assert (e.value.endpoint, e.value.kind, e.value.status) == (endpoint, kind, status)
+    assert _errors(endpoint) == {kind: 1}
+
+
+def test_missing_key_and_connection_errors(standin):
+    with pytest.raises(upstream.UpstreamError) as e:
+        upstream.get_json("test_expect", standin.url + SCOREBOARD, expect="children")
+    assert e.value.kind == "malformed"
+    assert upstream.get_json("test_ok", standin.url + SCOREBOARD, expect="events")["events"]
+    assert upstream.status()["test_ok"]["ok"] == 1
+
+    closed = replay_server.StandInServer(("127.0.0.1", 0))
+    url = closed.url
+    closed.server_close()
+    with pytest.raises(upstream.UpstreamError) as e:
+        upstream.get_json("test_connection", url + SCOREBOARD)
+    assert e.value.kind == "connection"
+
+
+def test_fallback_serves_the_last_good_value(standin):
+    fetch = upstream.Fallback("test_fallback", lambda: upstream.get_json("test_fallback", standin.url + SCOREBOARD),
+                              default=dict, backoff_s=60)
+    good = fetch.result()
+    assert good.ok and not good.stale and good.value["events"]
+
+    standin.config = replay_server.ReplayConfig(error_rate=1.0)
+    res = fetch.result()
+    assert (res.value, res.ok, res.stale, res.error.kind) == (good.value, False, True, "http")
+    # Within the backoff the failing upstream isn't called again
+    injected = standin.stats["errors_injected"]
+    res = fetch.result()
+    assert (res.value, res.stale, res.error.kind) == (good.value, True, "backoff")
+    assert _errors("test_fallback") == {"http": 1}
+    assert fetch.staleness() is not None
+    assert standin.stats["errors_injected"] == injected
+
+    cold = upstream.Fallback("test_cold", lambda: upstream.get_json("test_cold", standin.url + SCOREBOARD), default=dict)
+    res = cold.result()
+    assert (res.value, res.ok, res.stale) == ({}, False, False)
+    st = upstream.status()["test_cold"]
+    assert st["default_served"] == 1 and st["stale_served"] == 0
+
+
+def test_concurrent_identical_requests_share_one_call(standin):
+    standin.config = replay_server.ReplayConfig(latency_ms=500)
+    url = standin.url + SCOREBOARD
+    n = 8
+    start = threading.Barrier(n)
+    results = [None] * n
+
+    def fetch(i):
+        start.wait()
+        results[i] = upstream.get_json("test_coalesce", url, expect="events")
+
+    threads = [threading.Thread(target=fetch, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert standin.stats["requests"] == 1
+    assert all(r is results[0] for r in results)
+    st = upstream.status()["test_coalesce"]
+    assert (st["ok"], st["coalesced"]) == (1, n - 1)
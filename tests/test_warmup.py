@@ -0,0 +1,18 @@
+from datetime import datetime, timedelta, timezone
+
+import warmup
+
+
+def test_plan_times_are_eastern():
+    # A night kickoff: 00:20Z is 8:20 PM (EDT) or 7:20 PM (EST) the previous evening
+    kickoff = (datetime.now(timezone.utc) + timedelta(days=2)).replace(hour=0, minute=20, second=0, microsecond=0)
+    games = {"Baltimore@Buffalo": {"game_date": kickoff, "status_type": "STATUS_SCHEDULED"},
+             "Chicago@Green Bay": {"game_date": kickoff + timedelta(minutes=5), "status_type": "STATUS_SCHEDULED"}}
+    sched = warmup.WarmupScheduler(lead_min=20)
+    sched.update(games, {})
+    plan = sched.status()["plan"]
+    assert len(plan) == 1 and plan[0]["games"] == 2
+    shown = datetime.fromisoformat(plan[0]["kickoff"])
+    assert shown == kickoff
+    assert shown.strftime("%I:%M %p") in ("08:20 PM", "07:20 PM")
+    assert datetime.fromisoformat(plan[0]["warm_at"]).strftime("%H:%M") in ("20:00", "19:00")
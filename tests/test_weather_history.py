@@ -0,0 +1,115 @@
+"""Backfill and lookups against replay_server's stand-in, serving a synthetic archive"""
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+import requests
+
+import nfl_data
+import nfl_model
+import replay_server
+import team_registry
+import weather_history as wh
+
+SEASON = 2024
+FIRST, END = wh.season_window(SEASON)
+AFTER_SEASON = (END + 30 * 24) * 3600  # "now" once the archive has the whole season
+
+
+def _hourly(venue, start_hour, end_hour):
+    hours = np.arange(start_hour, end_hour)
+    return {"hourly": {"time": (hours * 3600).tolist(),
+                       "temperature_2m": (venue + (hours - FIRST) / 1000).round(3).tolist(),
+                       "wind_speed_10m": [12.5] * len(hours),
+                       "precipitation": [None] + [0.2] * (len(hours) - 1),
+                       "weather_code": [61] * len(hours)}}
+
+
+def _query(lat, lon, start_date, end_date):
+    return (f"latitude={lat}&longitude={lon}&start_date={start_date}&end_date={end_date}"
+            f"&hourly={','.join(nfl_data.HOURLY_WEATHER)}&wind_speed_unit=mph&temperature_unit=fahrenheit"
+            f"&timezone=GMT&timeformat=unixtime")
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    """Stand-in with a full-season archive recording for every outdoor venue"""
+    fixtures = tmp_path / "fixtures"
+    (fixtures / "bodies").mkdir(parents=True)
+    with open(fixtures / "recordings.jsonl", "w") as log:
+        for venue in wh.OUTDOOR:
+            body = json.dumps(_hourly(venue, FIRST, END)).encode()
+            name = f"bodies/{hashlib.sha1(body).hexdigest()}.json.gz"
+            with gzip.open(fixtures / name, "wb") as f:
+                f.write(body)
+            lat, lon = team_registry.STADIUMS[venue]
+            log.write(json.dumps({"t": 0, "path": "/v1/archive", "body": name, "status": 200,
+                                  "query": _query(lat, lon, wh._date(FIRST), wh._date(END - 24))}) + "\n")
+    server = replay_server.StandInServer(("127.0.0.1", 0), store=replay_server.FixtureStore(str(fixtures)))
+    replay_server.start_in_thread(server)
+    monkeypatch.setattr(nfl_data, "OPEN_METEO_ARCHIVE_URL", server.url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _archive_requests(server):
+    return requests.get(server.url + replay_server.STATS_PATH, timeout=5).json()["by_endpoint"].get("archive", 0)
+
+
+def test_backfill_one_request_per_venue(archive, tmp_path):
+    hist = wh.WeatherHistory(str(tmp_path / "weather"))
+    filled = hist.backfill(SEASON, now=AFTER_SEASON)
+    assert set(filled) == {team_registry.KALSHI[v] for v in wh.OUTDOOR}
+    assert set(filled.values()) == {END - FIRST}
+    assert _archive_requests(archive) == len(wh.OUTDOOR) == 20  # MetLife is one venue
+
+    # Complete venue-seasons are not requested again
+    assert set(hist.backfill(SEASON, now=AFTER_SEASON).values()) == {0}
+    assert _archive_requests(archive) == len(wh.OUTDOOR)
+
+
+def test_lookups(archive, tmp_path):
+    hist = wh.WeatherHistory(str(tmp_path / "weather"))
+    hist.backfill(SEASON, now=AFTER_SEASON)
+    gb = team_registry.team_id("Green Bay")
+    kickoff = datetime(2024, 12, 23, 20, 15, tzinfo=timezone.utc).timestamp()  # nearest hour: 20:00Z
+    row = int(kickoff + 1800) // 3600 - FIRST
+    expected_temp = gb + row / 1000
+
+    assert hist.at("Green Bay Packers", kickoff) == {"temp": round(expected_temp, 2), "wind": 12.5, "precip": 0.2, "code": 61}
+    assert hist.at("Detroit", kickoff) is None  # dome
+    assert hist.at("NY Jets", kickoff) == hist.at("NY Giants", kickoff)
+    assert hist.at("Green Bay", datetime(2023, 12, 1, tzinfo=timezone.utc).timestamp()) is None  # not backfilled
+
+    cols = hist.lookup(["Green Bay", "Detroit", "Chicago"], [kickoff, kickoff, kickoff + 3600])
+    assert cols["temp"][0] == pytest.approx(expected_temp, abs=1e-3)
+    assert np.isnan(cols["temp"][1])
+    assert cols["temp"][2] == pytest.approx(team_registry.team_id("Chicago") + (row + 1) / 1000, abs=1e-3)
+
+    impact = nfl_model.get_weather_for_game("Green Bay", fetch_weather=hist.fetcher(kickoff))
+    assert (impact["wind"], impact["impact"]) == (12.5, "moderate")
+
+
+def test_partial_season_catches_up_from_the_first_missing_day(tmp_path):
+    calls = []
+
+    def fetch(lat, lon, start_date, end_date):
+        calls.append((start_date, end_date))
+        start = int(datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc).timestamp()) // 3600
+        end = int(datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc).timestamp()) // 3600 + 24
+        return nfl_data.parse_weather_history(_hourly(0, start, end))
+
+    hist = wh.WeatherHistory(str(tmp_path))
+    venue = wh.OUTDOOR[0]
+    mid_season = (FIRST + 100 * 24) * 3600 + 3600
+    published = (100 - wh.ARCHIVE_LAG_DAYS + 1) * 24  # through the whole day ARCHIVE_LAG_DAYS back
+    assert hist.backfill_venue(venue, SEASON, fetch, now=mid_season) == published
+    assert hist.missing_from(venue, SEASON) == published
+    assert hist.backfill_venue(venue, SEASON, fetch, now=mid_season) == 0  # nothing new published
+    assert hist.backfill_venue(venue, SEASON, fetch, now=AFTER_SEASON) == END - FIRST - published
+    assert calls == [("2024-08-01", "2024-11-04"), ("2024-11-05", "2025-02-28")]
+    assert hist.missing_from(venue, SEASON) is None
@@ -0,0 +1,288 @@
+"""
+Upstream HTTP access with per-endpoint error accounting and last-good fallbacks.
+
+get_json() is the single place the data layer talks HTTP. It raises UpstreamError
+(timeout / connection / http / malformed) instead of returning defaults, so a failed
+fetch propagates through st.cache_data (which never caches exceptions) rather than
+being pinned as an empty result for the whole TTL.
+
+Concurrent get_json() calls for the same URL are coalesced: one request goes upstream
+and every caller shares its decoded payload (or its error). Absorbed duplicates are
+counted per endpoint as "coalesced". The request that does go upstream must fit the
+endpoint's and host's budget (ratelimit.py), or it fails as "throttled" without being sent.
+
+Fallback wraps a fetcher for the app: a success is remembered as the last good value
+for its arguments; a failure serves that value (stale) or the default, and retries are
+held off for a short backoff (except after a throttled call, which is retried as soon as
+there is budget). status() exposes error rates, staleness age and throttling.
+"""
+import threading
+import time
+from collections import namedtuple
+
+import requests
+
+import perf
+import ratelimit
+
+FAILURE_BACKOFF_S = 30
+
+FetchResult = namedtuple("FetchResult", "value ok stale age_s error")
+
+
+class UpstreamError(Exception):
+    """A failed upstream call. kind: timeout | connection | http | malformed | throttled"""
+
+    def __init__(self, endpoint, kind, detail="", status=None):
+        super().__init__(f"{endpoint}: {kind}{f' {status}' if status else ''} {detail}".strip())
+        self.endpoint = endpoint
+        self.kind = kind
+        self.detail = detail
+        self.status = status
+
+
+_lock = threading.Lock()
+# {endpoint: {"ok": n, "errors": {kind: n}, "coalesced": n, "stale_served": n, "default_served": n,
+#             "throttled": n, "throttled_stale": n, "throttled_dropped": n,
+#             "last_ok": ts, "last_error": ts, "last_error_msg": str}}
+_stats = {}
+
+
+def _endpoint_stats(endpoint):
+    ep = _stats.get(endpoint)
+    if ep is None:
+        ep = _stats[endpoint] = {"ok": 0, "errors": {}, "coalesced": 0, "stale_served": 0, "default_served": 0,
+                                 "throttled": 0, "throttled_stale": 0, "throttled_dropped": 0,
+                                 "last_ok": None, "last_error": None, "last_error_msg": ""}
+    return ep
+
+
+def record_ok(endpoint):
+    with _lock:
+        ep = _endpoint_stats(endpoint)
+        ep["ok"] += 1
+        ep["last_ok"] = time.time()
+
+
+def record_error(err):
+    with _lock:
+        ep = _endpoint_stats(err.endpoint)
+        ep["errors"][err.kind] = ep["errors"].get(err.kind, 0) + 1
+        ep["last_error"] = time.time()
+        ep["last_error_msg"] = str(err)
+
+
+def _count(endpoint, field):
+    with _lock:
+        _endpoint_stats(endpoint)[field] += 1
+
+
+class _Flight:
+    __slots__ = ("done", "data", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = None
+        self.error = None
+
+
+_flights = {}  # {url: _Flight} requests currently in progress
+_flights_lock = threading.Lock()
+
+
+def get_json(endpoint, url, timeout=10, expect=None, session=None):
+    """
+    GET url and decode JSON. `expect` names a top-level key a valid payload must have.
+    `session` is a requests.Session to reuse pooled connections (default: one-off request).
+
+    If the same URL is already in flight, wait for it and share its result instead of
+    sending a duplicate request. Callers must treat the returned payload as read-only.
+    Raises UpstreamError "throttled" when the request is over its rate budget.
+    """
+    with _flights_lock:
+        flight = _flights.get(url)
+        leader = flight is None
+        if leader:
+            flight = _flights[url] = _Flight()
+    if not leader:
+        _count(endpoint, "coalesced")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.data
+
+    try:
+        if not ratelimit.acquire(endpoint, url):
+            _count(endpoint, "throttled")
+            raise UpstreamError(endpoint, "throttled", "over request budget")
+        flight.data = _request_json(endpoint, url, timeout, expect, session)
+        return flight.data
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(url, None)
+        flight.done.set()
+
+
+def _request_json(endpoint, url, timeout, expect, session=None):
+    try:
+        resp = (session or requests).get(url, timeout=timeout)
+    except requests.Timeout as e:
+        err = UpstreamError(endpoint, "timeout", str(e))
+    except requests.RequestException as e:
+        err = UpstreamError(endpoint, "connection", str(e))
+    else:
+        perf.note_response(resp)
+        if resp.status_code != 200:
+            err = UpstreamError(endpoint, "http", resp.reason or "", status=resp.status_code)
+        else:
+            try:
+                data = resp.json()
+            except ValueError as e:
+                err = UpstreamError(endpoint, "malformed", f"bad JSON: {e}")
+            else:
+                if not isinstance(data, dict) or (expect and expect not in data):
+                    err = UpstreamError(endpoint, "malformed", f"missing '{expect}'" if expect else "not an object")
+                else:
+                    record_ok(endpoint)
+                    return data
+    perf.note_error(err.status or err.kind)
+    record_error(err)
+    raise err
+
+
+class Fallback:
+    """
+    Serve a fetcher's last good value when it fails.
+
+    fn raises UpstreamError on failure (possibly through st.cache_data). Calling the
+    Fallback returns the value; result() returns the full FetchResult.
+    """
+
+    def __init__(self, endpoint, fn, default, backoff_s=FAILURE_BACKOFF_S):
+        self.endpoint = endpoint
+        self.fn = fn
+        self.default = default
+        self.backoff_s = backoff_s
+        self._good = {}  # {args: (value, ts)}
+        self._failed_at = {}  # {args: ts}
+        self._lock = threading.Lock()
+
+    def result(self, *args):
+        now = time.time()
+        with self._lock:
+            good = self._good.get(args)
+            failed_at = self._failed_at.get(args)
+        error = None
+        if failed_at is None or now - failed_at >= self.backoff_s:
+            try:
+                value = self.fn(*args)
+            except UpstreamError as e:
+                error = e
+                if e.kind != "throttled":
+                    with self._lock:
+                        self._failed_at[args] = now
+            else:
+                with self._lock:
+                    self._good[args] = (value, now)
+                    self._failed_at.pop(args, None)
+                return FetchResult(value, True, False, 0.0, None)
+        else:
+            error = UpstreamError(self.endpoint, "backoff", "recent failure, not retried yet")
+
+        throttled = error.kind == "throttled"
+        if good is not None:
+            _count(self.endpoint, "stale_served")
+            if throttled:
+                _count(self.endpoint, "throttled_stale")
+            return FetchResult(good[0], False, True, now - good[1], error)
+        _count(self.endpoint, "default_served")
+        if throttled:
+            _count(self.endpoint, "throttled_dropped")
+        return FetchResult(self.default() if callable(self.default) else self.default, False, False, None, error)
+
+    def __call__(self, *args):
+        return self.result(*args).value
+
+    def last_good(self, *args):
+        """The last good value as a stale FetchResult without calling fn (None if there isn't one)"""
+        with self._lock:
+            good = self._good.get(args)
+        if good is None:
+            return None
+        return FetchResult(good[0], False, True, time.time() - good[1],
+                           UpstreamError(self.endpoint, "slow", "still loading"))
+
+    def staleness(self):
+        """Age in seconds of the oldest last-good value currently being served after a failure"""
+        with self._lock:
+            ages = [time.time() - self._good[a][1] for a in self._failed_at if a in self._good]
+        return max(ages) if ages else None
+
+
+_fallbacks = {}
+
+
+def fallback(name, endpoint, fn, default, backoff_s=FAILURE_BACKOFF_S):
+    """
+    Process-wide Fallback registered under `name`.
+
+    The Streamlit script re-executes on every rerun, so the app asks for its fallbacks
+    by name to keep last-good values across reruns and sessions; fn is refreshed each time.
+    """
+    with _lock:
+        fb = _fallbacks.get(name)
+        if fb is None:
+            fb = _fallbacks[name] = Fallback(endpoint, fn, default, backoff_s)
+        else:
+            fb.fn = fn
+    return fb
+
+
+# ========== REPORTING ==========
+def status():
+    """{endpoint: {..., "calls", "error_rate", "last_ok_age_s"}}"""
+    now = time.time()
+    out = {}
+    with _lock:
+        for endpoint, ep in _stats.items():
+            n_err = sum(ep["errors"].values())
+            calls = ep["ok"] + n_err
+            out[endpoint] = dict(ep, errors=dict(ep["errors"]), calls=calls,
+                                 error_rate=round(n_err / calls, 4) if calls else 0.0,
+                                 last_ok_age_s=round(now - ep["last_ok"], 1) if ep["last_ok"] else None)
+    return out
+
+
+def to_prometheus(prefix="nfl"):
+    stats = status()
+    lines = [f"# HELP {prefix}_upstream_requests_total Upstream calls by endpoint and outcome",
+             f"# TYPE {prefix}_upstream_requests_total counter"]
+    for endpoint, ep in sorted(stats.items()):
+        lines.append(f'{prefix}_upstream_requests_total{{endpoint="{endpoint}",outcome="ok"}} {ep["ok"]}')
+        for kind, n in sorted(ep["errors"].items()):
+            lines.append(f'{prefix}_upstream_requests_total{{endpoint="{endpoint}",outcome="{kind}"}} {n}')
+    lines += [f"# HELP {prefix}_upstream_coalesced_total Duplicate concurrent requests absorbed by single-flight",
+              f"# TYPE {prefix}_upstream_coalesced_total counter"]
+    for endpoint, ep in sorted(stats.items()):
+        lines.append(f'{prefix}_upstream_coalesced_total{{endpoint="{endpoint}"}} {ep["coalesced"]}')
+    lines += [f"# HELP {prefix}_upstream_fallback_total Fallback values served after a failure",
+              f"# TYPE {prefix}_upstream_fallback_total counter"]
+    for endpoint, ep in sorted(stats.items()):
+        lines.append(f'{prefix}_upstream_fallback_total{{endpoint="{endpoint}",served="stale"}} {ep["stale_served"]}')
+        lines.append(f'{prefix}_upstream_fallback_total{{endpoint="{endpoint}",served="default"}} {ep["default_served"]}')
+    lines += [f"# HELP {prefix}_upstream_throttled_total Requests over their rate budget, by how they were answered",
+              f"# TYPE {prefix}_upstream_throttled_total counter"]
+    for endpoint, ep in sorted(stats.items()):
+        lines.append(f'{prefix}_upstream_throttled_total{{endpoint="{endpoint}",served="stale"}} {ep["throttled_stale"]}')
+        lines.append(f'{prefix}_upstream_throttled_total{{endpoint="{endpoint}",served="dropped"}} {ep["throttled_dropped"]}')
+        other = max(0, ep["throttled"] - ep["throttled_stale"] - ep["throttled_dropped"])
+        lines.append(f'{prefix}_upstream_throttled_total{{endpoint="{endpoint}",served="other"}} {other}')
+    lines += [f"# HELP {prefix}_upstream_last_ok_age_seconds Seconds since the last successful call",
+              f"# TYPE {prefix}_upstream_last_ok_age_seconds gauge"]
+    for endpoint, ep in sorted(stats.items()):
+        if ep["last_ok_age_s"] is not None:
+            lines.append(f'{prefix}_upstream_last_ok_age_seconds{{endpoint="{endpoint}"}} {ep["last_ok_age_s"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,151 @@
+"""
+Cache pre-warming ahead of kickoff clusters.
+
+Kickoffs in the scoreboard snapshot are grouped into clusters (games starting within
+CLUSTER_GAP_MIN of each other, e.g. the 1pm and 4:25pm Sunday windows). LEAD_MIN
+minutes before each cluster a background thread runs the warm-up jobs the app has
+registered: refresh the season scoreboard, standings and injuries, fetch weather for
+the cluster's outdoor stadiums, and pre-compute the ML PICKS. The first viewers before
+kickoff then hit warm caches. Jobs run one after another, SPREAD_S apart, so the
+upstream calls go out over a few seconds instead of all at kickoff.
+
+The app calls scheduler().update(games, jobs) on every rerun. That is cheap: the plan
+is only rebuilt when the kickoff times change. Jobs are replaced each time, so they
+always call the current script run's fetchers. Each cluster is warmed once.
+
+    NFL_WARMUP_LEAD_MIN=20 streamlit run app.py
+    python warmup.py          # print the plan for the current scoreboard
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from nfl_data import eastern
+
+LEAD_MIN = float(os.environ.get("NFL_WARMUP_LEAD_MIN", "20"))
+CLUSTER_GAP_MIN = 60
+SPREAD_S = float(os.environ.get("NFL_WARMUP_SPREAD_S", "2"))
+HISTORY_SIZE = 50
+
+
+def kickoff_clusters(games, gap_min=CLUSTER_GAP_MIN):
+    """[(first kickoff, [game_key, ...])] for scheduled games, kickoffs within gap_min chained together"""
+    kickoffs = sorted((g["game_date"], k) for k, g in games.items()
+                      if g.get("status_type") == "STATUS_SCHEDULED" and g.get("game_date"))
+    clusters = []
+    last = None
+    for kickoff, key in kickoffs:
+        if last is None or kickoff - last > timedelta(minutes=gap_min):
+            clusters.append((kickoff, []))
+        clusters[-1][1].append(key)
+        last = kickoff
+    return clusters
+
+
+class WarmupScheduler:
+    def __init__(self, lead_min=LEAD_MIN, spread_s=SPREAD_S, gap_min=CLUSTER_GAP_MIN):
+        self.lead = timedelta(minutes=lead_min)
+        self.spread_s = spread_s
+        self.gap_min = gap_min
+        self.jobs = {}  # {name: fn(cluster game keys)}
+        self.plan = []  # [(warm at, first kickoff, [game keys])]
+        self.history = []  # [{"cluster", "started", "jobs": {name: {"ms", "error"}}}]
+        self._signature = None
+        self._warmed = set()  # first kickoffs already warmed
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def update(self, games, jobs):
+        """Register the current jobs and re-plan if the slate's kickoff times changed"""
+        signature = tuple(sorted((k, g.get("game_date"), g.get("status_type")) for k, g in games.items()))
+        with self._lock:
+            self.jobs = dict(jobs)
+            if signature != self._signature:
+                self._signature = signature
+                now = datetime.now(eastern)
+                self.plan = [(kickoff - self.lead, kickoff, keys)
+                             for kickoff, keys in kickoff_clusters(games, self.gap_min)
+                             if kickoff > now and kickoff not in self._warmed]
+                self._wake.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="warmup")
+                self._thread.start()
+
+    def next_due(self):
+        with self._lock:
+            return self.plan[0] if self.plan else None
+
+    def _run(self):
+        while True:
+            due = self.next_due()
+            now = datetime.now(eastern)
+            if due is None:
+                wait_s = 3600
+            else:
+                warm_at, kickoff, keys = due
+                wait_s = (warm_at - now).total_seconds()
+                if wait_s <= 0:
+                    self.warm(kickoff, keys)
+                    continue
+            self._wake.wait(timeout=min(wait_s, 3600))
+            self._wake.clear()
+
+    def warm(self, kickoff, keys):
+        """Run every job for one cluster now (also callable directly, e.g. from a cron job)"""
+        with self._lock:
+            jobs = list(self.jobs.items())
+            self._warmed.add(kickoff)
+            self.plan = [p for p in self.plan if p[1] != kickoff]
+        record = {"cluster": kickoff.astimezone(eastern).isoformat(), "games": len(keys), "started": time.time(), "jobs": {}}
+        for i, (name, fn) in enumerate(jobs):
+            if i and self.spread_s:
+                time.sleep(self.spread_s)
+            t0 = time.perf_counter()
+            try:
+                fn(keys)
+                error = None
+            except Exception as e:
+                error = repr(e)
+            record["jobs"][name] = {"ms": round((time.perf_counter() - t0) * 1000, 1), "error": error}
+        with self._lock:
+            self.history = (self.history + [record])[-HISTORY_SIZE:]
+        return record
+
+    def status(self):
+        """Jobs, upcoming plan and the last warm-up; times are ISO strings in US/Eastern"""
+        with self._lock:
+            return {"lead_min": self.lead.total_seconds() / 60, "jobs": list(self.jobs),
+                    "plan": [{"warm_at": w.astimezone(eastern).isoformat(), "kickoff": k.astimezone(eastern).isoformat(),
+                              "games": len(keys)}
+                             for w, k, keys in self.plan],
+                    "last": self.history[-1] if self.history else None}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def scheduler():
+    """Process-wide scheduler, so one warm-up runs per cluster however many sessions are open"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WarmupScheduler()
+        return _scheduler
+
+
+def main():
+    import json
+
+    import nfl_data
+    clusters = kickoff_clusters(nfl_data.fetch_espn_scores())
+    lead = timedelta(minutes=LEAD_MIN)
+    print(json.dumps([{"kickoff": k.astimezone(eastern).strftime("%a %I:%M %p ET"),
+                       "warm_at": (k - lead).astimezone(eastern).strftime("%a %I:%M %p ET"),
+                       "games": keys} for k, keys in clusters], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Hourly historical weather at every outdoor stadium, for backtesting the weather gate.
+
+fetch_weather only sees current conditions, so past games have no kickoff weather. The
+backfill asks the Open-Meteo archive for a whole season of hourly temperature, wind,
+precipitation and weather code per outdoor venue in STADIUM_COORDS: one date-range
+request per venue and season, not one per game. Teams sharing a stadium share a venue.
+Each venue-season is stored as a dense float32 array with one row per UTC hour from
+Aug 1 to Mar 1:
+
+    <dir>/<KALSHI code>-<season>.npy      rows: hours since Aug 1 00:00 UTC; cols: FIELDS
+
+A lookup is an index, row = hour - season start, on a memory-mapped file. Hours the
+archive has not published yet (it trails real time by a few days) stay NaN, and a
+re-run only requests the days from the first missing hour on.
+
+    python weather_history.py backfill --seasons 2021-2025 --dir data/weather
+    python weather_history.py at "Green Bay" 2024-12-23T20:15 --dir data/weather
+    python weather_history.py info --dir data/weather
+
+    hist = weather_history.WeatherHistory("data/weather")
+    nfl_model.get_weather_for_game("Chicago", fetch_weather=hist.fetcher(kickoff_ts))
+
+Point NFL_OPEN_METEO_ARCHIVE_URL at replay_server.py to backfill from fixtures.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+import nfl_data
+import ratelimit
+import team_registry
+from upstream import UpstreamError
+
+HISTORY_DIR = os.environ.get("NFL_WEATHER_HISTORY_DIR") or (
+    os.path.join(os.environ["NFL_LAKE_DIR"], "weather_hourly") if os.environ.get("NFL_LAKE_DIR") else "")
+FIELDS = ("temp", "wind", "precip", "code")  # same keys and units as nfl_data.fetch_weather
+ARCHIVE_LAG_DAYS = 5  # the archive trails real time by up to this much
+
+
+def _venues():
+    """{team id: venue id} for outdoor stadiums; a shared stadium maps to its first team"""
+    first = {}
+    for tid, coords in enumerate(team_registry.STADIUMS):
+        if coords and not team_registry.IS_DOME[tid]:
+            first.setdefault(coords, tid)
+    return {tid: first[coords] for tid, coords in enumerate(team_registry.STADIUMS) if coords in first}
+
+
+VENUES = _venues()
+OUTDOOR = sorted(set(VENUES.values()))
+_BY_COORDS = {team_registry.STADIUMS[v]: v for v in OUTDOOR}
+
+
+def season_window(season):
+    """(first hour, end hour) of a season as epoch hours: Aug 1 to Mar 1 UTC"""
+    start = datetime(season, 8, 1, tzinfo=timezone.utc)
+    end = datetime(season + 1, 3, 1, tzinfo=timezone.utc)
+    return int(start.timestamp()) // 3600, int(end.timestamp()) // 3600
+
+
+def season_of(ts):
+    return nfl_data.current_season(datetime.fromtimestamp(ts, timezone.utc))
+
+
+def _date(hour):
+    return datetime.fromtimestamp(hour * 3600, timezone.utc).strftime("%Y-%m-%d")
+
+
+class WeatherHistory:
+    def __init__(self, root):
+        self.root = root
+        self._arrays = {}  # {path: (mtime_ns, memory-mapped array)}
+        self._lock = threading.Lock()
+
+    def path(self, venue, season):
+        return os.path.join(self.root, f"{team_registry.KALSHI[venue]}-{season}.npy")
+
+    def array(self, venue, season):
+        """(hours, len(FIELDS)) float32 array of one venue-season, or None before it is backfilled"""
+        path = self.path(venue, season)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            cached = self._arrays.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = self._arrays[path] = (mtime, np.load(path, mmap_mode="r"))
+            return cached[1]
+
+    # ========== LOOKUP ==========
+    def at(self, team, ts):
+        """{temp, wind, precip, code} at the team's stadium in the hour nearest ts; None if indoor or missing"""
+        venue = VENUES.get(team_registry.team_id(team))
+        return None if venue is None else self._row(venue, ts)
+
+    def _row(self, venue, ts):
+        season = season_of(ts)
+        arr = self.array(venue, season)
+        row = int(ts + 1800) // 3600 - season_window(season)[0]
+        if arr is None or not 0 <= row < len(arr) or np.isnan(arr[row, 0]):
+            return None
+        temp, wind, precip, code = (round(float(v), 2) for v in arr[row])
+        return {"temp": temp, "wind": wind, "precip": precip, "code": 0 if np.isnan(code) else int(code)}
+
+    def fetcher(self, ts):
+        """fetch_weather(lat, lon) stand-in answering from history at ts, for nfl_model.get_weather_for_game"""
+        def fetch_weather(lat, lon):
+            venue = _BY_COORDS.get((lat, lon))
+            return (self._row(venue, ts) if venue is not None else None) or {}
+        return fetch_weather
+
+    def lookup(self, teams, kickoffs):
+        """FIELDS columns (float arrays, NaN where unknown) for parallel arrays of home teams and kickoff times"""
+        kickoffs = np.asarray(kickoffs, dtype=np.float64)
+        venues = np.array([VENUES.get(tid, -1) for tid in team_registry.ids(list(teams))], dtype=np.int64)
+        seasons = np.array([season_of(ts) for ts in kickoffs], dtype=np.int64)
+        hours = (kickoffs + 1800) // 3600
+        out = np.full((len(kickoffs), len(FIELDS)), np.nan)
+        for venue, season in set(zip(venues[venues >= 0].tolist(), seasons[venues >= 0].tolist())):
+            arr = self.array(venue, season)
+            if arr is None:
+                continue
+            sel = np.flatnonzero((venues == venue) & (seasons == season))
+            rows = (hours[sel] - season_window(season)[0]).astype(np.int64)
+            ok = (rows >= 0) & (rows < len(arr))
+            out[sel[ok]] = arr[rows[ok]]
+        return {f: out[:, i] for i, f in enumerate(FIELDS)}
+
+    # ========== BACKFILL ==========
+    def missing_from(self, venue, season):
+        """First hour (row) with no data, or None when the venue-season is complete"""
+        arr = self.array(venue, season)
+        if arr is None:
+            return 0
+        filled = np.flatnonzero(~np.isnan(arr[:, 0]))
+        row = int(filled[-1]) + 1 if len(filled) else 0
+        return None if row >= len(arr) else row
+
+    def backfill_venue(self, venue, season, fetch=nfl_data.fetch_weather_history, now=None):
+        """Fetch the missing days of one venue-season in one request; returns hours filled"""
+        first, end = season_window(season)
+        row = self.missing_from(venue, season)
+        if row is None:
+            return 0
+        now = time.time() if now is None else now
+        last_day = min(end - 24, int(now) // 3600 - ARCHIVE_LAG_DAYS * 24)
+        if first + row > last_day:
+            return 0  # not published yet
+        start_day = (first + row) // 24 * 24  # archive requests are whole days
+        lat, lon = team_registry.STADIUMS[venue]
+        times, cols = fetch(lat, lon, _date(start_day), _date(last_day))
+
+        existing = self.array(venue, season)
+        arr = np.full((end - first, len(FIELDS)), np.nan, dtype=np.float32)
+        if existing is not None:
+            arr[:len(existing)] = existing
+        rows = times // 3600 - first
+        ok = (rows >= 0) & (rows < len(arr)) & (times % 3600 == 0)
+        for i, field in enumerate(nfl_data.HOURLY_WEATHER):
+            arr[rows[ok], i] = cols[field][ok]
+        self._save(self.path(venue, season), arr)
+        return int(np.count_nonzero(~np.isnan(arr[rows[ok], 0])))
+
+    def _save(self, path, arr):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, arr)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def backfill(self, season, venues=None, fetch=nfl_data.fetch_weather_history, pause_s=0.0, now=None):
+        """Backfill every outdoor venue for a season; {KALSHI code: hours filled or error}"""
+        out = {}
+        for venue in venues or OUTDOOR:
+            try:
+                out[team_registry.KALSHI[venue]] = self.backfill_venue(venue, season, fetch, now)
+            except UpstreamError as e:
+                out[team_registry.KALSHI[venue]] = str(e)
+            if pause_s:
+                time.sleep(pause_s)
+        return out
+
+    def info(self):
+        out = {}
+        for name in sorted(os.listdir(self.root)) if os.path.isdir(self.root) else ():
+            if not name.endswith(".npy"):
+                continue
+            code, season = name[:-4].rsplit("-", 1)
+            arr = np.load(os.path.join(self.root, name), mmap_mode="r")
+            filled = np.flatnonzero(~np.isnan(arr[:, 0]))
+            first = season_window(int(season))[0]
+            out[name[:-4]] = {"venue": team_registry.TEAMS[team_registry.team_id(code)], "hours": len(filled),
+                              "from": _date(first + int(filled[0])) if len(filled) else None,
+                              "to": _date(first + int(filled[-1])) if len(filled) else None}
+        return out
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def history():
+    """Process-wide store under NFL_WEATHER_HISTORY_DIR (None when unset)"""
+    global _history
+    if not HISTORY_DIR:
+        return None
+    with _history_lock:
+        if _history is None:
+            _history = WeatherHistory(HISTORY_DIR)
+        return _history
+
+
+def _parse_range(text):
+    out = []
+    for part in text.split(","):
+        if "-" in part:
+            a, b = part.split("-", 1)
+            out.extend(range(int(a), int(b) + 1))
+        elif part:
+            out.append(int(part))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    fill = sub.add_parser("backfill", help="fetch missing hourly weather for every outdoor venue")
+    fill.add_argument("--seasons", default=str(nfl_data.current_season()), help="e.g. 2021-2025 or 2023,2025")
+    fill.add_argument("--pause", type=float, default=0.0, help="seconds between archive requests")
+    at = sub.add_parser("at", help="stored weather at a team's stadium")
+    at.add_argument("team")
+    at.add_argument("when", help="ISO time, Eastern unless it has an offset")
+    sub.add_parser("info", help="list stored venue-seasons")
+    for p in sub.choices.values():
+        p.add_argument("--dir", default=HISTORY_DIR or None, required=not HISTORY_DIR)
+    args = parser.parse_args(argv)
+    ratelimit.wait_for_tokens(60)
+
+    hist = WeatherHistory(args.dir)
+    if args.cmd == "backfill":
+        for season in _parse_range(args.seasons):
+            print(season, json.dumps(hist.backfill(season, pause_s=args.pause)))
+    elif args.cmd == "at":
+        when = datetime.fromisoformat(args.when)
+        ts = (nfl_data.eastern.localize(when) if when.tzinfo is None else when).timestamp()
+        print(json.dumps(hist.at(args.team, ts)))
+    else:
+        print(json.dumps(hist.info(), indent=2))
+
+
+if __name__ == "__main__":
+    main()